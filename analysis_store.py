@@ -0,0 +1,250 @@
+"""
+Storage for career analysis results.
+
+Two interchangeable backends with the same ``get``/``put``/``stats``
+interface:
+
+- ``MemoryAnalysisStore``: per-process LRU with a TTL, for a single worker.
+- ``SQLiteAnalysisStore``: a WAL-mode SQLite file shared by every worker
+  process on the host, so any worker can serve a user's analysis.
+
+Results are stored as zlib-compressed compact JSON in both backends.
+
+``AnalysisMemo`` is separate: it keeps the skill-dependent part of an
+analysis in memory, shared by every user with the same skill profile.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from metrics import CACHE_LOOKUPS
+
+
+def serialize(results):
+    return zlib.compress(json.dumps(results, separators=(',', ':')).encode('utf-8'))
+
+
+def deserialize(data):
+    return json.loads(zlib.decompress(data).decode('utf-8'))
+
+
+class MemoryAnalysisStore:
+    """In-process LRU store with per-entry expiry."""
+
+    def __init__(self, max_entries=1000, ttl=3600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()  # id -> (expires_at, data)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, analysis_id):
+        with self._lock:
+            entry = self._entries.get(analysis_id)
+            if entry is None:
+                return None
+            if entry[0] < time.time():
+                self._remove(analysis_id)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(analysis_id)
+            data = entry[1]
+        return deserialize(data)
+
+    def put(self, analysis_id, results):
+        data = serialize(results)
+        with self._lock:
+            if analysis_id in self._entries:
+                self._remove(analysis_id)
+            self._entries[analysis_id] = (time.time() + self.ttl, data)
+            self._bytes += len(data)
+            self._evict()
+
+    def _remove(self, analysis_id):
+        expires_at, data = self._entries.pop(analysis_id)
+        self._bytes -= len(data)
+
+    def _evict(self):
+        now = time.time()
+        # Entries are in LRU order, not expiry order, so only trim expired
+        # entries from the cold end before falling back to capacity eviction
+        while self._entries:
+            analysis_id, (expires_at, data) = next(iter(self._entries.items()))
+            if expires_at >= now:
+                break
+            self._remove(analysis_id)
+            self.expirations += 1
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class SQLiteAnalysisStore:
+    """SQLite-backed LRU store shared between processes."""
+
+    def __init__(self, path, max_entries=10000, ttl=3600, touch_interval=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.touch_interval = ttl / 10 if touch_interval is None else touch_interval
+        # Counted by this process only; other workers keep their own counts
+        self.evictions = 0
+        self.expirations = 0
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS analyses ('
+                ' id TEXT PRIMARY KEY,'
+                ' data BLOB NOT NULL,'
+                ' expires_at REAL NOT NULL,'
+                ' accessed_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS analyses_accessed ON analyses (accessed_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS analyses_expires ON analyses (expires_at)')
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, analysis_id):
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            'SELECT data, expires_at, accessed_at FROM analyses WHERE id = ?', (analysis_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] < now:
+            with conn:
+                conn.execute('DELETE FROM analyses WHERE id = ?', (analysis_id,))
+            self.expirations += 1
+            return None
+        # Reads stay read-only: recency is only pushed forward once it is
+        # touch_interval old, which is fine-grained enough for LRU eviction
+        if now - row[2] >= self.touch_interval:
+            with conn:
+                conn.execute('UPDATE analyses SET accessed_at = ? WHERE id = ?', (now, analysis_id))
+        return deserialize(row[0])
+
+    def put(self, analysis_id, results):
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO analyses (id, data, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (analysis_id, serialize(results), now + self.ttl, now)
+            )
+            self.expirations += conn.execute('DELETE FROM analyses WHERE expires_at < ?', (now,)).rowcount
+            overflow = conn.execute('SELECT COUNT(*) FROM analyses').fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self.evictions += conn.execute(
+                    'DELETE FROM analyses WHERE id IN '
+                    '(SELECT id FROM analyses ORDER BY accessed_at LIMIT ?)', (overflow,)
+                ).rowcount
+
+    def stats(self):
+        entries, size = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(data)), 0) FROM analyses'
+        ).fetchone()
+        return {
+            'backend': 'sqlite',
+            'entries': entries,
+            'bytes': size,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class AnalysisMemo:
+    """LRU of computed analyses keyed by ``SkillMatrix.profile_key``.
+
+    Entries belong to one catalogue version. A lookup with a different
+    version drops them all, so edits to the catalogue never serve stale
+    results. Cached results are shared; callers must not mutate them.
+    """
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self.version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()  # profile key -> results
+        self._lock = threading.Lock()
+
+    def get(self, version, key):
+        with self._lock:
+            self._check_version(version)
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                CACHE_LOOKUPS.inc('analysis_memo', 'miss')
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        CACHE_LOOKUPS.inc('analysis_memo', 'hit')
+        return results
+
+    def put(self, version, key, results):
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _check_version(self, version):
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'catalogue_version': self.version,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+def create_analysis_store(url, max_entries=1000, ttl=3600):
+    """Build a store from ``memory`` or ``sqlite:///path/to/file.db``."""
+    if url == 'memory':
+        return MemoryAnalysisStore(max_entries=max_entries, ttl=ttl)
+    if url.startswith('sqlite:///'):
+        return SQLiteAnalysisStore(url[len('sqlite:///'):], max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"Unknown analysis store: {url}")
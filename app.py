@@ -1,21 +1,45 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import (Flask, Request, render_template, request, redirect, url_for, session, flash, jsonify,
+                   Response, stream_with_context, g, before_render_template, template_rendered, current_app)
 import os
 import json
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
 import re
+from jinja2 import FileSystemBytecodeCache
 from werkzeug.utils import secure_filename
 from markupsafe import Markup
-from openapi import generate_career_guidance
-import pdfplumber
-from forms import PersonalInformationForm
-from docx import Document
-from PIL import Image
-import pytesseract
-import re
+from openapi import (generate_career_guidance, generate_ai_career_guidance, iter_career_guidance_sections,
+                     get_guidance_cache, find_career_key, GUIDANCE_VERSION)
+from resume_parser import extract_text_from_file, parse_resume_info, SUPPORTED_EXTENSIONS
+from resume_jobs import ResumeJobQueue, QueueFullError
+from resume_cache import ResumeCache
+from resume_store import ResumeStore
+from resume_upload import InvalidUpload, UploadSpool, check_upload, spool_upload
+from template_cache import FragmentCacheExtension, precompile_templates
+from analysis_store import create_analysis_store, AnalysisMemo
+from session_store import ServerSideSessionInterface, create_session_backend, regenerate_session
+from metrics import (REGISTRY, RequestMetricsMiddleware, ROUTE_ENVIRON_KEY, TEMPLATE_SECONDS, RESUME_UPLOADS,
+                     stage)
+from career_model import load_career_predictor
+from career_scoring import (JOB_SKILLS_MAPPING, current_skill_matrix, normalize_skill,
+                            calculate_job_eligibility, analyze_skill_gaps, score_candidates)
+
+class SpooledUploadRequest(Request):
+    """Receives uploaded files into an UploadSpool instead of Werkzeug's temporary file."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return UploadSpool(current_app.config['UPLOAD_SPOOL_MAX_MEMORY'], current_app.config['UPLOAD_FOLDER'])
 
 app = Flask(__name__)
+app.request_class = SpooledUploadRequest
 app.secret_key = 'your-secret-key-here'
 
-# Add escapejs filter
+# Add escapejs filter. Chained str.replace calls are each one C-level scan: as fast as a
+# translate table or a regex on short labels, much faster on long text (bench_render.py)
 def escapejs_filter(s):
     if s is None:
         return ''
@@ -30,14 +54,113 @@ def escapejs_filter(s):
     return Markup(s)
 
 app.jinja_env.filters['escapejs'] = escapejs_filter
+
+# {% cache %} fragments: the per-career blocks of the analysis and guidance pages. 0 turns it off
+app.config['TEMPLATE_FRAGMENT_CACHE_MAX_ENTRIES'] = int(os.environ.get('TEMPLATE_FRAGMENT_CACHE_MAX_ENTRIES', 2048))
+app.jinja_env.add_extension(FragmentCacheExtension)
+app.jinja_env.fragment_cache.max_entries = app.config['TEMPLATE_FRAGMENT_CACHE_MAX_ENTRIES']
+
+# Compiled templates are kept here, relative to the app, so restarted workers skip parsing them; empty turns it off
+app.config['TEMPLATE_BYTECODE_CACHE'] = os.environ.get('TEMPLATE_BYTECODE_CACHE', 'jinja_cache')
+if app.config['TEMPLATE_BYTECODE_CACHE']:
+    bytecode_cache_dir = os.path.join(app.root_path, app.config['TEMPLATE_BYTECODE_CACHE'])
+    os.makedirs(bytecode_cache_dir, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
+# Compile every template at startup rather than on the first request to each
+# page. python app.py always does; WSGI servers importing the app opt in
+app.config['TEMPLATE_PRECOMPILE'] = os.environ.get('TEMPLATE_PRECOMPILE', '0') == '1'
+
 app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+# Uploads up to this size are handled in memory; larger ones spill to UPLOAD_FOLDER
+app.config['UPLOAD_SPOOL_MAX_MEMORY'] = int(os.environ.get('UPLOAD_SPOOL_MAX_MEMORY', 1024 * 1024))
 
 # Ensure upload directory exists
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
+# Sessions stay in Flask's signed cookie unless a server-side store is set, in
+# which case the cookie holds only a session ID. sqlite:///path.db is shared by
+# every worker and survives restarts; 'memory' is for a single worker only
+app.config['SESSION_STORE'] = os.environ.get('SESSION_STORE', 'cookie')
+app.config['SESSION_STORE_MAX_SESSIONS'] = int(os.environ.get('SESSION_STORE_MAX_SESSIONS', 10000))
+app.config['SESSION_STORE_TTL'] = int(os.environ.get('SESSION_STORE_TTL', 24 * 3600))
+
+if app.config['SESSION_STORE'] != 'cookie':
+    app.session_interface = ServerSideSessionInterface(create_session_backend(
+        app.config['SESSION_STORE'],
+        max_sessions=app.config['SESSION_STORE_MAX_SESSIONS'],
+        ttl=app.config['SESSION_STORE_TTL']
+    ))
+
+# Request, stage and cache metrics served at /metrics; METRICS_ENABLED=0 turns them off
+app.config['METRICS_ENABLED'] = REGISTRY.enabled
+
+if app.config['METRICS_ENABLED']:
+    app.wsgi_app = RequestMetricsMiddleware(app.wsgi_app)
+
+@app.before_request
+def label_request_route():
+    # Group request timings by URL rule so /career-guidance/<title> is one series
+    if request.url_rule is not None:
+        request.environ[ROUTE_ENVIRON_KEY] = request.url_rule.rule
+
+@before_render_template.connect_via(app)
+def start_template_timer(sender, template, context, **extra):
+    g.setdefault('template_started', []).append(time.perf_counter())
+
+@template_rendered.connect_via(app)
+def stop_template_timer(sender, template, context, **extra):
+    started = g.get('template_started')
+    if started:
+        TEMPLATE_SECONDS.observe(time.perf_counter() - started.pop(), template.name)
+
+# Background resume extraction settings
+app.config['RESUME_WORKERS'] = int(os.environ.get('RESUME_WORKERS', 2))
+app.config['RESUME_QUEUE_SIZE'] = int(os.environ.get('RESUME_QUEUE_SIZE', 32))
+app.config['RESUME_JOB_TIMEOUT'] = int(os.environ.get('RESUME_JOB_TIMEOUT', 30))
+
+# Cache of extracted text and parsed fields, keyed by upload content hash
+app.config['RESUME_CACHE_FOLDER'] = os.environ.get('RESUME_CACHE_FOLDER', 'resume_cache')
+app.config['RESUME_CACHE_MAX_ENTRIES'] = int(os.environ.get('RESUME_CACHE_MAX_ENTRIES', 1000))
+app.config['RESUME_CACHE_MAX_BYTES'] = int(os.environ.get('RESUME_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+
+resume_cache = ResumeCache(
+    app.config['RESUME_CACHE_FOLDER'],
+    max_entries=app.config['RESUME_CACHE_MAX_ENTRIES'],
+    max_bytes=app.config['RESUME_CACHE_MAX_BYTES']
+)
+
+# Deduplicated store of uploaded resumes; an empty folder setting turns it off
+app.config['RESUME_STORE_FOLDER'] = os.environ.get('RESUME_STORE_FOLDER', 'resume_store')
+app.config['RESUME_STORE_MAX_AGE_DAYS'] = float(os.environ.get('RESUME_STORE_MAX_AGE_DAYS', 30))
+app.config['RESUME_STORE_MAX_BYTES'] = int(os.environ.get('RESUME_STORE_MAX_BYTES', 1024 * 1024 * 1024))
+app.config['RESUME_STORE_SWEEP_INTERVAL'] = int(os.environ.get('RESUME_STORE_SWEEP_INTERVAL', 600))
+
+_resume_store = None
+_resume_store_lock = threading.Lock()
+
+def get_resume_store():
+    """Return the resume store, opening it and starting its sweeper on first use; None if turned off."""
+    global _resume_store
+    with _resume_store_lock:
+        if _resume_store is None and app.config['RESUME_STORE_FOLDER']:
+            _resume_store = ResumeStore(
+                app.config['RESUME_STORE_FOLDER'],
+                max_age=app.config['RESUME_STORE_MAX_AGE_DAYS'] * 24 * 3600,
+                max_bytes=app.config['RESUME_STORE_MAX_BYTES']
+            )
+            _resume_store.start_sweeper(app.config['RESUME_STORE_SWEEP_INTERVAL'])
+        return _resume_store
+
+resume_jobs = ResumeJobQueue(
+    max_workers=app.config['RESUME_WORKERS'],
+    max_pending=app.config['RESUME_QUEUE_SIZE'],
+    job_timeout=app.config['RESUME_JOB_TIMEOUT']
+)
+
 # Allowed file extensions for resume upload
-ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'doc', 'docx'}
+ALLOWED_EXTENSIONS = SUPPORTED_EXTENSIONS
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -52,6 +175,7 @@ def login():
         email = request.form['email']
         password = request.form['password']
         # For now, just store email in session (implement proper auth later)
+        regenerate_session(session)
         session['user_email'] = email
         return redirect(url_for('upload_resume'))
     return render_template('login.html')
@@ -62,6 +186,7 @@ def register():
         email = request.form['email']
         password = request.form['password']
         # Implement registration logic here
+        regenerate_session(session)
         flash('Registration successful! Please login.', 'success')
         return redirect(url_for('login'))
     return render_template('register.html')
@@ -82,20 +207,53 @@ def upload_resume():
             return redirect(request.url)
         
         if file and allowed_file(file.filename):
-            filename = secure_filename(file.filename)
-            file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(file_path)
-            session['resume_filename'] = filename
-            
-            # Extract information from resume
+            extension = file.filename.rsplit('.', 1)[1].lower()
+            # The upload is still in memory (or spilled to a private file); check its
+            # real type and size before anything parses it
+            spool = spool_upload(file, app.config['UPLOAD_SPOOL_MAX_MEMORY'], app.config['UPLOAD_FOLDER'])
             try:
-                text = extract_text_from_file(file_path)
-                extracted_info = parse_resume_info(text)
-                session['extracted_info'] = extracted_info
+                check_upload(spool, extension)
+            except InvalidUpload as e:
+                flash(str(e), 'error')
+                return render_template('upload_resume.html')
+
+            RESUME_UPLOADS.inc(extension)
+            session['resume_filename'] = secure_filename(file.filename)
+            try:
+                resume_store = get_resume_store()
+                if resume_store is not None:
+                    resume_store.put(session['user_email'], spool.source, spool.sha256,
+                                     session['resume_filename'], extension)
+            except (OSError, sqlite3.Error) as e:
+                # Keeping a copy is secondary; the upload is still read from the spool
+                print(f"Error storing resume upload: {str(e)}")
+            
+            # Reuse earlier results for an identical file
+            cache_key = resume_cache.key_for_digest(spool.sha256)
+            cached = resume_cache.get(cache_key)
+            if cached is not None:
+                session.pop('resume_job_id', None)
+                session['extracted_info'] = cached['info']
                 flash('Resume uploaded successfully! Information extracted and pre-filled below.', 'success')
+                return redirect(url_for('personal_info'))
+
+            # Extract information from resume in the background
+            session['extracted_info'] = {}
+            # Small uploads go to the worker as bytes; spilled ones by path, which the job removes
+            source = spool.detach()
+            try:
+                session['resume_job_id'] = resume_jobs.submit(source, resume_cache, cache_key,
+                                                              file_format=extension,
+                                                              remove_source=not spool.in_memory)
+                flash('Resume uploaded successfully! We are reading it now and will pre-fill your details below.', 'success')
+            except QueueFullError:
+                session.pop('resume_job_id', None)
+                flash('Resume uploaded, but our resume reader is busy right now. Please fill the form manually.', 'warning')
             except Exception as e:
+                session.pop('resume_job_id', None)
                 flash('Resume uploaded but information extraction failed. Please fill the form manually.', 'warning')
-                session['extracted_info'] = {}
+            if 'resume_job_id' not in session and not spool.in_memory:
+                os.remove(source)  # No job took the spilled file over
             
             return redirect(url_for('personal_info'))
         else:
@@ -103,110 +261,18 @@ def upload_resume():
     
     return render_template('upload_resume.html')
 
-def extract_text_from_file(file_path):
-    """Extract text from various file formats"""
-    text = ""
-    file_ext = file_path.lower().split('.')[-1]
-    
-    try:
-        if file_ext == 'pdf':
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-        
-        elif file_ext in ['doc', 'docx']:
-            doc = Document(file_path)
-            for paragraph in doc.paragraphs:
-                text += paragraph.text + "\n"
-        
-        elif file_ext in ['png', 'jpg', 'jpeg', 'gif']:
-            image = Image.open(file_path)
-            text = pytesseract.image_to_string(image)
-        
-        elif file_ext == 'txt':
-            with open(file_path, 'r', encoding='utf-8') as f:
-                text = f.read()
-    
-    except Exception as e:
-        print(f"Error extracting text from {file_path}: {str(e)}")
-    
-    return text
-
-def parse_resume_info(text):
-    """Parse personal information from resume text"""
-    info = {
-        'name': '',
-        'phone': '',
-        'linkedin': '',
-        'college': '',
-        'degree': '',
-        'age': ''
-    }
-    
-    # Email pattern
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    email_match = re.search(email_pattern, text)
-    if email_match:
-        info['email'] = email_match.group()
-    
-    # Phone pattern (various formats)
-    phone_patterns = [
-        r'\+?\d{1,3}[\s-]?\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}',
-        r'\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}',
-        r'\d{10}'
-    ]
-    for pattern in phone_patterns:
-        phone_match = re.search(pattern, text)
-        if phone_match:
-            info['phone'] = phone_match.group()
-            break
-    
-    # LinkedIn pattern
-    linkedin_pattern = r'linkedin\.com/in/[\w-]+|linkedin\.com/pub/[\w-]+'
-    linkedin_match = re.search(linkedin_pattern, text, re.IGNORECASE)
-    if linkedin_match:
-        info['linkedin'] = 'https://' + linkedin_match.group()
-    
-    # Name extraction (first few lines, excluding email/phone)
-    lines = text.split('\n')
-    for line in lines[:5]:
-        line = line.strip()
-        if line and not re.search(r'@|\d{10}|linkedin|resume|cv', line, re.IGNORECASE):
-            if len(line.split()) >= 2 and len(line) < 50:
-                info['name'] = line
-                break
-    
-    # Education extraction
-    education_keywords = ['university', 'college', 'institute', 'school']
-    degree_keywords = ['bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'bca', 'mca', 'be', 'me']
-    
-    for line in lines:
-        line_lower = line.lower()
-        if any(keyword in line_lower for keyword in education_keywords):
-            info['college'] = line.strip()
-            break
-    
-    for line in lines:
-        line_lower = line.lower()
-        if any(keyword in line_lower for keyword in degree_keywords):
-            # Extract degree information
-            if 'computer' in line_lower or 'cs' in line_lower:
-                info['degree'] = 'Computer Science'
-            elif 'engineering' in line_lower or 'engineer' in line_lower:
-                info['degree'] = 'Engineering'
-            elif 'business' in line_lower or 'mba' in line_lower:
-                info['degree'] = 'Business Administration'
-            elif 'data' in line_lower:
-                info['degree'] = 'Data Science'
-            elif 'information' in line_lower and 'technology' in line_lower:
-                info['degree'] = 'Information Technology'
-            break
-    
-    return info
-
+@app.route('/api/resume-cache/stats')
+def resume_cache_stats():
+    """Hit/miss counters for the resume extraction cache."""
+    return jsonify(resume_cache.stats())
 
+@app.route('/api/resume-store/stats')
+def resume_store_stats():
+    """Dedup savings, stored bytes and the last retention sweep of the resume store."""
+    resume_store = get_resume_store()
+    if resume_store is None:
+        return jsonify({'enabled': False})
+    return jsonify(resume_store.stats())
 
 @app.route('/personal-info', methods=['GET', 'POST'])
 def personal_info():
@@ -227,9 +293,44 @@ def personal_info():
         }
         return redirect(url_for('skills_assessment'))
     
+    # Pick up the background extraction result if it has finished
+    collect_resume_job()
+
     # Get extracted information from session
     extracted_info = session.get('extracted_info', {})
-    return render_template('personal_info.html', extracted_info=extracted_info)
+    return render_template('personal_info.html',
+                           extracted_info=extracted_info,
+                           resume_job_id=session.get('resume_job_id'))
+
+def collect_resume_job():
+    """Move a finished extraction job's result into the session and return the job."""
+    job_id = session.get('resume_job_id')
+    if not job_id:
+        return None
+
+    job = resume_jobs.status(job_id)
+    if job is None or job['status'] != 'pending':
+        session.pop('resume_job_id', None)
+    if job is not None and job['status'] == 'done':
+        session['extracted_info'] = job['result'] or {}
+    return job
+
+@app.route('/api/resume-jobs/<job_id>')
+def resume_job_status(job_id):
+    """Poll the status of the current user's resume extraction job."""
+    if 'user_email' not in session:
+        return jsonify({'error': 'Not logged in'}), 401
+    if job_id != session.get('resume_job_id'):
+        return jsonify({'error': 'Unknown job'}), 404
+
+    job = collect_resume_job()
+    if job is None:
+        return jsonify({'status': 'expired'})
+    return jsonify({
+        'status': job['status'],
+        'result': job['result'] or {},
+        'error': job['error']
+    })
 
 @app.route('/skills-assessment', methods=['GET', 'POST'])
 def skills_assessment():
@@ -284,122 +385,44 @@ def aptitude_test():
     
     return render_template('aptitude_test.html')
 
-# Store analysis results in memory (in production, use a proper cache or database)
-analysis_store = {}
+# Analysis results store: "memory" for a single process, or
+# "sqlite:///path/analyses.db" to share results between workers
+app.config['ANALYSIS_STORE'] = os.environ.get('ANALYSIS_STORE', 'memory')
+app.config['ANALYSIS_STORE_MAX_ENTRIES'] = int(os.environ.get('ANALYSIS_STORE_MAX_ENTRIES', 1000))
+app.config['ANALYSIS_STORE_TTL'] = int(os.environ.get('ANALYSIS_STORE_TTL', 3600))
+
+analysis_store = create_analysis_store(
+    app.config['ANALYSIS_STORE'],
+    max_entries=app.config['ANALYSIS_STORE_MAX_ENTRIES'],
+    ttl=app.config['ANALYSIS_STORE_TTL']
+)
+
+# Computed analyses shared by every user with the same normalized skills
+app.config['ANALYSIS_MEMO_MAX_ENTRIES'] = int(os.environ.get('ANALYSIS_MEMO_MAX_ENTRIES', 4096))
+
+analysis_memo = AnalysisMemo(max_entries=app.config['ANALYSIS_MEMO_MAX_ENTRIES'])
+
+# Trained career model exported by train_career_model.py; the page skips it when none is found
+app.config['CAREER_MODEL_PATH'] = os.environ.get('CAREER_MODEL_PATH', 'models/career_model')
+app.config['CAREER_MODEL_MAX_BATCH'] = int(os.environ.get('CAREER_MODEL_MAX_BATCH', 64))
+app.config['CAREER_MODEL_MAX_WAIT_MS'] = float(os.environ.get('CAREER_MODEL_MAX_WAIT_MS', 0))
+
+career_predictor = load_career_predictor(
+    app.config['CAREER_MODEL_PATH'],
+    max_batch=app.config['CAREER_MODEL_MAX_BATCH'],
+    max_wait=app.config['CAREER_MODEL_MAX_WAIT_MS'] / 1000
+)
 
 def generate_analysis_id():
     """Generate a unique ID for storing analysis results."""
     import uuid
     return str(uuid.uuid4())
 
-# Job skills mapping based on the notebook
-JOB_SKILLS_MAPPING = {
-    'Cloud Engineer': ['cloud computing', 'devops', 'networking', 'linux', 'python', 'security'],
-    'Web Developer': ['javascript', 'html', 'css', 'web development', 'api', 'database'],
-    'Network Engineer': ['networking', 'linux', 'security'],
-    'Database Administrator': ['sql', 'nosql', 'database', 'security'],
-    'Cybersecurity Analyst': ['cybersecurity', 'networking', 'linux', 'security'],
-    'Software Engineer': ['java', 'python', 'c++', 'data structures', 'algorithms', 'devops'],
-    'AI Engineer': ['machine learning', 'python', 'data analysis', 'tensorflow', 'pytorch'],
-    'Embedded Systems Engineer': ['c++', 'c', 'embedded systems', 'hardware'],
-    'Business Analyst': ['business analysis', 'communication', 'sql', 'data analysis', 'project management'],
-    'Data Analyst': ['data analysis', 'sql', 'python', 'data visualization'],
-    'DevOps Engineer': ['devops', 'cloud computing', 'linux', 'automation'],
-    'Mobile App Developer': ['java', 'kotlin', 'swift', 'mobile development', 'ui/ux design'],
-    'UI/UX Designer': ['ui/ux design', 'user research', 'graphic design'],
-    'Project Manager': ['project management', 'leadership', 'communication', 'risk management'],
-    'Data Scientist': ['data analysis', 'machine learning', 'python', 'statistics']
-}
-
-def normalize_skill(skill):
-    """Normalize skill names to match the job requirements"""
-    if not skill:
-        return ''
-    
-    skill = skill.strip().lower()
-    
-    # Skill mapping for normalization
-    skill_mapping = {
-        'js': 'javascript', 'nodejs': 'javascript', 'node.js': 'javascript',
-        'reactjs': 'javascript', 'react.js': 'javascript',
-        'py': 'python', 'django': 'python', 'flask': 'python',
-        'cpp': 'c++', 'cplusplus': 'c++',
-        'csharp': 'c#', 'dotnet': 'c#', '.net': 'c#',
-        'ml': 'machine learning', 'ai': 'machine learning',
-        'artificial intelligence': 'machine learning',
-        'dl': 'deep learning', 'neural networks': 'deep learning',
-        'aws': 'cloud computing', 'azure': 'cloud computing', 'gcp': 'cloud computing',
-        'mysql': 'sql', 'postgresql': 'sql', 'postgres': 'sql',
-        'mongodb': 'nosql', 'cassandra': 'nosql', 'redis': 'nosql',
-        'html5': 'html', 'css3': 'css',
-        'communication skills': 'communication',
-        'project planning': 'project management',
-        'user interface': 'ui/ux design', 'user experience': 'ui/ux design'
-    }
-    
-    return skill_mapping.get(skill, skill)
-
-def calculate_job_eligibility(user_skills, job_skills_map):
-    """Calculate eligibility scores for each job based on user skills"""
-    eligibility_scores = {}
-    
-    # Normalize user skills
-    normalized_user_skills = [normalize_skill(skill) for skill in user_skills]
-    
-    for job, required_skills in job_skills_map.items():
-        if not required_skills:
-            eligibility_scores[job] = 0.0
-            continue
-        
-        # Calculate skill match percentage
-        matched_skills = [skill for skill in normalized_user_skills if skill in required_skills]
-        skill_match_percentage = (len(matched_skills) / len(required_skills)) * 100
-        
-        # Add bonus for having more skills
-        bonus_points = min(20, len(normalized_user_skills) * 0.5)
-        
-        # Final score
-        final_score = min(100, skill_match_percentage + bonus_points)
-        eligibility_scores[job] = final_score
-    
-    return eligibility_scores
-
-def analyze_skill_gaps(user_skills, job_skills_map):
-    """Analyze skill gaps for each job"""
-    normalized_user_skills = [normalize_skill(skill) for skill in user_skills]
-    skill_gaps = {}
-    
-    for job, required_skills in job_skills_map.items():
-        missing_skills = [skill for skill in required_skills if skill not in normalized_user_skills]
-        skill_gaps[job] = {
-            'missing_skills': missing_skills,
-            'match_percentage': ((len(required_skills) - len(missing_skills)) / len(required_skills)) * 100 if required_skills else 0
-        }
-    
-    return skill_gaps
-
-@app.route('/career-analysis')
-def career_analysis():
-    if 'user_email' not in session:
-        return redirect(url_for('login'))
-    
-    # Get user data from session
-    user_skills = session.get('skills', {})
-    personal_info = session.get('personal_info', {})
-    test_results = session.get('test_results', {})
-    
-    # Combine all user skills
-    all_user_skills = []
-    if 'technical_skills' in user_skills:
-        all_user_skills.extend(user_skills['technical_skills'])
-    if 'soft_skills' in user_skills:
-        all_user_skills.extend(user_skills['soft_skills'])
-    
-    # Calculate job eligibility scores
-    job_eligibility = calculate_job_eligibility(all_user_skills, JOB_SKILLS_MAPPING)
-    
-    # Sort jobs by eligibility score
-    sorted_jobs = sorted(job_eligibility.items(), key=lambda x: x[1], reverse=True)
+def compute_career_analysis(matrix, all_user_skills):
+    """Build the skill-dependent part of the career analysis page."""
+    # Score only the jobs that share a skill with the user, and keep the top 5
+    scores = matrix.top_jobs(all_user_skills)
+    sorted_jobs = scores.top(5)
     
     # Get top 5 recommendations
     recommended_careers = []
@@ -417,16 +440,13 @@ def career_analysis():
             'growth': growth_mapping.get(job, 'Medium')
         })
     
-    # Analyze skill gaps
-    skill_gap_analysis = analyze_skill_gaps(all_user_skills, JOB_SKILLS_MAPPING)
-    
     # Generate skill gaps for top jobs
     skill_gaps = []
     for job, score in sorted_jobs[:3]:
-        gaps = skill_gap_analysis[job]
-        if gaps['missing_skills']:
+        missing_skills = scores.missing_skills(job)
+        if missing_skills:
             skill_gaps.append({
-                'skill': ', '.join(gaps['missing_skills'][:3]),  # Top 3 missing skills
+                'skill': ', '.join(missing_skills[:3]),  # Top 3 missing skills
                 'importance': 'High' if score < 70 else 'Medium',
                 'current_level': 'None'
             })
@@ -447,8 +467,7 @@ def career_analysis():
     
     recommended_courses = []
     for job, score in sorted_jobs[:3]:
-        gaps = skill_gap_analysis[job]
-        for skill in gaps['missing_skills'][:2]:  # Top 2 missing skills per job
+        for skill in scores.missing_skills(job)[:2]:  # Top 2 missing skills per job
             if skill in course_mapping:
                 recommended_courses.append({
                     'title': course_mapping[skill],
@@ -464,32 +483,279 @@ def career_analysis():
             unique_courses.append(course)
             seen_courses.add(course['title'])
     
-    # Prepare the analysis results
-    analysis_id = generate_analysis_id()
-    analysis_results = {
+    return {
         'recommended_careers': recommended_careers,
-        'user_skills': user_skills,
         'skill_gaps': skill_gaps,
         'trending_jobs_suitability': round(trending_jobs_suitability),
         'recommended_courses': unique_courses[:5]  # Top 5 courses
     }
+
+@app.route('/career-analysis')
+def career_analysis():
+    if 'user_email' not in session:
+        return redirect(url_for('login'))
     
-    # Store results in memory with the analysis_id
-    analysis_store[analysis_id] = analysis_results
+    # Get user data from session
+    user_skills = session.get('skills', {})
+    personal_info = session.get('personal_info', {})
+    test_results = session.get('test_results', {})
     
-    # Store only the analysis_id in the session
-    session['current_analysis_id'] = analysis_id
+    # Combine all user skills
+    all_user_skills = []
+    if 'technical_skills' in user_skills:
+        all_user_skills.extend(user_skills['technical_skills'])
+    if 'soft_skills' in user_skills:
+        all_user_skills.extend(user_skills['soft_skills'])
     
-    return render_template('career_analysis.html', results=analysis_results)
+    # Identical normalized skill profiles share one computed analysis
+    matrix = current_skill_matrix()
+    profile_key = matrix.profile_key(all_user_skills)
+    computed = analysis_memo.get(matrix.version, profile_key)
+    if computed is None:
+        with stage('score'):
+            computed = compute_career_analysis(matrix, all_user_skills)
+        analysis_memo.put(matrix.version, profile_key, computed)
+
+    # Prepare the analysis results
+    analysis_results = {
+        'recommended_careers': computed['recommended_careers'],
+        'user_skills': user_skills,
+        'skill_gaps': computed['skill_gaps'],
+        'trending_jobs_suitability': computed['trending_jobs_suitability'],
+        'recommended_courses': computed['recommended_courses']
+    }
+    key_parts = [profile_key, user_skills]
+    if career_predictor is not None:
+        # Concurrent requests share one batched prediction
+        analysis_results['model_careers'] = career_predictor.predict(personal_info, user_skills, test_results)
+        key_parts += [personal_info, test_results, career_predictor.model.version]
+
+    # Refreshing with unchanged inputs keeps the stored analysis and its id
+    results_key = hashlib.sha256(json.dumps(key_parts, sort_keys=True).encode('utf-8')).hexdigest()
+    analysis_id = session.get('current_analysis_id')
+    if (not analysis_id or session.get('current_analysis_key') != results_key
+            or analysis_store.get(analysis_id) is None):
+        analysis_id = generate_analysis_id()
+
+        # Store results with the analysis_id
+        analysis_store.put(analysis_id, analysis_results)
+
+        # Store only the analysis_id in the session
+        session['current_analysis_id'] = analysis_id
+        session['current_analysis_key'] = results_key
+    
+    return render_template('career_analysis.html', results=analysis_results, catalogue_version=matrix.version)
+
+# Limits for the batch scoring API
+BATCH_SCORE_MAX_K = 20
+BATCH_SCORE_MAX_JSON_CANDIDATES = 5000
+
+def candidate_skills(candidate):
+    """Return the skill list of a batch candidate, or None if it is malformed.
+
+    A candidate is either a plain list of skills or an object with a
+    ``skills`` list or the wizard's ``technical_skills``/``soft_skills``.
+    """
+    if isinstance(candidate, list):
+        skills = candidate
+    elif isinstance(candidate, dict):
+        if 'skills' in candidate:
+            skills = candidate['skills']
+        else:
+            technical = candidate.get('technical_skills', [])
+            soft = candidate.get('soft_skills', [])
+            if not isinstance(technical, list) or not isinstance(soft, list):
+                return None
+            skills = technical + soft
+    else:
+        return None
+    if not isinstance(skills, list) or not all(isinstance(skill, str) for skill in skills):
+        return None
+    return skills
+
+@app.route('/api/score/batch', methods=['POST'])
+def score_batch():
+    """Rank every career for many candidates at once.
+
+    JSON requests send ``{"candidates": [...], "k": 5}`` and get
+    ``{"results": [...]}`` back. NDJSON requests (``application/x-ndjson``)
+    send one candidate per line, pass ``k`` in the query string and get one
+    result per line, streamed as each chunk of candidates is scored.
+    """
+    k = request.args.get('k', 5, type=int)
+
+    if request.mimetype == 'application/x-ndjson':
+        def lines():
+            for line in request.stream:
+                if line.strip():
+                    yield line
+        return Response(stream_with_context(stream_batch_scores(lines(), min(max(k, 1), BATCH_SCORE_MAX_K))),
+                        mimetype='application/x-ndjson')
+
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('candidates'), list):
+        return jsonify({'error': 'Expected a JSON object with a candidates list'}), 400
+    if len(data['candidates']) > BATCH_SCORE_MAX_JSON_CANDIDATES:
+        return jsonify({'error': f'Send at most {BATCH_SCORE_MAX_JSON_CANDIDATES} candidates per JSON request, '
+                                 'or use application/x-ndjson to stream more'}), 413
+    k = data.get('k', k)
+    if not isinstance(k, int) or not 1 <= k <= BATCH_SCORE_MAX_K:
+        return jsonify({'error': f'k must be between 1 and {BATCH_SCORE_MAX_K}'}), 400
+
+    skill_lists = [candidate_skills(candidate) for candidate in data['candidates']]
+    invalid = [index for index, skills in enumerate(skill_lists) if skills is None]
+    if invalid:
+        return jsonify({'error': 'Malformed candidates', 'indexes': invalid[:20]}), 400
+
+    results = []
+    for index, careers in enumerate(score_candidates(skill_lists, k=k)):
+        candidate = data['candidates'][index]
+        candidate_id = candidate.get('id', index) if isinstance(candidate, dict) else index
+        results.append({'id': candidate_id, 'careers': careers})
+    return jsonify({'results': results})
+
+def stream_batch_scores(lines, k):
+    """Score NDJSON candidate lines lazily and yield NDJSON result lines."""
+    pending = deque()  # (id, error) for each candidate handed to the scorer
+
+    def skill_lists():
+        for index, line in enumerate(lines):
+            try:
+                candidate = json.loads(line)
+            except ValueError:
+                candidate = None
+            skills = candidate_skills(candidate)
+            candidate_id = candidate.get('id', index) if isinstance(candidate, dict) else index
+            pending.append((candidate_id, None if skills is not None else 'Malformed candidate'))
+            yield skills or []
+
+    for careers in score_candidates(skill_lists(), k=k):
+        candidate_id, error = pending.popleft()
+        if error:
+            yield json.dumps({'id': candidate_id, 'error': error}) + '\n'
+        else:
+            yield json.dumps({'id': candidate_id, 'careers': careers}) + '\n'
+
+@app.route('/api/analysis')
+def current_analysis():
+    """Return the stored results of the user's latest career analysis."""
+    analysis_id = session.get('current_analysis_id')
+    results = analysis_store.get(analysis_id) if analysis_id else None
+    if results is None:
+        return jsonify({'error': 'No analysis found'}), 404
+    return jsonify({'analysis_id': analysis_id, 'results': results})
+
+@app.route('/api/analysis-store/stats')
+def analysis_store_stats():
+    """Entry count, stored bytes and eviction counts of the analysis store."""
+    return jsonify(analysis_store.stats())
+
+@app.route('/api/session-store/stats')
+def session_store_stats():
+    """Session count and stored bytes of the server-side session backend."""
+    if not isinstance(app.session_interface, ServerSideSessionInterface):
+        return jsonify({'backend': 'cookie'})
+    return jsonify(app.session_interface.backend.stats())
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Request, pipeline stage and cache metrics in the Prometheus text format."""
+    if not REGISTRY.enabled:
+        return Response('Metrics are disabled\n', status=404, mimetype='text/plain')
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/analysis-memo/stats')
+def analysis_memo_stats():
+    """Hit rate and invalidations of the shared career analysis memo."""
+    return jsonify(analysis_memo.stats())
+
+# Limit for the career model API
+CAREER_MODEL_MAX_PROFILES = 1000
+
+@app.route('/api/career-model/predict', methods=['POST'])
+def career_model_predict():
+    """Predict careers for many wizard profiles with the trained model.
+
+    Send ``{"profiles": [{"personal_info": {...}, "skills": {...},
+    "test_results": {...}}, ...], "k": 3}``; every section is optional.
+    """
+    if career_predictor is None:
+        return jsonify({'error': 'No career model is loaded'}), 404
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict) or not isinstance(data.get('profiles'), list):
+        return jsonify({'error': 'Expected a JSON object with a profiles list'}), 400
+    if len(data['profiles']) > CAREER_MODEL_MAX_PROFILES:
+        return jsonify({'error': f'Send at most {CAREER_MODEL_MAX_PROFILES} profiles per request'}), 413
+    k = data.get('k', 3)
+    if not isinstance(k, int) or not 1 <= k <= len(career_predictor.model.classes):
+        return jsonify({'error': f'k must be between 1 and {len(career_predictor.model.classes)}'}), 400
+    invalid = [index for index, profile in enumerate(data['profiles'])
+               if not isinstance(profile, dict)
+               or not all(isinstance(profile.get(section, {}), dict)
+                          for section in ('personal_info', 'skills', 'test_results'))]
+    if invalid:
+        return jsonify({'error': 'Malformed profiles', 'indexes': invalid[:20]}), 400
+
+    results = career_predictor.predict_many(data['profiles'], k=k)
+    return jsonify({'version': career_predictor.model.version,
+                    'results': [{'id': profile.get('id', index), 'careers': careers}
+                                for index, (profile, careers) in enumerate(zip(data['profiles'], results))]})
+
+@app.route('/api/career-model/stats')
+def career_model_stats():
+    """Artifact version and micro-batching counts of the career model."""
+    if career_predictor is None:
+        return jsonify({'loaded': False})
+    return jsonify(dict(career_predictor.stats(), loaded=True))
 
 def get_career_key(input_title):
     """Find the correct career key from CAREER_GUIDANCE regardless of case or spaces."""
-    input_title_clean = input_title.replace('%20', ' ').strip().lower()
-    from openapi import CAREER_GUIDANCE  # Import here to avoid circular import
-    for key in CAREER_GUIDANCE.keys():
-        if key.lower() == input_title_clean:
-            return key
-    return 'default'
+    return find_career_key(input_title) or 'default'
+
+# Browsers may reuse a guidance page this long before revalidating it
+app.config['GUIDANCE_CACHE_MAX_AGE'] = int(os.environ.get('GUIDANCE_CACHE_MAX_AGE', 60))
+
+# Generate guidance with the AI model; the page then streams its sections in
+app.config['AI_GUIDANCE'] = os.environ.get('AI_GUIDANCE', '0') == '1'
+
+def guidance_page_validators():
+    """Return a version string and Last-Modified time for the guidance page.
+
+    Both cover the guidance text and the templates the page renders, so a
+    deploy that changes either never gets a stale 304.
+    """
+    version = hashlib.sha256(GUIDANCE_VERSION.encode('utf-8'))
+    last_modified = 0
+    for name in ('base.html', 'career_guidance.html'):
+        path = os.path.join(app.root_path, app.template_folder, name)
+        with open(path, 'rb') as f:
+            version.update(f.read())
+        last_modified = max(last_modified, os.path.getmtime(path))
+    return version.hexdigest()[:16], datetime.fromtimestamp(int(last_modified), timezone.utc)
+
+GUIDANCE_PAGE_VERSION, GUIDANCE_LAST_MODIFIED = guidance_page_validators()
+
+def guidance_etag(career_key, match_percentage, growth):
+    # The nav bar differs for logged-in users, so that is part of the page too
+    payload = json.dumps([GUIDANCE_PAGE_VERSION, career_key, match_percentage, growth,
+                          'user_email' in session, app.config['AI_GUIDANCE']])
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+def guidance_not_modified(etag):
+    """True if the client's cached copy of the page is still current."""
+    if '_flashes' in session:
+        return False  # The page would show pending flash messages
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    return request.if_modified_since is not None and request.if_modified_since >= GUIDANCE_LAST_MODIFIED
+
+def cache_guidance_response(response, etag):
+    response.set_etag(etag)
+    response.last_modified = GUIDANCE_LAST_MODIFIED
+    response.cache_control.private = True
+    response.cache_control.max_age = app.config['GUIDANCE_CACHE_MAX_AGE']
+    response.vary.add('Cookie')
+    return response
 
 @app.route('/career-guidance/<career_title>')
 def career_guidance(career_title):
@@ -499,6 +765,21 @@ def career_guidance(career_title):
         career_key = get_career_key(career_title)
         match_percentage = request.args.get('match', 85, type=int)
         growth = request.args.get('growth', 'High')
+
+        # Repeat views are answered from the browser cache
+        etag = guidance_etag(career_key, match_percentage, growth)
+        if guidance_not_modified(etag):
+            return cache_guidance_response(Response(status=304), etag)
+
+        if app.config['AI_GUIDANCE']:
+            # Send the page shell now; its sections stream in from the model
+            guidance = {'title': career_key, 'match': match_percentage, 'growth': growth}
+            stream_url = url_for('career_guidance_stream', career_title=career_title,
+                                 match=match_percentage, growth=growth)
+            response = app.make_response(render_template('career_guidance.html', guidance=guidance,
+                                                         stream_url=stream_url, sections_version=GUIDANCE_VERSION))
+            return cache_guidance_response(response, etag)
+
         user_skills = session.get('skills', {
             'programming': 'Beginner',
             'problem_solving': 'Intermediate',
@@ -510,11 +791,57 @@ def career_guidance(career_title):
             growth=growth,
             user_skills=user_skills
         )
-        return render_template('career_guidance.html', guidance=guidance)
+        # The sections are the catalogue's text for this career, so they are cached per catalogue version
+        response = app.make_response(render_template('career_guidance.html', guidance=guidance,
+                                                     sections_version=GUIDANCE_VERSION))
+        return cache_guidance_response(response, etag)
     except Exception as e:
         flash(f'Error loading career guidance: {str(e)}', 'error')
         return redirect(url_for('career_analysis'))
 
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.route('/career-guidance/<career_title>/stream')
+def career_guidance_stream(career_title):
+    """Stream the guidance sections as Server-Sent Events, each as soon as it is ready.
+
+    Sends a ``meta`` event with the title, match and growth, one ``section``
+    event per section (``{"name": ..., "value": ...}``) and a final ``done``.
+    """
+    career_key = get_career_key(career_title)
+    match_percentage = request.args.get('match', 85, type=int)
+    growth = request.args.get('growth', 'High')
+    user_skills = session.get('skills', {})
+    use_ai = app.config['AI_GUIDANCE']
+
+    def events():
+        yield sse_event('meta', {'title': career_key, 'match': match_percentage, 'growth': growth})
+        for name, value in iter_career_guidance_sections(career_key, match_percentage, user_skills,
+                                                         use_ai=use_ai):
+            yield sse_event('section', {'name': name, 'value': value})
+        yield sse_event('done', {})
+
+    response = Response(stream_with_context(events()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Stops nginx from buffering the stream
+    return response
+
+@app.route('/api/guidance-cache/stats')
+def guidance_cache_stats():
+    """Hit rates of the AI guidance cache tiers, for tuning the similarity threshold."""
+    return jsonify(get_guidance_cache().stats())
+
+def guidance_payload(career_title, match_percentage, growth, user_skills):
+    """Return the guidance for one career as served by the JSON APIs.
+
+    Unlike the guidance page, careers without their own guidance keep
+    their title and get the default sections.
+    """
+    career_key = find_career_key(career_title) or career_title.replace('%20', ' ').strip()
+    generate = generate_ai_career_guidance if app.config['AI_GUIDANCE'] else generate_career_guidance
+    return generate(career_key, match_percentage, growth, user_skills)
+
 @app.route('/api/career-guidance/<career_title>')
 def get_career_guidance(career_title):
     """API endpoint to get guidance for a specific career."""
@@ -523,19 +850,33 @@ def get_career_guidance(career_title):
         match_percentage = request.args.get('match', 85, type=int)
         growth = request.args.get('growth', 'High')
         
-        # Return JSON response with redirect URL
-        return jsonify({
-            'redirect': url_for('career_guidance', 
-                              career_title=career_title,
-                              match=match_percentage,
-                              growth=growth)
-        })
+        guidance = guidance_payload(career_title, match_percentage, growth, session.get('skills', {}))
+        response = jsonify(guidance)
+        response.add_etag()
+        response.cache_control.private = True
+        response.cache_control.max_age = app.config['GUIDANCE_CACHE_MAX_AGE']
+        response.vary.add('Cookie')
+        return response.make_conditional(request)
         
     except Exception as e:
         return jsonify({
             'error': str(e)
         }), 500
 
+@app.route('/api/analysis/guidance')
+def current_analysis_guidance():
+    """Return guidance for every recommended career of the user's latest analysis."""
+    analysis_id = session.get('current_analysis_id')
+    results = analysis_store.get(analysis_id) if analysis_id else None
+    if results is None:
+        return jsonify({'error': 'No analysis found'}), 404
+    user_skills = results.get('user_skills', {})
+    careers = [
+        guidance_payload(career['title'], round(career['match']), career['growth'], user_skills)
+        for career in results['recommended_careers']
+    ]
+    return jsonify({'analysis_id': analysis_id, 'careers': careers})
+
 @app.route('/logout')
 def logout():
     session.clear()
@@ -561,7 +902,12 @@ def logout():
 # - **Database**: Not yet implemented, but recommended for production.
 # - **Cloud deployment**: Possible future deployment to Azure or other cloud platforms.
 
+if app.config['TEMPLATE_PRECOMPILE']:
+    precompile_templates(app.jinja_env)
+
 if __name__ == '__main__':
+    if not app.config['TEMPLATE_PRECOMPILE']:
+        precompile_templates(app.jinja_env)
     # Bind to the port provided by the environment (Render provides PORT=10000)
     port = int(os.environ.get('PORT', 10000))
     # Allow toggling debug via environment variable (useful for local dev)
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Benchmark: career model latency and throughput, single and batched.
+
+Exports a synthetic forest shaped like the notebook's model (250 trees,
+depth 15, a few hundred leaves per tree) unless ``--model`` points at a
+real artifact from train_career_model.py, then reports:
+
+- load time of the memory-mapped artifact,
+- single-profile latency (feature building plus prediction),
+- throughput of one predict_proba call per batch size,
+- concurrent requests served one at a time vs through the MicroBatcher.
+
+Usage: python benchmarks/bench_career_model.py [--trees 250] [--threads 1 8 32] [--model models/career_model]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from career_model import (CATEGORICAL_FEATURES, NUMERICAL_FEATURES, CareerPredictor, dataset_skill,
+                          load_model, save_model)
+from career_scoring import JOB_SKILLS_MAPPING
+
+ENCODERS = {
+    'Gender': ['Female', 'Male', 'Other'],
+    'Specialization': ['AI/ML', 'CE', 'CSE', 'ECE', 'EEE', 'IT', 'ME'],
+    'Role_Preference': sorted(JOB_SKILLS_MAPPING),
+}
+DEFAULTS = {'Age': 22, 'GPA': 7.5, 'Year_of_Study': 2, 'Aptitude_Score': 5, 'Communication_Score': 3,
+            'Internship_Experience': 1, 'Project_Experience': 2, 'Job_Match_Score': 75, 'Predicted_Job_Success': 70,
+            'Gender': 1, 'Specialization': 2, 'Role_Preference': 0}
+# Feature ranges the synthetic splits are drawn from
+RANGES = {'Age': (18, 26), 'GPA': (5, 10), 'Year_of_Study': (1, 4), 'Aptitude_Score': (1, 10),
+          'Communication_Score': (1, 5), 'Internship_Experience': (0, 1), 'Project_Experience': (0, 5),
+          'Job_Match_Score': (40, 100), 'Predicted_Job_Success': (40, 100),
+          'Gender': (0, 2), 'Specialization': (0, 6), 'Role_Preference': (0, len(JOB_SKILLS_MAPPING) - 1)}
+
+PROFILES = [
+    {'personal_info': {'age': '21', 'degree': 'Computer Science', 'year_of_study': '3rd Year'},
+     'skills': {'technical_skills': ['Python', 'SQL', 'Machine Learning', 'Docker'], 'soft_skills': ['Teamwork']},
+     'test_results': {'logical_reasoning': 'B', 'analytical_thinking': 'B', 'problem_solving': 'B',
+                      'creativity': 'A', 'leadership': 'C'}},
+    {'personal_info': {'age': '24', 'degree': 'Engineering', 'year_of_study': 'Graduate'},
+     'skills': {'technical_skills': ['Java', 'AWS', 'Kubernetes'], 'soft_skills': ['Leadership']},
+     'test_results': {}},
+    {'personal_info': {'age': '19', 'degree': 'Data Science', 'year_of_study': '1st Year'},
+     'skills': {'technical_skills': ['Tableau', 'Excel', 'Statistics'], 'soft_skills': []},
+     'test_results': {'logical_reasoning': 'A', 'analytical_thinking': 'B'}},
+]
+
+
+def synthetic_forest(trees=250, depth=15, leaves=400, classes=12, seed=0):
+    """Return ``(arrays, manifest)`` for a random forest over the serving features.
+
+    Each tree grows by splitting a random leaf until it has ``leaves``
+    leaves or every leaf is at ``depth``, like a forest limited by
+    ``min_samples_leaf``.
+    """
+    rng = np.random.default_rng(seed)
+    skills = sorted({dataset_skill(skill) for required in JOB_SKILLS_MAPPING.values() for skill in required})
+    features = NUMERICAL_FEATURES + CATEGORICAL_FEATURES + ['skill:' + skill for skill in skills]
+    low = np.array([RANGES.get(name, (0, 1))[0] for name in features], dtype=float)
+    high = np.array([RANGES.get(name, (0, 1))[1] for name in features], dtype=float)
+
+    feature, threshold, children, roots, node_depth = [], [], [], [], []
+    for _ in range(trees):
+        root = len(feature)
+        roots.append(root)
+        feature.append(0), threshold.append(0.0), children.append([root, root]), node_depth.append(0)
+        open_leaves = [root]
+        leaf_count = 1
+        while leaf_count < leaves and open_leaves:
+            node = open_leaves.pop(rng.integers(len(open_leaves)))
+            column = int(rng.integers(len(features)))
+            children[node] = []
+            for _ in range(2):
+                child = len(feature)
+                feature.append(0), threshold.append(0.0), children.append([child, child])
+                node_depth.append(node_depth[node] + 1)
+                children[node].append(child)
+                if node_depth[child] < depth:
+                    open_leaves.append(child)
+            feature[node] = column
+            threshold[node] = (0.5 if low[column] == 0 and high[column] == 1
+                               else float(rng.uniform(low[column], high[column])))
+            leaf_count += 1
+
+    value = rng.dirichlet(np.full(classes, 0.3), size=len(feature))
+    arrays = {
+        'feature': np.array(feature, dtype=np.int64),
+        'threshold': np.array(threshold, dtype=np.float64),
+        'children': np.array(children, dtype=np.int64),
+        'value': value,
+        'roots': np.array(roots, dtype=np.int64),
+    }
+    manifest = {
+        'features': features,
+        'classes': sorted(JOB_SKILLS_MAPPING)[:classes] + [f'Career {index}' for index in
+                                                           range(classes - len(JOB_SKILLS_MAPPING))],
+        'encoders': ENCODERS,
+        'defaults': DEFAULTS,
+        'depth': max(node_depth),
+        'params': {'n_estimators': trees, 'max_depth': depth, 'synthetic': True},
+    }
+    return arrays, manifest
+
+
+def export_synthetic(root, **kwargs):
+    """Export a synthetic forest to ``root`` and return its version."""
+    arrays, manifest = synthetic_forest(**kwargs)
+    return save_model(root, arrays, manifest)
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_single(predictor, requests):
+    samples = []
+    for index in range(requests):
+        profile = PROFILES[index % len(PROFILES)]
+        started = time.perf_counter()
+        predictor.model.top_careers(predictor.model.predict_proba(predictor.model.features(**profile))[0])
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def time_batches(model, rows, batch_size, seconds=0.5):
+    batch = rows[np.arange(batch_size) % len(rows)]
+    model.predict_proba(batch)
+    calls = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        model.predict_proba(batch)
+        calls += 1
+    elapsed = time.perf_counter() - started
+    return elapsed / calls, calls * batch_size / elapsed
+
+
+def run_concurrent(predict, threads, requests_per_thread):
+    """Call ``predict(profile)`` from ``threads`` threads; return (rows/s, latencies)."""
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def client(offset):
+        own = []
+        barrier.wait()
+        for index in range(requests_per_thread):
+            started = time.perf_counter()
+            predict(PROFILES[(offset + index) % len(PROFILES)])
+            own.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own)
+
+    workers = [threading.Thread(target=client, args=(offset,)) for offset in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return threads * requests_per_thread / (time.perf_counter() - started), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', help='artifact exported by train_career_model.py')
+    parser.add_argument('--trees', type=int, default=250)
+    parser.add_argument('--depth', type=int, default=15)
+    parser.add_argument('--leaves', type=int, default=400)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 8, 32, 128, 512])
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 8, 32])
+    parser.add_argument('--requests', type=int, default=200, help='requests per thread')
+    parser.add_argument('--max-batch', type=int, default=64)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.model
+        if root is None:
+            root = os.path.join(tmp, 'career_model')
+            export_synthetic(root, trees=args.trees, depth=args.depth, leaves=args.leaves)
+
+        started = time.perf_counter()
+        model = load_model(root)
+        load_ms = (time.perf_counter() - started) * 1000
+        print(f"model {model.version}: {len(model.roots)} trees, {len(model.feature)} nodes, depth {model.depth}, "
+              f"{model.n_features} features, {len(model.classes)} classes; mmap load {load_ms:.1f} ms\n")
+
+        predictor = CareerPredictor(model, max_batch=args.max_batch)
+        single = time_single(predictor, args.requests)
+        print(f"single profile: p50 {percentile(single, 0.5) * 1e6:.0f} us, "
+              f"p99 {percentile(single, 0.99) * 1e6:.0f} us\n")
+
+        rows = np.stack([model.features(**profile) for profile in PROFILES])
+        print(f"{'batch':>6}{'ms/batch':>10}{'us/row':>9}{'rows/s':>10}")
+        for batch_size in args.batch_sizes:
+            per_batch, throughput = time_batches(model, rows, batch_size)
+            print(f"{batch_size:>6}{per_batch * 1000:>10.2f}{per_batch / batch_size * 1e6:>9.1f}{throughput:>10.0f}")
+
+        def unbatched(profile):
+            return model.top_careers(model.predict_proba(model.features(**profile))[0])
+
+        def batched(profile):
+            return predictor.predict(**profile)
+
+        print(f"\n{'threads':>7}  {'mode':<10}{'rows/s':>9}{'p50 ms':>8}{'p99 ms':>8}{'mean batch':>11}")
+        for threads in args.threads:
+            for mode, predict in (('unbatched', unbatched), ('batched', batched)):
+                before = predictor.batcher.stats()
+                throughput, latencies = run_concurrent(predict, threads, args.requests)
+                after = predictor.batcher.stats()
+                batches = after['batches'] - before['batches']
+                mean_batch = (after['rows'] - before['rows']) / batches if mode == 'batched' and batches else 1
+                print(f"{threads:>7}  {mode:<10}{throughput:>9.0f}{statistics.median(latencies) * 1000:>8.2f}"
+                      f"{percentile(latencies, 0.99) * 1000:>8.2f}{mean_batch:>11.1f}")
+        predictor.close()
+
+
+if __name__ == '__main__':
+    main()
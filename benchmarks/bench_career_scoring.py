@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: matrix job scoring vs the original per-job Python loops.
+
+Usage: python benchmarks/bench_career_scoring.py [--jobs 15 1000 5000] [--skills 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from career_scoring import JOB_SKILLS_MAPPING, SkillMatrix, normalize_skill
+
+
+def legacy_calculate_job_eligibility(user_skills, job_skills_map):
+    """The original calculate_job_eligibility, kept as the baseline."""
+    eligibility_scores = {}
+    normalized_user_skills = [normalize_skill(skill) for skill in user_skills]
+    for job, required_skills in job_skills_map.items():
+        if not required_skills:
+            eligibility_scores[job] = 0.0
+            continue
+        matched_skills = [skill for skill in normalized_user_skills if skill in required_skills]
+        skill_match_percentage = (len(matched_skills) / len(required_skills)) * 100
+        bonus_points = min(20, len(normalized_user_skills) * 0.5)
+        final_score = min(100, skill_match_percentage + bonus_points)
+        eligibility_scores[job] = final_score
+    return eligibility_scores
+
+
+def legacy_analyze_skill_gaps(user_skills, job_skills_map):
+    """The original analyze_skill_gaps, kept as the baseline."""
+    normalized_user_skills = [normalize_skill(skill) for skill in user_skills]
+    skill_gaps = {}
+    for job, required_skills in job_skills_map.items():
+        missing_skills = [skill for skill in required_skills if skill not in normalized_user_skills]
+        skill_gaps[job] = {
+            'missing_skills': missing_skills,
+            'match_percentage': ((len(required_skills) - len(missing_skills)) / len(required_skills)) * 100 if required_skills else 0
+        }
+    return skill_gaps
+
+
+def synthetic_catalogue(job_count, skill_count, seed=7):
+    """Build a catalogue of ``job_count`` roles over ``skill_count`` skills.
+
+    The 15 real roles come first so small catalogues match production.
+    """
+    rng = random.Random(seed)
+    catalogue = dict(JOB_SKILLS_MAPPING)
+    real_skills = sorted({skill for skills in JOB_SKILLS_MAPPING.values() for skill in skills})
+    vocabulary = real_skills + [f'skill {n}' for n in range(max(0, skill_count - len(real_skills)))]
+    for n in range(len(catalogue), job_count):
+        catalogue[f'Role {n}'] = rng.sample(vocabulary, rng.randint(3, 12))
+    return dict(list(catalogue.items())[:job_count]), vocabulary
+
+
+def synthetic_users(vocabulary, count, seed=11):
+    rng = random.Random(seed)
+    return [rng.sample(vocabulary[:200], rng.randint(3, 15)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, nargs='+', default=[15, 1000, 5000])
+    parser.add_argument('--skills', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=50)
+    args = parser.parse_args()
+
+    # "matrix" rebuilds the full legacy dicts; "analysis" is what career_analysis
+    # needs: every score plus the gaps of the top three jobs
+    print(f"{'jobs':>7}{'compile (ms)':>14}{'legacy (ms/user)':>18}{'matrix (ms/user)':>18}"
+          f"{'analysis (ms/user)':>20}{'speedup':>10}")
+    for job_count in args.jobs:
+        catalogue, vocabulary = synthetic_catalogue(job_count, args.skills)
+        users = synthetic_users(vocabulary, args.users)
+
+        started = time.perf_counter()
+        matrix = SkillMatrix(catalogue)
+        compile_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        for skills in users:
+            legacy_calculate_job_eligibility(skills, catalogue)
+            legacy_analyze_skill_gaps(skills, catalogue)
+        legacy = (time.perf_counter() - started) / len(users)
+
+        started = time.perf_counter()
+        for skills in users:
+            scores = matrix.score(skills)
+            scores.eligibility_dict()
+            scores.gaps_dict()
+        vectorized = (time.perf_counter() - started) / len(users)
+
+        started = time.perf_counter()
+        for skills in users:
+            scores = matrix.score(skills)
+            for job, score in scores.ranked()[:3]:
+                scores.missing_skills(job)
+        analysis = (time.perf_counter() - started) / len(users)
+
+        print(f"{job_count:>7}{compile_ms:>14.1f}{legacy * 1000:>18.3f}{vectorized * 1000:>18.3f}"
+              f"{analysis * 1000:>20.3f}{legacy / analysis:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
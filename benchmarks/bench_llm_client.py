@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: AI guidance throughput under concurrency against a stub endpoint.
+
+Compares the original pattern (a new synchronous client per call, one call
+per request thread) with the shared async client, for requests that all
+ask about different careers and for requests that all ask about the same
+one (coalesced into a single upstream call).
+
+Usage: python benchmarks/bench_llm_client.py [--requests 200] [--concurrency 8 32] [--delay 0.05]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from azure.ai.inference import ChatCompletionsClient
+from azure.ai.inference.models import UserMessage
+from azure.core.credentials import AzureKeyCredential
+
+from llm_client import AsyncLLMClient
+from stub_inference_server import StubInferenceServer
+
+
+def legacy_call(url, career):
+    # What get_ai_client() callers did: build a client for every request
+    client = ChatCompletionsClient(endpoint=url, credential=AzureKeyCredential('token'))
+    try:
+        response = client.complete(messages=[UserMessage(content=career)], model='stub-model')
+        return response.choices[0].message.content
+    finally:
+        client.close()
+
+
+def run_legacy(url, careers, concurrency):
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda career: legacy_call(url, career), careers))
+
+
+def run_async(url, careers, concurrency):
+    async def main():
+        client = AsyncLLMClient(url, 'stub-model', 'token', max_concurrency=concurrency)
+        try:
+            await asyncio.gather(*[client.complete([UserMessage(content=career)], key=career)
+                                   for career in careers])
+        finally:
+            await client.close()
+    asyncio.run(main())
+
+
+def measure(runner, delay, careers, concurrency):
+    with StubInferenceServer(delay=delay) as server:
+        started = time.perf_counter()
+        runner(server.url, careers, concurrency)
+        elapsed = time.perf_counter() - started
+    return len(careers) / elapsed, server.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[8, 32])
+    parser.add_argument('--delay', type=float, default=0.05, help='stub latency per call in seconds')
+    args = parser.parse_args()
+
+    distinct = [f'Career {index}' for index in range(args.requests)]
+    same = ['Data Scientist'] * args.requests
+
+    print(f"{'workload':<22}{'concurrency':>12}{'req/s':>10}{'upstream calls':>16}")
+    for concurrency in args.concurrency:
+        for name, runner, careers in [
+            ('original, distinct', run_legacy, distinct),
+            ('async, distinct', run_async, distinct),
+            ('original, same key', run_legacy, same),
+            ('async, same key', run_async, same),
+        ]:
+            throughput, calls = measure(runner, args.delay, careers, concurrency)
+            print(f"{name:<22}{concurrency:>12}{throughput:>10.1f}{calls:>16}")
+
+
+if __name__ == '__main__':
+    main()
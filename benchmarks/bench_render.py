@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark: render time of the career analysis and guidance pages.
+
+Renders each page inside a request context, with the ``{% cache %}``
+fragments off (a fragment cache of size 0) and on. Also reports:
+
+- compiling every template from source vs loading it from the bytecode cache,
+- the escapejs filter against the baseline chained replaces and a single
+  precompiled ``re.sub``, on short labels and on a long description.
+
+Usage: python benchmarks/bench_render.py [--renders 2000]
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jinja2 import Environment, FileSystemBytecodeCache
+from markupsafe import Markup
+
+import app as app_module
+from career_scoring import current_skill_matrix
+from openapi import CAREER_GUIDANCE, GUIDANCE_VERSION, generate_career_guidance
+from template_cache import FragmentCacheExtension, precompile_templates
+
+SKILLS = {
+    'technical_skills': ['Python', 'SQL', 'Machine Learning', 'JavaScript', 'React', 'Docker', 'AWS', 'Git'],
+    'soft_skills': ['Communication', 'Teamwork'],
+}
+
+ESCAPEJS_SHORT = ['High', 'Very High', 'Medium', 'Data Scientist', 'Say "hi"\n</script>']
+ESCAPEJS_LONG = ['\n'.join(f"{career}: {entry['overview']} It's \"{career}\"</p>" for career, entry in CAREER_GUIDANCE.items()) * 8]
+
+
+def legacy_escapejs(s):
+    if s is None:
+        return ''
+    s = str(s)
+    s = s.replace('\\', '\\\\')
+    s = s.replace('\"', '\\"')
+    s = s.replace("\'", "\\'")
+    s = s.replace('\n', '\\n')
+    s = s.replace('\r', '\\r')
+    s = s.replace('\t', '\\t')
+    s = s.replace('</', r'<\/')
+    return Markup(s)
+
+
+ESCAPEJS_RE = re.compile(r'[\\"\'\n\r\t]|</')
+ESCAPEJS_RE_MAP = {'\\': '\\\\', '"': '\\"', "'": "\\'", '\n': '\\n', '\r': '\\r', '\t': '\\t', '</': '<\\/'}
+
+
+def regex_escapejs(s):
+    if s is None:
+        return ''
+    return Markup(ESCAPEJS_RE.sub(lambda m: ESCAPEJS_RE_MAP[m.group()], str(s)))
+
+
+def page_renders():
+    """``(page, render(index))`` pairs; each call renders the page once, as its view does."""
+    matrix = current_skill_matrix()
+    computed = app_module.compute_career_analysis(matrix, SKILLS['technical_skills'] + SKILLS['soft_skills'])
+    results = dict(computed, user_skills=SKILLS)
+    guidances = [generate_career_guidance(career, 85, 'High', SKILLS) for career in CAREER_GUIDANCE]
+
+    def analysis(index):
+        return app_module.render_template('career_analysis.html', results=results, catalogue_version=matrix.version)
+
+    def guidance(index):
+        return app_module.render_template('career_guidance.html', guidance=guidances[index % len(guidances)],
+                                          sections_version=GUIDANCE_VERSION)
+
+    def guidance_shell(index):
+        return app_module.render_template('career_guidance.html', stream_url='/career-guidance/x/stream',
+                                          guidance={'title': 'Data Scientist', 'match': 85, 'growth': 'High'},
+                                          sections_version=GUIDANCE_VERSION)
+
+    return [('career_analysis', analysis), (f'career_guidance ({len(guidances)} careers)', guidance),
+            ('career_guidance (AI shell)', guidance_shell)]
+
+
+def time_render(render, renders, max_entries):
+    cache = app_module.app.jinja_env.fragment_cache
+    cache.max_entries, saved = max_entries, cache.max_entries
+    try:
+        render(0)
+        started = time.perf_counter()
+        for index in range(renders):
+            render(index)
+        return (time.perf_counter() - started) / renders
+    finally:
+        cache.max_entries = saved
+
+
+def fresh_environment(bytecode_cache=None):
+    env = Environment(loader=app_module.app.jinja_env.loader, extensions=[FragmentCacheExtension],
+                      bytecode_cache=bytecode_cache)
+    env.filters.update(app_module.app.jinja_env.filters)
+    return env
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--renders', type=int, default=2000)
+    args = parser.parse_args()
+
+    with app_module.app.test_request_context('/'):
+        app_module.session['user_email'] = 'bench@example.com'
+        print(f"{'page':<32}{'uncached us':>12}{'cached us':>11}{'speedup':>9}")
+        for page, render in page_renders():
+            uncached = time_render(render, args.renders, max_entries=0)
+            cached = time_render(render, args.renders, max_entries=2048)
+            print(f"{page:<32}{uncached * 1e6:>12.0f}{cached * 1e6:>11.0f}{uncached / cached:>8.1f}x")
+    print(f"fragment cache: {app_module.app.jinja_env.fragment_cache.stats()}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        started = time.perf_counter()
+        count = precompile_templates(fresh_environment(FileSystemBytecodeCache(tmp)))
+        cold = time.perf_counter() - started
+        started = time.perf_counter()
+        precompile_templates(fresh_environment(FileSystemBytecodeCache(tmp)))
+        warm = time.perf_counter() - started
+    print(f"\nload {count} templates: compile {cold * 1000:.1f} ms, from bytecode cache {warm * 1000:.1f} ms")
+
+    print(f"\n{'escapejs us/value':<20}{'short':>8}{'long':>8}")
+    for label, escape in (('baseline', legacy_escapejs), ('filter', app_module.escapejs_filter),
+                          ('re.sub', regex_escapejs)):
+        row = f"{label:<20}"
+        for values, number in ((ESCAPEJS_SHORT, 20000), (ESCAPEJS_LONG, 2000)):
+            assert [escape(value) for value in values] == [legacy_escapejs(value) for value in values]
+            seconds = timeit.timeit(lambda: [escape(value) for value in values], number=number)
+            row += f"{seconds / number / len(values) * 1e6:>8.2f}"
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
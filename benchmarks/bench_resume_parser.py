@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled parse_resume_info vs the original.
+
+Usage: python benchmarks/bench_resume_parser.py [--repeat N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from resume_parser import parse_resume_info
+from resume_parser_reference import legacy_parse_resume_info
+from sample_resumes import no_education_text, resume_text
+
+PAGE_COUNTS = [1, 2, 5, 10, 20, 50]
+
+
+def time_parser(parser, text, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        parser(text)
+    return (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'resume':<22}{'legacy (us)':>14}{'compiled (us)':>16}{'speedup':>10}")
+    for label, make_text in (('full', resume_text), ('no education', no_education_text)):
+        for pages in PAGE_COUNTS:
+            text = make_text(pages)
+            assert parse_resume_info(text) == legacy_parse_resume_info(text)
+            legacy = time_parser(legacy_parse_resume_info, text, args.repeat)
+            compiled = time_parser(parse_resume_info, text, args.repeat)
+            name = f"{label}, {pages} page{'s' if pages > 1 else ''}"
+            print(f"{name:<22}{legacy * 1e6:>14.1f}{compiled * 1e6:>16.1f}{legacy / compiled:>9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Benchmark: resume store disk savings and retention sweep cost.
+
+Dedup: a cohort of users uploads resumes in mixed formats, most of them
+more than once (fixing a typo, retrying the wizard), and some sharing a
+file with a classmate. It compares the old layout, one file per upload in
+``uploads/``, with the content-addressed store with and without
+compression.
+
+Sweep: ``--files`` uploads (100k by default) are stored both ways. A
+sweep that has to stat every file in ``uploads/`` is compared with
+``ResumeStore.sweep``, first with nothing to expire and then with 1%
+expired. The last table shows upload latency while a large sweep runs
+in the background.
+
+Usage: python benchmarks/bench_resume_store.py [--users 300] [--files 100000]
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_wizard_flow import resume_file
+from resume_store import ResumeStore
+
+FORMATS = ['pdf', 'pdf', 'docx', 'txt', 'png']
+
+
+def disk_usage(path):
+    """Files under ``path``, their total size and the bytes they occupy on disk."""
+    files = size = blocks = 0
+    for root, dirs, names in os.walk(path):
+        for name in names:
+            stat = os.stat(os.path.join(root, name))
+            files += 1
+            size += stat.st_size
+            blocks += stat.st_blocks
+    return files, size, blocks * 512
+
+
+def cohort_uploads(users, seed=3):
+    """``(user, filename, content, format)`` for each upload a cohort makes."""
+    rng = random.Random(seed)
+    uploads = []
+    shared = {}
+    for user in range(users):
+        resume_format = rng.choice(FORMATS)
+        if rng.random() < 0.1 and resume_format in shared:
+            content = shared[resume_format]  # A classmate's file, passed around
+        else:
+            content = resume_file(resume_format, f'cohort-{user}')[1]
+            shared[resume_format] = content
+        for attempt in range(rng.choice([1, 1, 2, 3, 4])):
+            uploads.append((f'user{user}@example.com', f'resume.{resume_format}', content, resume_format))
+    return uploads
+
+
+def measure_dedup(uploads, tmp):
+    legacy = os.path.join(tmp, 'legacy-uploads')
+    os.makedirs(legacy)
+    for index, (user, filename, content, resume_format) in enumerate(uploads):
+        # Unique names, so the old layout is not flattered by users overwriting each other
+        with open(os.path.join(legacy, f'{index}-{filename}'), 'wb') as f:
+            f.write(content)
+    rows = [('uploads/ (one file each)',) + disk_usage(legacy) + (None,)]
+
+    for label, compress in (('store', False), ('store + zlib', True)):
+        store = ResumeStore(os.path.join(tmp, label.replace(' ', '')), compress=compress)
+        started = time.perf_counter()
+        for user, filename, content, resume_format in uploads:
+            store.put(user, content, filename=filename, file_format=resume_format)
+        per_put = (time.perf_counter() - started) / len(uploads)
+        rows.append((label,) + disk_usage(store.blob_dir) + (per_put,))
+    return rows
+
+
+def populate_legacy(path, files, expired):
+    os.makedirs(path)
+    old = time.time() - 90 * 24 * 3600
+    for index in range(files):
+        name = os.path.join(path, f'resume-{index}.pdf')
+        with open(name, 'wb') as f:
+            f.write(b'%%PDF-1.4 resume %d\n' % index)
+        if index < expired:
+            os.utime(name, (old, old))
+
+
+def populate_store(store, files, expired, batch=5000):
+    """Add ``files`` single-upload blobs directly, the first ``expired`` of them 90 days old."""
+    old = time.time() - 90 * 24 * 3600
+    conn = store._connection()
+    for start in range(0, files, batch):
+        blobs, uploads = [], []
+        for index in range(start, min(start + batch, files)):
+            data = b'%%PDF-1.4 resume %d\n' % index
+            sha256 = hashlib.sha256(data).hexdigest()
+            path = store.blob_path(sha256)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(data)
+            blobs.append((sha256, len(data), len(data), 0))
+            uploads.append((f'user{index}', sha256, 'resume.pdf', 'pdf', old if index < expired else time.time()))
+        with store._transaction():
+            conn.executemany('INSERT INTO blobs VALUES (?, ?, ?, ?)', blobs)
+            conn.executemany('INSERT INTO uploads VALUES (?, ?, ?, ?, ?)', uploads)
+
+
+def scan_sweep(path, max_age):
+    """What retention costs without an index: stat every file, remove the old ones."""
+    cutoff = time.time() - max_age
+    removed = 0
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+    return removed
+
+
+def timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - started, result
+
+
+def put_latencies(store, count, prefix):
+    samples = []
+    for index in range(count):
+        data = f'{prefix} resume {index}\n'.encode() * 50
+        started = time.perf_counter()
+        store.put(f'{prefix}{index}', data, file_format='txt')
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=300)
+    parser.add_argument('--files', type=int, default=100000)
+    args = parser.parse_args()
+    max_age = 30 * 24 * 3600
+
+    with tempfile.TemporaryDirectory() as tmp:
+        uploads = cohort_uploads(args.users)
+        print(f"{len(uploads)} uploads from {args.users} users, "
+              f"{sum(len(content) for user, filename, content, fmt in uploads) / 1024 / 1024:.1f} MB uploaded\n")
+        print(f"{'layout':<26}{'files':>8}{'size MB':>9}{'disk MB':>9}{'saved':>8}{'ms/put':>8}")
+        rows = measure_dedup(uploads, tmp)
+        baseline = rows[0][3]
+        for label, files, size, disk, per_put in rows:
+            print(f"{label:<26}{files:>8}{size / 1024 / 1024:>9.2f}{disk / 1024 / 1024:>9.2f}"
+                  f"{1 - disk / baseline:>8.0%}{per_put * 1000 if per_put is not None else 0:>8.2f}")
+
+        expired = args.files // 100
+        legacy = os.path.join(tmp, 'sweep-uploads')
+        store = ResumeStore(os.path.join(tmp, 'sweep-store'), max_age=max_age, max_bytes=0)
+        started = time.perf_counter()
+        populate_legacy(legacy, args.files, expired)
+        populate_store(store, args.files, expired)
+        print(f"\n{args.files} stored files each way, {expired} expired "
+              f"(populated in {time.perf_counter() - started:.1f}s)\n")
+
+        print(f"{'sweep':<34}{'ms':>9}{'removed':>9}")
+        for label, func, sweep_args in (
+                ('scan uploads/, nothing expired', scan_sweep, (legacy, 365 * 24 * 3600)),
+                ('ResumeStore, nothing expired', store.sweep, (time.time() - 365 * 24 * 3600 + max_age,)),
+                ('scan uploads/, 1% expired', scan_sweep, (legacy, max_age)),
+                ('ResumeStore, 1% expired', store.sweep, ())):
+            seconds, result = timed(func, *sweep_args)
+            removed = result if isinstance(result, int) else result['expired']
+            print(f"{label:<34}{seconds * 1000:>9.1f}{removed:>9}")
+
+        # Age a tenth of the store so the background sweep has real work to do
+        conn = store._connection()
+        with store._transaction():
+            conn.execute('UPDATE uploads SET uploaded_at = 0 WHERE rowid % 10 = 0')
+        idle = put_latencies(store, 500, 'idle')
+        sweep = threading.Thread(target=store.sweep)
+        sweep.start()
+        busy = put_latencies(store, 500, 'busy')
+        sweep.join()
+        print(f"\n{'uploads':<22}{'p50 ms':>8}{'p99 ms':>8}{'max ms':>8}")
+        for label, samples in (('idle', idle), ('during sweep', busy)):
+            print(f"{label:<22}{samples[len(samples) // 2] * 1000:>8.2f}{samples[len(samples) * 99 // 100] * 1000:>8.2f}"
+                  f"{samples[-1] * 1000:>8.2f}")
+        print(f"background sweep: {store.last_sweep['expired']} uploads, {store.last_sweep['seconds'] * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cookie size and per-request session cost after the full wizard.
+
+Fills a session the way the wizard does (resume fields, personal info,
+skill lists, test results, analysis id), then times a typical page that
+only checks the login, and a page that rewrites one section. Compares
+Flask's signed cookie session with the memory and SQLite server-side
+stores.
+
+Usage: python benchmarks/bench_session.py [--skills 40 400] [--requests 2000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask, session
+from flask.sessions import SecureCookieSessionInterface
+
+from session_store import ServerSideSessionInterface, MemorySessionBackend, SQLiteSessionBackend
+
+
+def wizard_session(skill_count):
+    return {
+        'user_email': 'jane.doe@example.com',
+        'resume_filename': 'Jane_Doe_Resume.pdf',
+        'extracted_info': {'name': 'Jane Doe', 'email': 'jane.doe@example.com', 'phone': '+91 987 654 3210',
+                           'linkedin': 'linkedin.com/in/janedoe', 'education': 'Bachelor of Technology',
+                           'degree': 'Computer Science', 'skills': ['python', 'sql', 'machine learning']},
+        'personal_info': {'full_name': 'Jane Doe', 'email': 'jane.doe@example.com', 'phone': '+91 987 654 3210',
+                          'location': 'Bengaluru', 'linkedin': 'linkedin.com/in/janedoe',
+                          'education': 'Bachelor of Technology', 'degree': 'Computer Science'},
+        'skills': {'technical_skills': [f'Technical Skill {index}' for index in range(skill_count)],
+                   'soft_skills': [f'Soft Skill {index}' for index in range(skill_count // 4)],
+                   'experience_level': 'Intermediate', 'certifications': 'AWS Certified Cloud Practitioner'},
+        'test_results': {f'question_{index}': 'b' for index in range(20)},
+        'current_analysis_id': '0b9f1c9e-5d3c-4c55-9a53-6d8f2f1c7e10',
+    }
+
+
+def make_app(interface, skill_count):
+    app = Flask(__name__)
+    app.secret_key = 'benchmark'
+    app.session_interface = interface
+
+    @app.route('/fill')
+    def fill():
+        session.update(wizard_session(skill_count))
+        return 'ok'
+
+    @app.route('/read')
+    def read():
+        return 'ok' if 'user_email' in session else 'login'
+
+    @app.route('/write')
+    def write():
+        session['personal_info'] = dict(session['personal_info'], location='Mysuru')
+        return 'ok'
+
+    return app
+
+
+def time_requests(client, path, requests):
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.get(path)
+    return (time.perf_counter() - started) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--skills', type=int, nargs='+', default=[40, 400])
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'skills':>7}  {'store':<8}{'cookie bytes':>13}{'read page (us)':>16}{'write page (us)':>17}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for skill_count in args.skills:
+            stores = [
+                ('cookie', SecureCookieSessionInterface()),
+                ('memory', ServerSideSessionInterface(MemorySessionBackend())),
+                ('sqlite', ServerSideSessionInterface(
+                    SQLiteSessionBackend(os.path.join(tmp, f'sessions-{skill_count}.db')))),
+            ]
+            for name, interface in stores:
+                client = make_app(interface, skill_count).test_client()
+                client.get('/fill')
+                cookie = client.get_cookie('session')
+                cookie_bytes = len(cookie.value) if cookie else 0
+                read = time_requests(client, '/read', args.requests)
+                write = time_requests(client, '/write', args.requests)
+                print(f"{skill_count:>7}  {name:<8}{cookie_bytes:>13}{read:>16.1f}{write:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold import time of the app and the guidance module.
+
+Imports each module in a fresh interpreter under ``python -X importtime``
+and reports the median cumulative import time, the slowest modules it
+pulled in, and whether any extractor or AI-client backend was loaded
+eagerly. Those backends are meant to be imported on first use only.
+
+``--check`` exits with status 1 when a module is over its budget in
+``STARTUP_BUDGET_MS`` or loads a backend eagerly; the tests run the same
+check.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 10] [--check]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time allowed per module, in milliseconds. Flask and
+# numpy alone take about 250 ms of the app's budget.
+STARTUP_BUDGET_MS = {
+    'app': 450,
+    'openapi': 250,
+}
+
+# Backends that must not be imported until a resume or AI request needs them
+LAZY_MODULES = [
+    'pdfplumber', 'pypdfium2', 'docx', 'PIL', 'pytesseract', 'resume_ocr',
+    'azure', 'aiohttp', 'asyncio', 'llm_client', 'concurrent.futures.process', 'dotenv',
+]
+
+
+def parse_importtime(stderr, module):
+    """Return ``{name: cumulative microseconds}`` for ``module`` and everything it imported.
+
+    ``-X importtime`` lists each module after the modules it imported,
+    indented one level deeper, so the subtree is the run of deeper lines
+    just before the module's own line.
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = len(name) - len(name.lstrip())
+        rows.append((depth, name.strip(), int(cumulative)))
+
+    for index, (depth, name, cumulative) in enumerate(rows):
+        if name == module and depth == 1:
+            times = {name: cumulative}
+            for child_depth, child, child_cumulative in reversed(rows[:index]):
+                if child_depth <= depth:
+                    break
+                times.setdefault(child, child_cumulative)
+            return times
+    raise ValueError(f"{module} not found in -X importtime output")
+
+
+def import_once(module):
+    """Import ``module`` in a fresh interpreter; return (import times, lazy modules it loaded)."""
+    code = (f'import sys, json; import {module}; '
+            f'print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return parse_importtime(result.stderr, module), loaded
+
+
+def measure(module, runs=5):
+    """Median cumulative import time of ``module`` in ms, its slowest imports and eagerly loaded backends."""
+    samples = [import_once(module) for _ in range(runs)]
+    total_ms = statistics.median(times[module] for times, loaded in samples) / 1000
+    names = set.intersection(*(set(times) for times, loaded in samples)) - {module}
+    slowest = sorted(((statistics.median(times[name] for times, loaded in samples) / 1000, name)
+                      for name in names), reverse=True)
+    return {'module': module, 'import_ms': total_ms, 'slowest': slowest, 'eager': samples[0][1]}
+
+
+def check(result):
+    """Return the problems with a ``measure`` result: over budget or eager backends."""
+    problems = []
+    budget = STARTUP_BUDGET_MS.get(result['module'])
+    if budget is not None and result['import_ms'] > budget:
+        problems.append(f"import {result['module']} took {result['import_ms']:.0f} ms (budget {budget} ms)")
+    if result['eager']:
+        problems.append(f"import {result['module']} loaded {', '.join(result['eager'])} eagerly")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='slowest imports to list per module')
+    parser.add_argument('--check', action='store_true', help='fail if a module is over budget')
+    parser.add_argument('modules', nargs='*', default=list(STARTUP_BUDGET_MS))
+    args = parser.parse_args()
+
+    problems = []
+    for module in args.modules:
+        result = measure(module, args.runs)
+        budget = STARTUP_BUDGET_MS.get(module)
+        print(f"import {module}: {result['import_ms']:.1f} ms"
+              + (f" (budget {budget} ms)" if budget is not None else ''))
+        for ms, name in result['slowest'][:args.top]:
+            print(f"  {ms:8.1f} ms  {name}")
+        print(f"  eagerly loaded backends: {', '.join(result['eager']) or 'none'}\n")
+        problems.extend(check(result))
+
+    if args.check and problems:
+        print('\n'.join(problems))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: picking the top careers for one user at 15, 1,000 and 50,000 roles.
+
+Compares the original path (score every job with Python loops, then sort
+all of them), the dense matrix path (score every job with NumPy, then sort)
+and the inverted-index path (score only jobs sharing a skill, heap top-k).
+Also times the batch scorer's per-row top-k pick against a full stable sort.
+
+Usage: python benchmarks/bench_top_careers.py [--jobs 15 1000 50000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from career_scoring import SkillMatrix, _top_k_indexes
+from bench_career_scoring import (legacy_calculate_job_eligibility, legacy_analyze_skill_gaps,
+                                  synthetic_catalogue, synthetic_users)
+
+
+def legacy_path(catalogue, matrix, skills):
+    eligibility = legacy_calculate_job_eligibility(skills, catalogue)
+    sorted_jobs = sorted(eligibility.items(), key=lambda x: x[1], reverse=True)
+    gaps = legacy_analyze_skill_gaps(skills, catalogue)
+    return [(job, gaps[job]['missing_skills']) for job, score in sorted_jobs[:3]], sorted_jobs[:5]
+
+
+def dense_path(catalogue, matrix, skills):
+    scores = matrix.score(skills)
+    sorted_jobs = scores.ranked()
+    return [(job, scores.missing_skills(job)) for job, score in sorted_jobs[:3]], sorted_jobs[:5]
+
+
+def inverted_index_path(catalogue, matrix, skills):
+    scores = matrix.top_jobs(skills)
+    sorted_jobs = scores.top(5)
+    return [(job, scores.missing_skills(job)) for job, score in sorted_jobs[:3]], sorted_jobs
+
+
+def time_path(path, catalogue, matrix, users):
+    started = time.perf_counter()
+    for skills in users:
+        path(catalogue, matrix, skills)
+    return (time.perf_counter() - started) / len(users) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--jobs', type=int, nargs='+', default=[15, 1000, 50000])
+    parser.add_argument('--skills', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'jobs':>7}{'original (ms)':>15}{'dense (ms)':>12}{'inverted (ms)':>15}{'vs original':>13}")
+    for job_count in args.jobs:
+        catalogue, vocabulary = synthetic_catalogue(job_count, args.skills)
+        matrix = SkillMatrix(catalogue)
+        users = synthetic_users(vocabulary, args.users)
+        for skills in users:
+            assert inverted_index_path(catalogue, matrix, skills) == legacy_path(catalogue, matrix, skills)
+
+        original = time_path(legacy_path, catalogue, matrix, users)
+        dense = time_path(dense_path, catalogue, matrix, users)
+        inverted = time_path(inverted_index_path, catalogue, matrix, users)
+        print(f"{job_count:>7}{original:>15.3f}{dense:>12.3f}{inverted:>15.3f}{original / inverted:>12.1f}x")
+
+    print(f"\n{'jobs':>7}{'batch top-5: sort (ms)':>24}{'top-k (ms)':>12}")
+    rng = np.random.default_rng(5)
+    for job_count in args.jobs:
+        # One batch chunk's worth of eligibility scores
+        values = rng.integers(0, 1000, (max(1, 200000 // job_count), job_count)) / 10
+        started = time.perf_counter()
+        full = np.argsort(-values, axis=1, kind='stable')[:, :5]
+        sort_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        top = _top_k_indexes(values, 5)
+        top_ms = (time.perf_counter() - started) * 1000
+        assert (full == top).all()
+        print(f"{job_count:>7}{sort_ms:>24.2f}{top_ms:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
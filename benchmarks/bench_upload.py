@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark: system calls and bytes written per resume upload.
+
+Posts resumes of each format to the app's upload route through the test
+client, waits for the background extraction to finish and reports, per
+upload, the read/write system calls and bytes written by the web process
+and its extraction workers (from ``/proc/<pid>/io``), the request
+latency, and what was left behind in the uploads folder. Every upload is
+unique so none are answered from the resume cache.
+
+``bad-pdf`` is a ``.pdf`` that is not a PDF, ``large-pdf`` a resume big
+enough to spill out of the in-memory upload buffer.
+
+Usage: python benchmarks/bench_upload.py [--uploads 20] [--formats pdf docx txt png bad-pdf large-pdf]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_wizard_flow import local_transport_factory, resume_file, wait_for_resume_jobs
+from sample_resumes import make_pdf, resume_pages
+
+FORMATS = ['pdf', 'docx', 'txt', 'png', 'bad-pdf', 'large-pdf']
+
+COUNTERS = ('syscr', 'syscw', 'wchar', 'write_bytes')
+
+
+def upload_file(upload_format, index):
+    """Return ``(filename, content)`` of upload ``index`` in ``upload_format``."""
+    if upload_format == 'bad-pdf':
+        return f'broken-{index}.pdf', f'not a pdf {index}\n'.encode() * 200
+    if upload_format == 'large-pdf':
+        pages = resume_pages(page_count=6, lines_per_page=40)
+        pages[0][1:1] = [f'Upload benchmark {index}']
+        # Incompressible filler so the file is well past the in-memory buffer
+        return f'large-{index}.pdf', make_pdf(pages) + b'%' + os.urandom(2 * 1024 * 1024) + b'\n'
+    return resume_file(upload_format, f'upload-{index}')
+
+
+def process_ids():
+    """This process and its children (the extraction workers)."""
+    pids = [os.getpid()]
+    for children in glob.glob(f'/proc/{os.getpid()}/task/*/children'):
+        with open(children) as f:
+            pids.extend(int(pid) for pid in f.read().split())
+    return pids
+
+
+def io_counters():
+    """Sum of the ``/proc/<pid>/io`` counters over ``process_ids()``."""
+    totals = dict.fromkeys(COUNTERS, 0)
+    for pid in process_ids():
+        try:
+            with open(f'/proc/{pid}/io') as f:
+                for line in f:
+                    name, value = line.split(':')
+                    if name in totals:
+                        totals[name] += int(value)
+        except OSError:
+            pass  # A worker that exited meanwhile
+    return totals
+
+
+def folder_usage(path):
+    files = [os.path.join(root, name) for root, dirs, names in os.walk(path) for name in names]
+    return len(files), sum(os.path.getsize(name) for name in files)
+
+
+def measure(client, upload_format, uploads, upload_folder):
+    """Upload ``uploads`` files; return per-upload counters, latency and leftover files."""
+    before = io_counters()
+    files_before = folder_usage(upload_folder)
+    latencies = []
+    for index in range(uploads):
+        filename, content = upload_file(upload_format, f'{upload_format}-{index}-{time.time_ns()}')
+        # Workers' counters only cover this upload once its extraction has finished
+        started = time.perf_counter()
+        client.post('/upload-resume', data={'resume': (BytesIO(content), filename)},
+                    content_type='multipart/form-data')
+        latencies.append(time.perf_counter() - started)
+        wait_for_resume_jobs()
+    after = io_counters()
+    files_after = folder_usage(upload_folder)
+    result = {name: (after[name] - before[name]) / uploads for name in COUNTERS}
+    result['ms'] = sorted(latencies)[len(latencies) // 2] * 1000
+    result['files'] = (files_after[0] - files_before[0]) / uploads
+    result['file_bytes'] = (files_after[1] - files_before[1]) / uploads
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--uploads', type=int, default=20)
+    parser.add_argument('--formats', nargs='+', default=FORMATS)
+    args = parser.parse_args()
+
+    if not os.path.exists('/proc/self/io'):
+        sys.exit('Needs /proc/<pid>/io (Linux)')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = local_transport_factory(tmp)().client
+        import app as app_module
+        upload_folder = app_module.app.config['UPLOAD_FOLDER']
+        client.post('/login', data={'email': 'bench@example.com', 'password': 'x'})
+        measure(client, 'txt', 2, upload_folder)  # Start the worker pool
+
+        print(f"{'format':<10}{'syscr':>8}{'syscw':>8}{'wchar KB':>10}{'disk KB':>9}"
+              f"{'p50 ms':>8}{'files left':>11}{'KB left':>9}")
+        for upload_format in args.formats:
+            result = measure(client, upload_format, args.uploads, upload_folder)
+            print(f"{upload_format:<10}{result['syscr']:>8.0f}{result['syscw']:>8.0f}"
+                  f"{result['wchar'] / 1024:>10.1f}{result['write_bytes'] / 1024:>9.1f}{result['ms']:>8.1f}"
+                  f"{result['files']:>11.1f}{result['file_bytes'] / 1024:>9.1f}")
+        app_module.resume_jobs.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Load test: latency of every route in the full wizard flow.
+
+Each simulated user logs in, uploads a synthetic resume, fills in the
+personal info, skills, exam choice and aptitude test pages, opens the
+career analysis and then the guidance page of the top career, the same
+requests a browser makes. Users run concurrently, either in-process
+through Flask's test client or against a running server (``--url``).
+
+Reports p50/p95/p99 latency and throughput per route and saves them as
+JSON, so a run on one commit can be compared with a run on another:
+
+    python benchmarks/bench_wizard_flow.py --users 200 --concurrency 16 --output before.json
+    git checkout my-branch
+    python benchmarks/bench_wizard_flow.py --users 200 --concurrency 16 --compare before.json
+
+Usage: python benchmarks/bench_wizard_flow.py [--users 50] [--concurrency 8]
+       [--formats pdf docx txt png] [--url http://localhost:10000] [--output FILE]
+       [--compare FILE] [--max-regression PCT]
+"""
+
+import argparse
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sample_resumes import resume_pages, make_pdf, make_docx, make_image
+
+FORMATS = ['pdf', 'docx', 'txt', 'png']
+
+PERCENTILES = [50, 95, 99]
+
+SKILL_PROFILES = [
+    (['Python', 'SQL', 'Machine Learning', 'Statistics'], ['Communication']),
+    (['JavaScript', 'React', 'Node.js', 'HTML', 'CSS'], ['Teamwork']),
+    (['AWS', 'Docker', 'Kubernetes', 'Linux'], ['Problem Solving']),
+    (['Network Security', 'Linux', 'Python'], ['Attention to Detail']),
+]
+
+GUIDANCE_BUTTON = re.compile(r'data-career-id="([^"]+)"\s+data-match="([^"]+)"\s+data-growth="([^"]+)"')
+
+
+def resume_file(resume_format, user):
+    """Return ``(filename, content)`` of a resume unique to ``user``, so uploads miss the resume cache."""
+    pages = resume_pages()
+    if user is not None:
+        pages[0][1:1] = [f'Load test user {user}']
+    if resume_format == 'pdf':
+        content = make_pdf(pages)
+    elif resume_format == 'docx':
+        content = make_docx(pages)
+    elif resume_format == 'txt':
+        content = '\n'.join(pages[0]).encode('utf-8')
+    else:
+        content = make_image(pages[0][:20], image_format='JPEG' if resume_format in ('jpg', 'jpeg') else 'PNG')
+    return f'loadtest-{user if user is not None else "shared"}.{resume_format}', content
+
+
+class FlaskClientTransport:
+    """Sends requests to the app in-process through Flask's test client."""
+
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None, files=None):
+        if files:
+            data = dict(data or {})
+            for name, (filename, content) in files.items():
+                data[name] = (io.BytesIO(content), filename)
+        response = self.client.open(path, method=method, data=data)
+        body = response.get_data()
+        return response.status_code, response.headers.get('Location', ''), body
+
+
+class HTTPTransport:
+    """Sends requests to a running server, keeping cookies like a browser."""
+
+    def __init__(self, base_url, timeout=60):
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def request(self, method, path, data=None, files=None):
+        response = self.session.request(method, self.base_url + path, data=data, files=files,
+                                        allow_redirects=False, timeout=self.timeout)
+        return response.status_code, response.headers.get('Location', ''), response.content
+
+
+def run_wizard(transport, user, resume_format, shared_resumes):
+    """Walk one user through the wizard; return ``[(route, seconds, ok), ...]``."""
+    samples = []
+
+    def step(route, method, path, data=None, files=None, redirect_to=None):
+        started = time.perf_counter()
+        try:
+            status, location, body = transport.request(method, path, data=data, files=files)
+        except Exception:
+            samples.append((route, time.perf_counter() - started, False))
+            return b''
+        elapsed = time.perf_counter() - started
+        if redirect_to is None:
+            ok = status == 200
+        else:
+            ok = status in (302, 303) and location.split('?')[0].endswith(redirect_to)
+        samples.append((route, elapsed, ok))
+        return body
+
+    technical_skills, soft_skills = SKILL_PROFILES[user % len(SKILL_PROFILES)]
+    filename, content = resume_file(resume_format, None if shared_resumes else user)
+
+    step('GET /login', 'GET', '/login')
+    step('POST /login', 'POST', '/login',
+         {'email': f'user{user}@example.com', 'password': 'load-test'}, redirect_to='/upload-resume')
+    step('GET /upload-resume', 'GET', '/upload-resume')
+    step(f'POST /upload-resume ({resume_format})', 'POST', '/upload-resume',
+         files={'resume': (filename, content)}, redirect_to='/personal-info')
+    step('GET /personal-info', 'GET', '/personal-info')
+    step('POST /personal-info', 'POST', '/personal-info', {
+        'name': f'Load Test User {user}', 'age': '22', 'college': 'ABC Institute of Technology',
+        'country': 'India', 'degree': 'B.Tech', 'year_of_study': '4', 'phone': '+91 987 654 3210',
+        'linkedin': f'https://linkedin.com/in/load-test-{user}',
+    }, redirect_to='/skills-assessment')
+    step('GET /skills-assessment', 'GET', '/skills-assessment')
+    step('POST /skills-assessment', 'POST', '/skills-assessment', {
+        'technical_skills': technical_skills, 'soft_skills': soft_skills,
+        'experience_level': 'Intermediate', 'certifications': 'AWS Certified Cloud Practitioner',
+    }, redirect_to='/exam-choice')
+    step('GET /exam-choice', 'GET', '/exam-choice')
+    step('POST /exam-choice', 'POST', '/exam-choice', {'take_exam': 'yes'}, redirect_to='/aptitude-test')
+    step('GET /aptitude-test', 'GET', '/aptitude-test')
+    step('POST /aptitude-test', 'POST', '/aptitude-test',
+         {f'q{number}': 'ABCD'[(user + number) % 4] for number in range(1, 6)}, redirect_to='/career-analysis')
+    page = step('GET /career-analysis', 'GET', '/career-analysis').decode('utf-8', 'replace')
+
+    # Follow the first "Get AI Guidance" button the way career-guidance.js does
+    button = GUIDANCE_BUTTON.search(page)
+    if button is None:
+        samples.append(('GET /career-guidance/<title>', 0.0, False))
+    else:
+        career_id, match, growth = button.groups()
+        title = career_id.replace('-', ' ').replace(' ', '%20')
+        step('GET /career-guidance/<title>', 'GET', f'/career-guidance/{title}?match={match}&growth={growth}')
+    return samples
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(flows, wall):
+    """Per-route latency percentiles in milliseconds and throughput in requests per second.
+
+    Routes are listed in the order the wizard visits them.
+    """
+    by_route = {}
+    order = {}
+    for flow in flows:
+        for index, (route, seconds, ok) in enumerate(flow):
+            by_route.setdefault(route, []).append((seconds, ok))
+            order[route] = min(order.get(route, index), index)
+    routes = {}
+    for route in sorted(by_route, key=lambda route: (order[route], route)):
+        values = by_route[route]
+        times = sorted(seconds * 1000 for seconds, ok in values)
+        routes[route] = {
+            'count': len(values),
+            'errors': sum(1 for seconds, ok in values if not ok),
+            **{f'p{pct}_ms': round(percentile(times, pct), 3) for pct in PERCENTILES},
+            'mean_ms': round(sum(times) / len(times), 3),
+            'max_ms': round(times[-1], 3),
+            'throughput_rps': round(len(values) / wall, 2) if wall else 0.0,
+        }
+    return routes
+
+
+def run_load(make_transport, users, concurrency, formats, shared_resumes=False, warmup=1):
+    """Run ``users`` wizard flows, ``concurrency`` at a time, and return the report."""
+    for user in range(warmup):
+        run_wizard(make_transport(), -1 - user, formats[user % len(formats)], shared_resumes)
+
+    flows = []
+    lock = threading.Lock()
+
+    def one_user(user):
+        started = time.perf_counter()
+        samples = run_wizard(make_transport(), user, formats[user % len(formats)], shared_resumes)
+        elapsed = time.perf_counter() - started
+        with lock:
+            flows.append((samples, elapsed))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one_user, range(users)))
+    wall = time.perf_counter() - started
+
+    flow_times = sorted(elapsed * 1000 for flow, elapsed in flows)
+    return {
+        'users': users,
+        'concurrency': concurrency,
+        'formats': list(formats),
+        'shared_resumes': shared_resumes,
+        'wall_seconds': round(wall, 3),
+        'flows': {
+            'count': len(flows),
+            'errors': sum(1 for flow, elapsed in flows if not all(ok for route, seconds, ok in flow)),
+            **{f'p{pct}_ms': round(percentile(flow_times, pct), 3) for pct in PERCENTILES},
+            'throughput_per_s': round(len(flows) / wall, 2) if wall else 0.0,
+        },
+        'routes': summarize([flow for flow, elapsed in flows], wall),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def local_transport_factory(tmp):
+    """Point the app's uploads, resume cache and resume store at ``tmp`` and return a test client factory."""
+    import app as app_module
+    from resume_cache import ResumeCache
+    from resume_store import ResumeStore
+
+    app_module.app.config['UPLOAD_FOLDER'] = os.path.join(tmp, 'uploads')
+    os.makedirs(app_module.app.config['UPLOAD_FOLDER'], exist_ok=True)
+    app_module.resume_cache = ResumeCache(os.path.join(tmp, 'resume_cache'))
+    app_module._resume_store = ResumeStore(os.path.join(tmp, 'resume_store'))
+    return lambda: FlaskClientTransport(app_module.app)
+
+
+def wait_for_resume_jobs(timeout=60):
+    """Let in-process background extractions finish before their files are removed."""
+    import app as app_module
+
+    deadline = time.monotonic() + timeout
+    while app_module.resume_jobs.pending_count() and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+
+def compare(report, baseline, max_regression=None):
+    """Print the change in latency per route; return the routes whose p95 regressed past ``max_regression`` %."""
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    print(f"{'route':<38}{'p50 ms':>18}{'p95 ms':>18}{'p99 ms':>18}")
+    regressed = []
+    for route, current in report['routes'].items():
+        old = baseline.get('routes', {}).get(route)
+        if old is None:
+            print(f"{route:<38}{'(new route)':>18}")
+            continue
+        cells = []
+        for pct in PERCENTILES:
+            key = f'p{pct}_ms'
+            change = (current[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+            cells.append(f"{old[key]:.1f}->{current[key]:.1f} {change:+.0f}%")
+            if pct == 95 and max_regression is not None and change > max_regression:
+                regressed.append(route)
+        print(f"{route:<38}" + ''.join(f"{cell:>18}" for cell in cells))
+    return regressed
+
+
+def print_report(report):
+    print(f"{report['users']} users, concurrency {report['concurrency']}, {report['wall_seconds']:.1f}s "
+          f"({report['flows']['throughput_per_s']:.1f} flows/s, flow p95 {report['flows']['p95_ms']:.0f} ms)")
+    print(f"{'route':<38}{'count':>6}{'errors':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/s':>9}")
+    for route, row in report['routes'].items():
+        print(f"{route:<38}{row['count']:>6}{row['errors']:>7}{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}"
+              f"{row['p99_ms']:>9.1f}{row['throughput_rps']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--users', type=int, default=50, help='wizard flows to run')
+    parser.add_argument('--concurrency', type=int, default=8, help='flows in flight at once')
+    parser.add_argument('--formats', nargs='+', default=FORMATS, help='resume formats to upload, round robin')
+    parser.add_argument('--shared-resumes', action='store_true',
+                        help='upload the same resume per format, so repeat uploads hit the resume cache')
+    parser.add_argument('--warmup', type=int, default=1, help='unrecorded flows run first')
+    parser.add_argument('--url', help='base URL of a running server; default runs the app in-process')
+    parser.add_argument('--output', help='write the report as JSON to this file')
+    parser.add_argument('--compare', help='JSON report of an earlier run to compare with')
+    parser.add_argument('--max-regression', type=float,
+                        help='exit with status 1 if any route p95 is this many percent slower than --compare')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.url:
+            make_transport = lambda: HTTPTransport(args.url)
+        else:
+            make_transport = local_transport_factory(tmp)
+        report = run_load(make_transport, args.users, args.concurrency, args.formats,
+                          shared_resumes=args.shared_resumes, warmup=args.warmup)
+        if not args.url:
+            wait_for_resume_jobs()
+
+    report = {
+        'commit': git_commit(),
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'target': args.url or 'test-client',
+        **report,
+    }
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressed = compare(report, baseline, args.max_regression)
+        if regressed:
+            print(f"\np95 regressed by more than {args.max_regression:g}%: {', '.join(regressed)}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the chat completions inference endpoint.
+
+Answers ``POST /chat/completions`` with a canned reply after an optional
+delay, and can fail the first few calls to exercise retries. Streaming
+requests get the reply as Server-Sent Events, ``chunk_size`` characters at
+a time with ``chunk_delay`` seconds between them. Used by the LLM client
+tests and benchmark.
+"""
+
+import json
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DEFAULT_REPLY = json.dumps({
+    'overview': 'Stub overview.',
+    'skills': ['Python', 'Statistics'],
+    'learning_path': ['Learn Python', 'Learn statistics'],
+    'resources': ['Kaggle'],
+})
+
+
+class StubInferenceServer:
+    """Threaded HTTP server; use as a context manager and point a client at ``url``."""
+
+    def __init__(self, reply=DEFAULT_REPLY, delay=0.0, fail_first=0, fail_status=503,
+                 chunk_size=16, chunk_delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.fail_first = fail_first
+        self.fail_status = fail_status
+        self.calls = 0
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-alive, like the real endpoint
+            disable_nagle_algorithm = True  # Headers and body go out as separate writes
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                with stub._lock:
+                    stub.calls += 1
+                    call = stub.calls
+                    stub.requests.append(body)
+                if stub.delay:
+                    time.sleep(stub.delay)
+                if call <= stub.fail_first:
+                    self._send(stub.fail_status, {'error': {'code': 'Unavailable', 'message': 'stub failure'}})
+                    return
+                if body.get('stream'):
+                    self._stream(call, body)
+                    return
+                self._send(200, {
+                    'id': f'stub-{call}',
+                    'created': int(time.time()),
+                    'model': body.get('model', 'stub'),
+                    'choices': [{'index': 0, 'finish_reason': 'stop',
+                                 'message': {'role': 'assistant', 'content': stub.reply}}],
+                    'usage': {'prompt_tokens': 1, 'completion_tokens': 1, 'total_tokens': 2},
+                })
+
+            def _stream(self, call, body):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Connection', 'close')
+                self.end_headers()
+                self.close_connection = True
+                for start in range(0, len(stub.reply), stub.chunk_size):
+                    if start and stub.chunk_delay:
+                        time.sleep(stub.chunk_delay)
+                    update = {
+                        'id': f'stub-{call}',
+                        'created': int(time.time()),
+                        'model': body.get('model', 'stub'),
+                        'choices': [{'index': 0, 'finish_reason': None,
+                                     'delta': {'role': 'assistant',
+                                               'content': stub.reply[start:start + stub.chunk_size]}}],
+                    }
+                    self.wfile.write(f"data: {json.dumps(update)}\n\n".encode('utf-8'))
+                    self.wfile.flush()
+                self.wfile.write(b"data: [DONE]\n\n")
+
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 256  # Bursts of concurrent connects
+
+            def handle_error(self, request, client_address):
+                pass  # Clients that timed out hang up mid-reply; that is expected
+
+        self._server = Server(('127.0.0.1', 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
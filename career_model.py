@@ -0,0 +1,415 @@
+"""
+Serving for the notebook's RandomForest career model.
+
+``train_career_model.py`` fits the forest the way Guidlines_model2.ipynb
+does and exports it as a versioned artifact directory: the trees are
+flattened into a handful of ``.npy`` arrays next to a ``manifest.json``
+holding the feature names, encoder classes and the defaults used for
+missing values. The arrays are loaded memory-mapped, so every worker
+process shares one copy in the page cache and serving needs numpy only.
+
+The forest is evaluated for a whole batch at once: every (row, tree) pair
+steps one level down per iteration, with leaves pointing at themselves
+so finished trees stay put. ``MicroBatcher`` groups predictions from
+concurrent requests into one such batch.
+
+Artifact layout::
+
+    <root>/CURRENT                 version of the artifact to serve
+    <root>/<version>/manifest.json
+    <root>/<version>/{feature,threshold,children,value,roots}.npy
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from queue import Empty, Queue
+
+import numpy as np
+
+from metrics import MODEL_BATCH_SIZE, stage
+
+# Bumped when the array layout or manifest fields change
+ARTIFACT_FORMAT = 1
+
+ARRAY_NAMES = ('feature', 'threshold', 'children', 'value', 'roots')
+
+NUMERICAL_FEATURES = ['Age', 'GPA', 'Year_of_Study', 'Aptitude_Score', 'Communication_Score',
+                      'Internship_Experience', 'Project_Experience', 'Job_Match_Score', 'Predicted_Job_Success']
+CATEGORICAL_FEATURES = ['Gender', 'Specialization', 'Role_Preference']
+
+# Aptitude test answers the wizard stores in ``test_results``. The first
+# group feeds Aptitude_Score (1-10 in the dataset), the people-management
+# questions feed Communication_Score (1-5).
+APTITUDE_ANSWERS = {'logical_reasoning': 'B', 'analytical_thinking': 'B', 'creativity': 'B'}
+COMMUNICATION_ANSWERS = {'problem_solving': 'B', 'leadership': 'C'}
+
+YEAR_OF_STUDY = {'1st Year': 1, '2nd Year': 2, '3rd Year': 3, '4th Year': 4, 'Graduate': 4, 'Postgraduate': 4}
+
+# Degree programmes offered by the personal info form -> dataset specializations.
+# Values the trained encoder has never seen fall back to its default.
+SPECIALIZATION_BY_DEGREE = {'Computer Science': 'CSE', 'Information Technology': 'IT',
+                            'Data Science': 'AI/ML', 'Engineering': 'ECE'}
+
+# The notebook's skill_mapping, applied to the dataset's Key_Skills when training
+DATASET_SKILL_ALIASES = {
+    'js': 'javascript', 'nodejs': 'javascript', 'node.js': 'javascript',
+    'reactjs': 'javascript', 'react.js': 'javascript', 'angularjs': 'javascript', 'angular.js': 'javascript',
+    'vuejs': 'javascript', 'vue.js': 'javascript', 'expressjs': 'javascript', 'express.js': 'javascript',
+    'typescript': 'javascript', 'ts': 'javascript',
+    'py': 'python', 'django': 'python', 'flask': 'python',
+    'cpp': 'c++', 'cplusplus': 'c++',
+    'csharp': 'c#', 'dotnet': 'c#', '.net': 'c#',
+    'go': 'golang', 'golanglang': 'golang',
+    'ml': 'machine learning', 'ai': 'machine learning', 'artificial intelligence': 'machine learning',
+    'dl': 'deep learning', 'neural networks': 'deep learning',
+    'nlp': 'natural language processing',
+    'computer vision': 'machine learning', 'cv': 'machine learning',
+    'aws': 'cloud computing', 'amazon web services': 'cloud computing',
+    'azure': 'cloud computing', 'microsoft azure': 'cloud computing',
+    'gcp': 'cloud computing', 'google cloud': 'cloud computing', 'google cloud platform': 'cloud computing',
+    'kubernetes': 'devops', 'k8s': 'devops', 'docker': 'devops', 'jenkins': 'devops',
+    'ansible': 'devops', 'terraform': 'devops', 'ci/cd': 'devops', 'continuous integration': 'devops',
+    'mysql': 'sql', 'postgresql': 'sql', 'postgres': 'sql', 'sqlite': 'sql', 'oracle': 'sql', 'mssql': 'sql',
+    'database management': 'sql', 'dbms': 'sql',
+    'mongodb': 'nosql', 'cassandra': 'nosql', 'redis': 'nosql',
+    'html5': 'html', 'css3': 'css', 'bootstrap': 'css',
+    'rest': 'api', 'restful': 'api', 'graphql': 'api',
+    'frontend': 'web development', 'front end': 'web development',
+    'backend': 'web development', 'back end': 'web development',
+    'fullstack': 'web development', 'full stack': 'web development',
+    'infosec': 'cybersecurity', 'information security': 'cybersecurity',
+    'network security': 'cybersecurity', 'cyber security': 'cybersecurity',
+    'ethical hacking': 'cybersecurity', 'pen testing': 'cybersecurity',
+    'data analytics': 'data analysis', 'data engineer': 'data analysis',
+    'tableau': 'data visualization', 'power bi': 'data visualization',
+    'excel': 'data analysis', 'statistics': 'data analysis',
+    'big data': 'data analysis', 'data mining': 'data analysis',
+    'communication skills': 'communication', 'public speaking': 'communication',
+    'presentation': 'communication', 'interpersonal skills': 'communication', 'teamwork': 'communication',
+    'agile methodology': 'project management', 'scrum master': 'project management',
+    'pmp': 'project management', 'project planning': 'project management',
+    'user interface': 'ui/ux design', 'user experience': 'ui/ux design',
+    'ux/ui': 'ui/ux design', 'figma': 'ui/ux design', 'sketch': 'ui/ux design',
+    'adobe xd': 'ui/ux design', 'wireframe': 'ui/ux design',
+    'tcpip': 'networking', 'tcp/ip': 'networking', 'routing': 'networking',
+    'switching': 'networking', 'cisco': 'networking',
+}
+
+# The notebook escaped these patterns twice, so they never matched; the
+# intended word and character classes are used here for training and serving alike
+_FILLER_WORDS_RE = re.compile(r'\b(technologies?|tools?|skills?|languages?|frameworks?)\b')
+_UNSAFE_CHARS_RE = re.compile(r'[^a-z0-9\s&+/#.]')
+_SPACES_RE = re.compile(r'\s+')
+
+
+def dataset_skill(skill):
+    """Normalize a skill name onto the dataset's vocabulary (the notebook's ``normalize_skill``)."""
+    skill = str(skill or '').strip().lower()
+    skill = _FILLER_WORDS_RE.sub('', skill)
+    skill = _UNSAFE_CHARS_RE.sub('', skill)
+    skill = _SPACES_RE.sub(' ', skill).strip()
+    if skill in DATASET_SKILL_ALIASES:
+        return DATASET_SKILL_ALIASES[skill]
+    for alias, canonical in DATASET_SKILL_ALIASES.items():
+        if alias in skill:
+            return canonical
+    return skill
+
+
+def _answer_score(test_results, answers, low, high):
+    """Scale the share of correct ``answers`` onto the dataset's ``low``-``high`` range."""
+    answered = [name for name in answers if test_results.get(name)]
+    if not answered:
+        return None
+    correct = sum(1 for name in answered if str(test_results[name]).upper() == answers[name])
+    return round(low + (high - low) * correct / len(answered))
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def profile_fields(personal_info, skills, test_results):
+    """Map the wizard's session sections onto dataset columns; unknown fields are left out."""
+    personal_info = personal_info or {}
+    skills = skills or {}
+    test_results = test_results or {}
+    fields = {
+        'Age': _number(personal_info.get('age')),
+        'Year_of_Study': YEAR_OF_STUDY.get(personal_info.get('year_of_study')),
+        'GPA': _number(personal_info.get('gpa')),
+        'Aptitude_Score': _answer_score(test_results, APTITUDE_ANSWERS, 1, 10),
+        'Communication_Score': _answer_score(test_results, COMMUNICATION_ANSWERS, 1, 5),
+        'Gender': personal_info.get('gender'),
+        'Specialization': SPECIALIZATION_BY_DEGREE.get(personal_info.get('degree'), personal_info.get('degree')),
+        'Role_Preference': personal_info.get('role_preference'),
+    }
+    fields = {name: value for name, value in fields.items() if value is not None}
+    fields['skills'] = [dataset_skill(skill) for skill in
+                        list(skills.get('technical_skills', [])) + list(skills.get('soft_skills', []))]
+    return fields
+
+
+def save_model(root, arrays, manifest):
+    """Write a new artifact version under ``root`` and make it current; return the version.
+
+    The version is a hash of the arrays and manifest, so re-exporting an
+    identical model is a no-op. Both the version directory and ``CURRENT``
+    are renamed into place, so readers never see a partial artifact.
+    """
+    manifest = dict(manifest, format=ARTIFACT_FORMAT)
+    digest = hashlib.sha256(json.dumps(manifest, sort_keys=True).encode('utf-8'))
+    for name in ARRAY_NAMES:
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    version = digest.hexdigest()[:16]
+    manifest['version'] = version
+
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, version)
+    if not os.path.isdir(path):
+        staging = tempfile.mkdtemp(dir=root, prefix='.staging-')
+        for name in ARRAY_NAMES:
+            np.save(os.path.join(staging, name + '.npy'), np.ascontiguousarray(arrays[name]))
+        with open(os.path.join(staging, 'manifest.json'), 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(staging, path)
+
+    fd, pointer = tempfile.mkstemp(dir=root, prefix='.current-')
+    with os.fdopen(fd, 'w') as f:
+        f.write(version + '\n')
+    os.replace(pointer, os.path.join(root, 'CURRENT'))
+    return version
+
+
+def load_model(path):
+    """Load an artifact from its version directory or from the root holding ``CURRENT``."""
+    if not os.path.exists(os.path.join(path, 'manifest.json')):
+        with open(os.path.join(path, 'CURRENT'), encoding='utf-8') as f:
+            path = os.path.join(path, f.read().strip())
+    with open(os.path.join(path, 'manifest.json'), encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported career model format {manifest.get('format')!r} in {path}")
+    arrays = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r') for name in ARRAY_NAMES}
+    return CareerModel(arrays, manifest)
+
+
+class CareerModel:
+    """A flattened random forest plus the encoders needed to build its inputs.
+
+    Trees are stored as one node array: ``feature``/``threshold`` hold the
+    split, ``children`` the left and right child of each node (both are
+    the node itself for a leaf), ``value`` the class probabilities of each
+    leaf and ``roots`` the root node of every tree. Indices are stored as
+    int64 so numpy can use them without converting them on every lookup.
+    """
+
+    def __init__(self, arrays, manifest):
+        self.manifest = manifest
+        self.version = manifest['version']
+        self.classes = manifest['classes']
+        self.feature_names = manifest['features']
+        self.depth = manifest['depth']
+        # Plain ndarray views of the mapped files: indexing an np.memmap is slower
+        self.feature = np.asarray(arrays['feature'])
+        self.threshold = np.asarray(arrays['threshold'])
+        self.children = np.asarray(arrays['children']).ravel()
+        self.value = np.asarray(arrays['value'])
+        self.roots = np.asarray(arrays['roots'])
+
+        self.feature_index = {name: index for index, name in enumerate(self.feature_names)}
+        self.encoders = {name: {label: code for code, label in enumerate(labels)}
+                         for name, labels in manifest['encoders'].items()}
+        # Every missing field starts at the training median (numbers) or most common class
+        self.defaults = np.array([manifest['defaults'].get(name, 0) for name in self.feature_names],
+                                 dtype=np.float32)
+
+    @property
+    def n_features(self):
+        return len(self.feature_names)
+
+    def features(self, personal_info=None, skills=None, test_results=None):
+        """Build the feature vector for one wizard profile."""
+        row = self.defaults.copy()
+        fields = profile_fields(personal_info, skills, test_results)
+        for name in NUMERICAL_FEATURES:
+            if name in fields and name in self.feature_index:
+                row[self.feature_index[name]] = fields[name]
+        for name in CATEGORICAL_FEATURES:
+            code = self.encoders.get(name, {}).get(fields.get(name))
+            if code is not None:
+                row[self.feature_index[name]] = code
+        for skill in fields['skills']:
+            index = self.feature_index.get('skill:' + skill)
+            if index is not None:
+                row[index] = 1
+        return row
+
+    def predict_proba(self, rows):
+        """Return the class probabilities of a ``(n, n_features)`` batch, averaged over the trees."""
+        rows = np.asarray(rows, dtype=np.float32).reshape(-1, self.n_features)
+        # Offset of each row in the flattened batch, so one take() reads every split value
+        offsets = (np.arange(len(rows)) * self.n_features)[:, None]
+        flat = rows.ravel()
+        nodes = np.broadcast_to(self.roots, (len(rows), len(self.roots)))
+        for _ in range(self.depth):
+            go_right = flat[offsets + self.feature[nodes]] > self.threshold[nodes]
+            nodes = self.children[2 * nodes + go_right]
+        return self.value[nodes].mean(axis=1)
+
+    def top_careers(self, probabilities, k=3):
+        """Return the ``k`` most likely careers of one probability row."""
+        order = np.argsort(-probabilities, kind='stable')[:k]
+        return [{'career': self.classes[index], 'probability': round(float(probabilities[index]), 4)}
+                for index in order]
+
+
+class MicroBatcher:
+    """Runs ``predict_batch`` over rows submitted concurrently from many threads.
+
+    A single worker thread takes the first waiting row, then everything
+    else already queued (up to ``max_batch``), waiting at most ``max_wait``
+    seconds for more. An idle server therefore answers a lone request
+    straight away, while under load the rows that pile up during one batch
+    are served together by the next.
+    """
+
+    def __init__(self, predict_batch, max_batch=64, max_wait=0.0):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue = Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._closed = False
+        self.batches = 0
+        self.rows = 0
+        self.largest_batch = 0
+
+    def submit(self, row):
+        """Queue one row; the returned future resolves to its prediction."""
+        future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('MicroBatcher is closed')
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='career-model-batcher', daemon=True)
+                self._thread.start()
+            self._queue.put((row, future))
+        return future
+
+    def predict(self, row, timeout=None):
+        return self.submit(row).result(timeout)
+
+    def _collect(self, first):
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # Let the run loop see the shutdown after this batch
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            batch = [(row, future) for row, future in batch if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            rows = [row for row, future in batch]
+            try:
+                results = self.predict_batch(np.stack(rows))
+            except Exception as exc:
+                for row, future in batch:
+                    future.set_exception(exc)
+                continue
+            for (row, future), result in zip(batch, results):
+                future.set_result(result)
+            with self._lock:
+                self.batches += 1
+                self.rows += len(rows)
+                self.largest_batch = max(self.largest_batch, len(rows))
+            MODEL_BATCH_SIZE.observe(len(rows))
+
+    def close(self):
+        """Stop the worker once the rows already queued are served."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'batches': self.batches,
+                'rows': self.rows,
+                'mean_batch_size': round(self.rows / self.batches, 2) if self.batches else 0.0,
+                'largest_batch': self.largest_batch,
+                'max_batch': self.max_batch,
+                'max_wait_ms': self.max_wait * 1000,
+            }
+
+
+class CareerPredictor:
+    """Predicts careers for wizard profiles, batching concurrent requests together."""
+
+    def __init__(self, model, max_batch=64, max_wait=0.0):
+        self.model = model
+        self.batcher = MicroBatcher(self._predict_batch, max_batch=max_batch, max_wait=max_wait)
+
+    def _predict_batch(self, rows):
+        with stage('predict'):
+            return self.model.predict_proba(rows)
+
+    def predict(self, personal_info=None, skills=None, test_results=None, k=3):
+        """Top ``k`` careers for one profile."""
+        row = self.model.features(personal_info, skills, test_results)
+        return self.model.top_careers(self.batcher.predict(row), k)
+
+    def predict_many(self, profiles, k=3):
+        """Top ``k`` careers for each of ``profiles``, predicted as one batch.
+
+        A profile is a dict with optional ``personal_info``, ``skills`` and
+        ``test_results`` sections, shaped like the wizard's session.
+        """
+        if not profiles:
+            return []
+        rows = np.stack([self.model.features(profile.get('personal_info'), profile.get('skills'),
+                                             profile.get('test_results')) for profile in profiles])
+        probabilities = self._predict_batch(rows)
+        MODEL_BATCH_SIZE.observe(len(rows))
+        return [self.model.top_careers(row, k) for row in probabilities]
+
+    def stats(self):
+        return dict(self.batcher.stats(), version=self.model.version, trees=len(self.model.roots),
+                    classes=len(self.model.classes), features=self.model.n_features)
+
+    def close(self):
+        self.batcher.close()
+
+
+def load_career_predictor(path, max_batch=64, max_wait=0.0):
+    """Return a predictor for the artifact at ``path``, or None if none has been exported."""
+    if not (os.path.exists(os.path.join(path, 'CURRENT')) or os.path.exists(os.path.join(path, 'manifest.json'))):
+        return None
+    return CareerPredictor(load_model(path), max_batch=max_batch, max_wait=max_wait)
@@ -0,0 +1,386 @@
+"""
+Career scoring: the job/skill catalogue, skill normalization and the
+eligibility and skill-gap scores used by the career analysis page.
+
+The catalogue is compiled once into a sparse job x skill matrix
+(``SkillMatrix``) so scoring a user against every job is a handful of
+NumPy operations instead of a Python loop per job.
+"""
+
+import hashlib
+import heapq
+import json
+
+import numpy as np
+
+from skill_normalizer import SkillNormalizer, SKILL_ALIASES
+
+# Upper bound on the candidate x entry matrix built per batch chunk
+BATCH_MAX_CELLS = 4 * 1024 * 1024
+
+# Up to this many jobs a full sort of each row beats argpartition (measured crossover ~50)
+TOP_K_SORT_MAX_COLUMNS = 64
+
+# Job skills mapping based on the notebook
+JOB_SKILLS_MAPPING = {
+    'Cloud Engineer': ['cloud computing', 'devops', 'networking', 'linux', 'python', 'security'],
+    'Web Developer': ['javascript', 'html', 'css', 'web development', 'api', 'database'],
+    'Network Engineer': ['networking', 'linux', 'security'],
+    'Database Administrator': ['sql', 'nosql', 'database', 'security'],
+    'Cybersecurity Analyst': ['cybersecurity', 'networking', 'linux', 'security'],
+    'Software Engineer': ['java', 'python', 'c++', 'data structures', 'algorithms', 'devops'],
+    'AI Engineer': ['machine learning', 'python', 'data analysis', 'tensorflow', 'pytorch'],
+    'Embedded Systems Engineer': ['c++', 'c', 'embedded systems', 'hardware'],
+    'Business Analyst': ['business analysis', 'communication', 'sql', 'data analysis', 'project management'],
+    'Data Analyst': ['data analysis', 'sql', 'python', 'data visualization'],
+    'DevOps Engineer': ['devops', 'cloud computing', 'linux', 'automation'],
+    'Mobile App Developer': ['java', 'kotlin', 'swift', 'mobile development', 'ui/ux design'],
+    'UI/UX Designer': ['ui/ux design', 'user research', 'graphic design'],
+    'Project Manager': ['project management', 'leadership', 'communication', 'risk management'],
+    'Data Scientist': ['data analysis', 'machine learning', 'python', 'statistics']
+}
+
+def build_normalizer(job_skills_map):
+    """Build a normalizer from the alias table and every skill the catalogue mentions."""
+    return SkillNormalizer(
+        SKILL_ALIASES,
+        sorted({skill for skills in job_skills_map.values() for skill in skills})
+    )
+
+SKILL_NORMALIZER = build_normalizer(JOB_SKILLS_MAPPING)
+
+def catalogue_version(job_skills_map):
+    """Short content hash of a catalogue, including job order (it breaks ties)."""
+    payload = json.dumps(list(job_skills_map.items()), separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def normalize_skill(skill):
+    """Normalize skill names to match the job requirements"""
+    return SKILL_NORMALIZER.normalize(skill)
+
+def extract_skills(text):
+    """Pull catalogue skills straight out of free text such as a resume."""
+    return SKILL_NORMALIZER.extract(text)
+
+class SkillMatrix:
+    """A job catalogue compiled into CSR arrays over a skill vocabulary.
+
+    Row ``j`` lists the vocabulary indices of job ``j``'s required skills
+    in their catalogue order, so missing skills come back in the same order
+    as the original lists.
+    """
+
+    def __init__(self, job_skills_map):
+        self.version = catalogue_version(job_skills_map)
+        self.jobs = list(job_skills_map)
+        self.job_index = {job: index for index, job in enumerate(self.jobs)}
+        self.skill_index = {}
+        indices = []
+        indptr = [0]
+        for job in self.jobs:
+            for skill in job_skills_map[job]:
+                indices.append(self.skill_index.setdefault(skill, len(self.skill_index)))
+            indptr.append(len(indices))
+
+        self.skills = list(self.skill_index)
+        self.skill_names = np.array(self.skills, dtype=object)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.required_counts = np.diff(self.indptr)
+        # Row number of every stored entry, for summing entries per job
+        self.entry_jobs = np.repeat(np.arange(len(self.jobs), dtype=np.int32), self.required_counts)
+
+        # Inverted index: the jobs requiring skill i are
+        # posting_jobs[posting_indptr[i]:posting_indptr[i + 1]]
+        order = np.argsort(self.indices, kind='stable')
+        self.posting_jobs = self.entry_jobs[order]
+        self.posting_indptr = np.zeros(len(self.skills) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.indices, minlength=len(self.skills)), out=self.posting_indptr[1:])
+        self.required_lists = [self.skills_of(index) for index in range(len(self.jobs))]
+
+    def skills_of(self, job_index):
+        start, end = self.indptr[job_index], self.indptr[job_index + 1]
+        return [self.skills[index] for index in self.indices[start:end].tolist()]
+
+    def profile_key(self, user_skills):
+        """Hash of a user's normalized skills and the catalogue version.
+
+        Users whose skill lists normalize to the same multiset get the same
+        scores, so they share a key. Duplicates are kept because every
+        listed skill counts toward eligibility and the bonus.
+        """
+        normalized = sorted(normalize_skill(skill) for skill in user_skills)
+        payload = json.dumps([self.version, normalized], separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def user_vector(self, normalized_skills):
+        """Count how often each vocabulary skill appears in the user's list."""
+        vector = np.zeros(len(self.skills), dtype=np.float64)
+        for skill in normalized_skills:
+            index = self.skill_index.get(skill)
+            if index is not None:
+                vector[index] += 1
+        return vector
+
+    def score(self, user_skills):
+        """Score a user's raw skill list against every job in one pass."""
+        normalized = [normalize_skill(skill) for skill in user_skills]
+        return SkillScores(self, self.user_vector(normalized), len(normalized))
+
+    def top_jobs(self, user_skills):
+        """Score only the jobs that share a skill with the user.
+
+        Cheaper than ``score`` when the catalogue is large and the user
+        matches few jobs. See ``TopJobs``.
+        """
+        return TopJobs(self, [normalize_skill(skill) for skill in user_skills])
+
+    def score_batch(self, skill_lists, k=5, max_cells=BATCH_MAX_CELLS):
+        """Yield the top ``k`` careers for each skill list in ``skill_lists``.
+
+        Candidates are scored a chunk at a time as one candidate x entry
+        matrix, sized so it never holds more than ``max_cells`` values.
+        Memory therefore stays flat however many candidates stream in.
+        """
+        chunk_size = max(1, max_cells // max(1, len(self.indices)))
+        chunk = []
+        for skills in skill_lists:
+            chunk.append(skills)
+            if len(chunk) >= chunk_size:
+                yield from self._score_chunk(chunk, k)
+                chunk = []
+        if chunk:
+            yield from self._score_chunk(chunk, k)
+
+    def _score_chunk(self, chunk, k):
+        rows = len(chunk)
+        counts = np.zeros((rows, len(self.skills)), dtype=np.int32)
+        skill_counts = np.zeros(rows, dtype=np.float64)
+        for row, skills in enumerate(chunk):
+            normalized = [normalize_skill(skill) for skill in skills]
+            skill_counts[row] = len(normalized)
+            for skill in normalized:
+                index = self.skill_index.get(skill)
+                if index is not None:
+                    counts[row, index] += 1
+
+        # Per-job sums as differences of a running total over each CSR row
+        entry_counts = counts[:, self.indices]
+        present = entry_counts > 0
+        matched = _row_segment_sums(entry_counts, self.indptr)
+        present_counts = _row_segment_sums(present, self.indptr)
+
+        required = self.required_counts.astype(np.float64)
+        has_required = self.required_counts > 0
+        safe_required = np.where(has_required, required, 1.0)
+        bonus = np.minimum(20, skill_counts * 0.5)[:, None]
+        eligibility = np.where(has_required, np.minimum(100, (matched / safe_required) * 100 + bonus), 0.0)
+        match_percentage = np.where(has_required, (present_counts / safe_required) * 100, 0.0)
+
+        top = _top_k_indexes(eligibility, k)
+        for row in range(rows):
+            careers = []
+            for job_index in top[row].tolist():
+                start, end = self.indptr[job_index], self.indptr[job_index + 1]
+                missing = np.flatnonzero(~present[row, start:end])
+                careers.append({
+                    'title': self.jobs[job_index],
+                    'match': round(float(eligibility[row, job_index]), 1),
+                    'skill_match_percentage': round(float(match_percentage[row, job_index]), 1),
+                    'missing_skills': [self.skills[self.indices[start + offset]] for offset in missing]
+                })
+            yield careers
+
+def _top_k_indexes(values, k):
+    """Column indexes of the ``k`` largest values in each row, largest first.
+
+    Ties keep catalogue (column) order, as career_analysis does. Wide rows
+    are partitioned and only the ``k`` picked are sorted; narrow ones are
+    cheaper to sort whole.
+    """
+    rows, columns = values.shape
+    k = min(k, columns)
+    if columns <= TOP_K_SORT_MAX_COLUMNS or k in (0, columns):
+        return np.argsort(-values, axis=1, kind='stable')[:, :k]
+    picked = np.argpartition(-values, k - 1, axis=1)[:, :k]
+    kth = np.take_along_axis(values, picked, axis=1).min(axis=1)[:, None]
+    # argpartition picks any of the values tied with the k-th; keep the earliest
+    above = values > kth
+    tied = values == kth
+    wanted = k - above.sum(axis=1, keepdims=True)
+    picked = np.nonzero(above | (tied & (np.cumsum(tied, axis=1) <= wanted)))[1].reshape(rows, k)
+    order = np.argsort(-np.take_along_axis(values, picked, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(picked, order, axis=1)
+
+def _row_segment_sums(values, indptr):
+    """Sum ``values[:, indptr[j]:indptr[j + 1]]`` for every j at once."""
+    totals = np.zeros((values.shape[0], values.shape[1] + 1), dtype=np.int64)
+    np.cumsum(values, axis=1, out=totals[:, 1:])
+    return (totals[:, indptr[1:]] - totals[:, indptr[:-1]]).astype(np.float64)
+
+class SkillScores:
+    """Eligibility, match percentage and skill gaps of one user for all jobs."""
+
+    def __init__(self, matrix, user_vector, skill_count):
+        self.matrix = matrix
+        entry_counts = user_vector[matrix.indices]
+        job_count = len(matrix.jobs)
+        required = matrix.required_counts.astype(np.float64)
+        has_required = matrix.required_counts > 0
+        safe_required = np.where(has_required, required, 1.0)
+
+        # Every listed skill counts toward eligibility, duplicates included
+        matched = np.bincount(matrix.entry_jobs, weights=entry_counts, minlength=job_count)
+        bonus = min(20, skill_count * 0.5)
+        eligibility = np.minimum(100, (matched / safe_required) * 100 + bonus)
+        self.eligibility = np.where(has_required, eligibility, 0.0)
+
+        # Gaps only care whether a required skill is present at all
+        self.present = entry_counts > 0
+        present_counts = np.bincount(matrix.entry_jobs, weights=self.present, minlength=job_count)
+        self.match_percentage = np.where(has_required, (present_counts / safe_required) * 100, 0)
+
+    def eligibility_dict(self):
+        # min(100, score) in the original returned the int 100 when capped
+        return {job: (100 if score >= 100 else score)
+                for job, score in zip(self.matrix.jobs, self.eligibility.tolist())}
+
+    def missing_skills(self, job):
+        index = self.matrix.job_index[job]
+        start, end = self.matrix.indptr[index], self.matrix.indptr[index + 1]
+        missing = np.flatnonzero(~self.present[start:end])
+        return [self.matrix.skills[self.matrix.indices[start + offset]] for offset in missing]
+
+    def gaps_dict(self):
+        matrix = self.matrix
+        # Gather every missing skill name at once, then slice per job
+        missing = ~self.present
+        names = np.take(matrix.skill_names, matrix.indices[missing]).tolist()
+        ends = np.cumsum(np.bincount(matrix.entry_jobs[missing], minlength=len(matrix.jobs))).tolist()
+
+        gaps = {}
+        start = 0
+        for job, end, percentage, required in zip(matrix.jobs, ends, self.match_percentage.tolist(),
+                                                  matrix.required_counts.tolist()):
+            gaps[job] = {
+                'missing_skills': names[start:end],
+                'match_percentage': percentage if required else 0
+            }
+            start = end
+        return gaps
+
+    def ranked(self):
+        """Return ``(job, score)`` pairs sorted by eligibility, best first."""
+        scores = self.eligibility_dict()
+        return sorted(scores.items(), key=lambda x: x[1], reverse=True)
+
+class TopJobs:
+    """Sparse scores of one user, with top-k selection by heap.
+
+    A job sharing no skill with the user scores exactly the skill-count
+    bonus (or 0 if it lists no skills), which is below every job that
+    does share one. Only the jobs reached through the inverted index are
+    scored; the rest are taken in catalogue order only if the top k needs
+    them, which reproduces the stable sort of the full ranking.
+    """
+
+    def __init__(self, matrix, normalized_skills):
+        self.matrix = matrix
+        self.user_skills = set(normalized_skills)
+        self.bonus = min(20, len(normalized_skills) * 0.5)
+
+        counts = {}
+        for skill in normalized_skills:
+            index = matrix.skill_index.get(skill)
+            if index is not None:
+                counts[index] = counts.get(index, 0) + 1
+
+        self.scores = {}
+        if counts:
+            skill_ids = np.fromiter(counts, dtype=np.int64, count=len(counts))
+            starts = matrix.posting_indptr[skill_ids]
+            lengths = matrix.posting_indptr[skill_ids + 1] - starts
+            postings = np.concatenate([matrix.posting_jobs[start:start + length]
+                                       for start, length in zip(starts.tolist(), lengths.tolist())])
+            weights = np.repeat(np.fromiter(counts.values(), dtype=np.float64, count=len(counts)), lengths)
+            jobs, inverse = np.unique(postings, return_inverse=True)
+            matched = np.bincount(inverse, weights=weights)
+            required = matrix.required_counts[jobs].astype(np.float64)
+            scores = np.minimum(100, (matched / required) * 100 + self.bonus)
+            self.scores = dict(zip(jobs.tolist(), scores.tolist()))
+
+    def _unmatched_score(self, job_index):
+        return self.bonus if self.matrix.required_counts[job_index] else 0.0
+
+    def top(self, k):
+        """Return the ``k`` best ``(job, score)`` pairs, best first."""
+        best = heapq.nlargest(k, self.scores.items(), key=lambda item: (item[1], -item[0]))
+        ranked = [(index, score) for index, score in best]
+        if len(ranked) < k:
+            # Unmatched jobs tie at the bonus, with empty jobs at 0 after them
+            with_skills, without_skills = [], []
+            for index in range(len(self.matrix.jobs)):
+                if index in self.scores:
+                    continue
+                if self.matrix.required_counts[index]:
+                    with_skills.append(index)
+                    if len(with_skills) >= k - len(ranked):
+                        break
+                elif len(without_skills) < k:
+                    without_skills.append(index)
+            filler = with_skills + without_skills if self.bonus > 0 else sorted(with_skills + without_skills)
+            ranked += [(index, self._unmatched_score(index)) for index in filler[:k - len(ranked)]]
+        return [(self.matrix.jobs[index], 100 if score >= 100 else score) for index, score in ranked]
+
+    def missing_skills(self, job):
+        required = self.matrix.required_lists[self.matrix.job_index[job]]
+        return [skill for skill in required if skill not in self.user_skills]
+
+# The last other catalogue compiled, as (map, matrix). One entry, so maps
+# passed once are not kept alive
+_last_matrix = None
+
+def get_skill_matrix(job_skills_map):
+    """Return the compiled matrix for a catalogue.
+
+    The built-in catalogue is compiled at import and by ``reload_catalogue``;
+    any other map is compiled on first use and kept until another is passed.
+    """
+    global _last_matrix
+    if job_skills_map is JOB_SKILLS_MAPPING:
+        return SKILL_MATRIX
+    cached = _last_matrix
+    if cached is None or cached[0] is not job_skills_map:
+        cached = _last_matrix = (job_skills_map, SkillMatrix(job_skills_map))
+    return cached[1]
+
+def score_candidates(skill_lists, k=5, job_skills_map=None):
+    """Yield the top ``k`` careers, scores and gaps for each candidate skill list."""
+    matrix = SKILL_MATRIX if job_skills_map is None else get_skill_matrix(job_skills_map)
+    return matrix.score_batch(skill_lists, k=k)
+
+def calculate_job_eligibility(user_skills, job_skills_map):
+    """Calculate eligibility scores for each job based on user skills"""
+    return get_skill_matrix(job_skills_map).score(user_skills).eligibility_dict()
+
+def analyze_skill_gaps(user_skills, job_skills_map):
+    """Analyze skill gaps for each job"""
+    return get_skill_matrix(job_skills_map).score(user_skills).gaps_dict()
+
+def current_skill_matrix():
+    """Return the compiled built-in catalogue, as of the last ``reload_catalogue``."""
+    return SKILL_MATRIX
+
+def reload_catalogue():
+    """Recompile the built-in catalogue after JOB_SKILLS_MAPPING was edited in place.
+
+    The new matrix has a new ``version`` if anything changed, which
+    invalidates analyses memoized against the old one.
+    """
+    global SKILL_MATRIX, SKILL_NORMALIZER
+    SKILL_NORMALIZER = build_normalizer(JOB_SKILLS_MAPPING)
+    SKILL_MATRIX = SkillMatrix(JOB_SKILLS_MAPPING)
+    return SKILL_MATRIX
+
+# Compile the built-in catalogue at import so the first request does not pay for it
+SKILL_MATRIX = SkillMatrix(JOB_SKILLS_MAPPING)
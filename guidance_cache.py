@@ -0,0 +1,189 @@
+"""
+Two-tier cache for AI-generated career guidance.
+
+Guidance is requested for a career, a user's normalized skills and their
+match band. The exact tier answers requests whose key matches a stored
+one. On an exact miss, the similarity tier looks at stored answers for the
+same career and band. It reuses the closest one if the two skill sets
+have a cosine similarity of at least ``threshold``.
+
+Entries live in a SQLite file with a TTL and caps on entry count and
+total size, so every worker process on the host shares them.
+"""
+
+import hashlib
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+
+from metrics import CACHE_LOOKUPS
+
+# Width of a match band in percentage points: 73% and 78% share band 70
+MATCH_BAND_WIDTH = 10
+
+# Most recent entries compared in the similarity tier per lookup
+SIMILARITY_CANDIDATES = 500
+
+
+def match_band(match_percentage):
+    return int(match_percentage) // MATCH_BAND_WIDTH * MATCH_BAND_WIDTH
+
+
+def skill_bucket(skills):
+    """Sorted unique normalized skills, without empty names."""
+    return sorted({skill for skill in skills if skill})
+
+
+def cache_key(career_title, skills, band):
+    payload = json.dumps([career_title, skill_bucket(skills), band], separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def cosine_similarity(a, b):
+    """Cosine similarity of two skill sets seen as binary vectors."""
+    if not a or not b:
+        return 1.0 if a == b else 0.0
+    return len(a & b) / math.sqrt(len(a) * len(b))
+
+
+class GuidanceCache:
+    """SQLite-backed exact + similarity cache of guidance sections."""
+
+    def __init__(self, path, ttl=7 * 24 * 3600, max_entries=5000, max_bytes=64 * 1024 * 1024,
+                 threshold=0.8):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.threshold = threshold
+        # Counted by this process only
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Best similarity found by each similarity-tier lookup, in tenths,
+        # to show how many more hits a lower threshold would give
+        self.similarity_histogram = [0] * 11
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS guidance ('
+                ' key TEXT PRIMARY KEY,'
+                ' career TEXT NOT NULL,'
+                ' band INTEGER NOT NULL,'
+                ' skills TEXT NOT NULL,'
+                ' data TEXT NOT NULL,'
+                ' expires_at REAL NOT NULL,'
+                ' accessed_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS guidance_career ON guidance (career, band, accessed_at)')
+            conn.execute('CREATE INDEX IF NOT EXISTS guidance_accessed ON guidance (accessed_at)')
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, career_title, skills, match_percentage):
+        """Return ``(sections, tier)`` for a request, or ``(None, None)`` on a miss."""
+        band = match_band(match_percentage)
+        key = cache_key(career_title, skills, band)
+        conn = self._connection()
+        now = time.time()
+
+        row = conn.execute('SELECT data FROM guidance WHERE key = ? AND expires_at >= ?',
+                           (key, now)).fetchone()
+        if row is not None:
+            self._touch(conn, key, now)
+            with self._lock:
+                self.exact_hits += 1
+            CACHE_LOOKUPS.inc('guidance', 'exact')
+            return json.loads(row[0]), 'exact'
+
+        wanted = set(skill_bucket(skills))
+        best_key, best_data, best_similarity = None, None, 0.0
+        for candidate_key, candidate_skills, data in conn.execute(
+                'SELECT key, skills, data FROM guidance WHERE career = ? AND band = ? AND expires_at >= ?'
+                ' ORDER BY accessed_at DESC LIMIT ?',
+                (career_title, band, now, SIMILARITY_CANDIDATES)):
+            similarity = cosine_similarity(wanted, set(json.loads(candidate_skills)))
+            if similarity > best_similarity:
+                best_key, best_data, best_similarity = candidate_key, data, similarity
+
+        with self._lock:
+            if best_key is not None:
+                self.similarity_histogram[int(best_similarity * 10)] += 1
+            if best_key is None or best_similarity < self.threshold:
+                self.misses += 1
+                CACHE_LOOKUPS.inc('guidance', 'miss')
+                return None, None
+            self.similar_hits += 1
+        CACHE_LOOKUPS.inc('guidance', 'similar')
+        self._touch(conn, best_key, now)
+        return json.loads(best_data), 'similar'
+
+    def _touch(self, conn, key, now):
+        with conn:
+            conn.execute('UPDATE guidance SET accessed_at = ? WHERE key = ?', (now, key))
+
+    def put(self, career_title, skills, match_percentage, sections):
+        band = match_band(match_percentage)
+        bucket = skill_bucket(skills)
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO guidance (key, career, band, skills, data, expires_at, accessed_at)'
+                ' VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (cache_key(career_title, bucket, band), career_title, band, json.dumps(bucket),
+                 json.dumps(sections, separators=(',', ':')), now + self.ttl, now)
+            )
+            conn.execute('DELETE FROM guidance WHERE expires_at < ?', (now,))
+            self._evict(conn)
+
+    def _evict(self, conn):
+        entries, size = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(data) + LENGTH(skills)), 0) FROM guidance'
+        ).fetchone()
+        if entries <= self.max_entries and size <= self.max_bytes:
+            return
+        # Drop least recently used entries until both caps are met
+        for key, entry_size in conn.execute(
+                'SELECT key, LENGTH(data) + LENGTH(skills) FROM guidance ORDER BY accessed_at').fetchall():
+            if entries <= self.max_entries and size <= self.max_bytes:
+                break
+            conn.execute('DELETE FROM guidance WHERE key = ?', (key,))
+            entries -= 1
+            size -= entry_size
+            with self._lock:
+                self.evictions += 1
+
+    def stats(self):
+        entries, size = self._connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(LENGTH(data) + LENGTH(skills)), 0) FROM guidance'
+        ).fetchone()
+        with self._lock:
+            lookups = self.exact_hits + self.similar_hits + self.misses
+            return {
+                'entries': entries,
+                'bytes': size,
+                'threshold': self.threshold,
+                'exact_hits': self.exact_hits,
+                'similar_hits': self.similar_hits,
+                'misses': self.misses,
+                'hit_rate': round((self.exact_hits + self.similar_hits) / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'best_similarity_histogram': {
+                    f'{bucket / 10:.1f}': count for bucket, count in enumerate(self.similarity_histogram)
+                },
+            }
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Bulk resume ingestion for onboarding a whole cohort.
+
+Walks a directory, .zip or .tar(.gz) archive, extracts and parses every
+resume in parallel and appends one JSON record per file to the output.
+Re-running with the same output file skips resumes whose content hash was
+already processed. Files over the web upload's size cap for their format
+are recorded as errors without being read.
+
+Usage:
+    python ingest_resumes.py resumes/ -o cohort.jsonl
+    python ingest_resumes.py cohort-2025.zip -o cohort.jsonl --workers 8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tarfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ALL_COMPLETED, FIRST_COMPLETED, wait
+
+from resume_jobs import ExtractionTimeout, time_limit
+from resume_parser import extract_resume, init_extraction_worker, SUPPORTED_EXTENSIONS
+from resume_upload import InvalidUpload, check_size
+
+# Hashes already in the output file, set in each worker by the pool initializer
+_skip_hashes = frozenset()
+
+
+def _init_worker(skip_hashes):
+    global _skip_hashes
+    _skip_hashes = skip_hashes
+    init_extraction_worker()
+
+
+def file_format(name):
+    return name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+
+
+def _size_error(name, size):
+    try:
+        check_size(file_format(name), size)
+    except InvalidUpload as e:
+        return str(e)
+    return None
+
+
+def iter_sources(path):
+    """Yield ``(name, path, data, error)`` for each resume under ``path``.
+
+    Files in a directory are yielded by path and read by the workers.
+    Archive members are read here, because tar members can only be read
+    efficiently in order, and passed to the workers as bytes. Files over
+    the upload size cap for their format are not read at all; they come
+    with an ``error`` instead.
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                if file_format(filename) in SUPPORTED_EXTENSIONS:
+                    file_path = os.path.join(root, filename)
+                    name = os.path.relpath(file_path, path)
+                    yield name, file_path, None, _size_error(name, os.path.getsize(file_path))
+
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for member in archive.infolist():
+                if not member.is_dir() and file_format(member.filename) in SUPPORTED_EXTENSIONS:
+                    # Reads stop at the declared size, so a member cannot unpack past the cap
+                    error = _size_error(member.filename, member.file_size)
+                    yield member.filename, None, None if error else archive.read(member), error
+
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path) as archive:
+            for member in archive:
+                if member.isfile() and file_format(member.name) in SUPPORTED_EXTENSIONS:
+                    error = _size_error(member.name, member.size)
+                    yield member.name, None, None if error else archive.extractfile(member).read(), error
+
+    else:
+        raise ValueError(f"{path} is not a directory, zip or tar archive")
+
+
+def ingest_one(name, file_path, data, timeout):
+    """Extract and parse one resume and return its output record."""
+    started = time.perf_counter()
+    if data is None:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    sha256 = hashlib.sha256(data).hexdigest()
+    record = {'file': name, 'sha256': sha256, 'format': file_format(name)}
+    if sha256 in _skip_hashes:
+        record['status'] = 'skipped'
+        return record
+
+    try:
+        with time_limit(timeout):
+            text, info = extract_resume(data, record['format'])
+        record.update(status='ok' if text.strip() else 'empty', chars=len(text), info=info)
+    except ExtractionTimeout:
+        record.update(status='error', error=f"timed out after {timeout}s")
+    except Exception as e:
+        record.update(status='error', error=str(e))
+
+    record['seconds'] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def load_processed_hashes(output_path):
+    """Return the hashes of resumes already ingested successfully."""
+    hashes = set()
+    if not os.path.exists(output_path):
+        return hashes
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A partial last line from an interrupted run
+            if record.get('status') in ('ok', 'empty'):
+                hashes.add(record['sha256'])
+    return hashes
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def summarize(records, elapsed):
+    """Return a summary dict of counts, throughput and per-format latency."""
+    counts = {}
+    latencies = {}
+    for record in records:
+        counts[record['status']] = counts.get(record['status'], 0) + 1
+        if 'seconds' in record:
+            latencies.setdefault(record['format'], []).append(record['seconds'])
+
+    processed = sum(len(values) for values in latencies.values())
+    per_format = {}
+    for fmt, values in sorted(latencies.items()):
+        values.sort()
+        per_format[fmt] = {
+            'count': len(values),
+            'mean_ms': round(sum(values) / len(values) * 1000, 1),
+            'p50_ms': round(percentile(values, 50) * 1000, 1),
+            'p95_ms': round(percentile(values, 95) * 1000, 1),
+        }
+
+    return {
+        'files': len(records),
+        'statuses': counts,
+        'elapsed_seconds': round(elapsed, 3),
+        'docs_per_second': round(processed / elapsed, 2) if elapsed > 0 else 0.0,
+        'per_format': per_format,
+    }
+
+
+def ingest(source, output_path, workers=None, timeout=60, resume=True):
+    """Ingest every resume under ``source`` into ``output_path`` and return the summary."""
+    skip_hashes = frozenset(load_processed_hashes(output_path)) if resume else frozenset()
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = workers * 4  # Keeps archive bytes in memory bounded
+
+    records = []
+    started = time.perf_counter()
+    with open(output_path, 'a' if resume else 'w', encoding='utf-8') as out, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(skip_hashes,)) as executor:
+
+        def drain(futures, return_when):
+            done, pending = wait(futures, return_when=return_when)
+            for future in done:
+                record = future.result()
+                records.append(record)
+                if record['status'] != 'skipped':
+                    out.write(json.dumps(record) + '\n')
+            out.flush()
+            return pending
+
+        in_flight = set()
+        for name, file_path, data, error in iter_sources(source):
+            if error is not None:
+                record = {'file': name, 'sha256': None, 'format': file_format(name), 'status': 'error',
+                          'error': error}
+                records.append(record)
+                out.write(json.dumps(record) + '\n')
+                continue
+            if len(in_flight) >= max_in_flight:
+                in_flight = drain(in_flight, FIRST_COMPLETED)
+            in_flight.add(executor.submit(ingest_one, name, file_path, data, timeout))
+        if in_flight:
+            drain(in_flight, ALL_COMPLETED)
+
+    return summarize(records, time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk-ingest a directory or archive of resumes into JSONL.')
+    parser.add_argument('source', help='directory, .zip or .tar(.gz) of resumes')
+    parser.add_argument('-o', '--output', required=True, help='JSONL file to append results to')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes (default: CPU count)')
+    parser.add_argument('--timeout', type=int, default=60, help='seconds allowed per resume')
+    parser.add_argument('--no-resume', action='store_true', help='overwrite the output instead of skipping processed resumes')
+    args = parser.parse_args(argv)
+
+    summary = ingest(args.source, args.output, workers=args.workers,
+                     timeout=args.timeout, resume=not args.no_resume)
+
+    print(f"Files seen: {summary['files']}  {summary['statuses']}", file=sys.stderr)
+    print(f"Elapsed: {summary['elapsed_seconds']}s  ({summary['docs_per_second']} docs/sec)", file=sys.stderr)
+    for fmt, stats in summary['per_format'].items():
+        print(f"  {fmt:<5} n={stats['count']:<6} mean={stats['mean_ms']}ms  "
+              f"p50={stats['p50_ms']}ms  p95={stats['p95_ms']}ms", file=sys.stderr)
+    return summary
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+"""
+Async client layer for AI-generated career guidance.
+
+One ``ChatCompletionsClient`` and its aiohttp connection pool are shared by
+every request. Upstream calls are capped by a semaphore, time out, and are
+retried with jittered exponential backoff when the service throttles,
+fails or drops the connection. Concurrent requests with the same key share
+a single upstream call, whether they want the reply whole or streamed.
+
+Flask views are synchronous, so ``LLMRunner`` runs the client on one
+background event loop and hands results back to the calling thread.
+
+aiohttp and the Azure SDK are imported when the first call is made, so
+importing this module does not slow down app startup.
+"""
+
+import asyncio
+import queue
+import random
+import threading
+
+# Status codes worth another attempt; anything else is the caller's fault
+RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """The model could not produce a completion."""
+
+
+def is_retryable(error):
+    from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+
+    if isinstance(error, (asyncio.TimeoutError, ServiceRequestError, ServiceResponseError)):
+        return True
+    return isinstance(error, HttpResponseError) and error.status_code in RETRY_STATUSES
+
+
+class AsyncLLMClient:
+    """Pooled, rate-limited chat completions client with single-flight calls."""
+
+    def __init__(self, endpoint, model, token, max_concurrency=8, timeout=30,
+                 max_retries=3, backoff=0.5, max_backoff=8.0):
+        self.endpoint = endpoint
+        self.model = model
+        self.token = token
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.upstream_calls = 0
+        self.coalesced = 0
+        self.retries = 0
+        self.failures = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight = {}  # key -> task or SharedStream of the call in progress
+        self._session = None
+        self._client = None
+
+    def _get_client(self):
+        # aiohttp sessions belong to the running loop, so build on first call
+        if self._client is None:
+            import aiohttp
+            from azure.ai.inference.aio import ChatCompletionsClient
+            from azure.core.credentials import AzureKeyCredential
+            from azure.core.pipeline.transport import AioHttpTransport
+
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency))
+            self._client = ChatCompletionsClient(
+                endpoint=self.endpoint,
+                credential=AzureKeyCredential(self.token),
+                transport=AioHttpTransport(session=self._session, session_owner=False),
+                retry_total=0  # Retries are handled here, with jitter
+            )
+        return self._client
+
+    async def complete(self, messages, key=None):
+        """Return the reply text for ``messages``.
+
+        Callers passing the same ``key`` while a call for it is in flight
+        wait for that call instead of starting their own.
+        """
+        if key is None:
+            return await self._complete_with_retries(messages)
+        task = self._inflight.get(key)
+        if isinstance(task, SharedStream):
+            self.coalesced += 1
+            return ''.join([piece async for piece in task.follow()])
+        if task is None:
+            task = asyncio.ensure_future(self._complete_with_retries(messages))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.coalesced += 1
+        # One caller giving up must not cancel the call the others share
+        return await asyncio.shield(task)
+
+    async def _complete_with_retries(self, messages):
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    self.upstream_calls += 1
+                    response = await asyncio.wait_for(
+                        self._get_client().complete(messages=messages, model=self.model),
+                        self.timeout
+                    )
+                return response.choices[0].message.content
+            except Exception as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    self.failures += 1
+                    raise LLMError(f"Guidance model call failed: {e!r}") from e
+                self.retries += 1
+                await asyncio.sleep(self.backoff_delay(attempt))
+
+    async def stream(self, messages, key=None):
+        """Yield the reply text for ``messages`` piece by piece as the model writes it.
+
+        Callers passing the same ``key`` while a call for it is in flight
+        follow that call: they get the pieces written so far, then the rest
+        as they arrive. If the call in flight is a ``complete``, its reply
+        is yielded whole once it is ready.
+        """
+        if key is None:
+            async for piece in self._stream_with_retries(messages):
+                yield piece
+            return
+        shared = self._inflight.get(key)
+        if isinstance(shared, asyncio.Future):
+            self.coalesced += 1
+            yield await asyncio.shield(shared)
+            return
+        if shared is None:
+            shared = SharedStream(self._stream_with_retries(messages), lambda: self._inflight.pop(key, None))
+            self._inflight[key] = shared
+        else:
+            self.coalesced += 1
+        async for piece in shared.follow():
+            yield piece
+
+    async def _stream_with_retries(self, messages):
+        # Failures before the first piece are retried like ``complete``; after
+        # that the caller has already used part of the reply, so they are
+        # raised as ``LLMError``. ``timeout`` applies to each piece
+        for attempt in range(self.max_retries + 1):
+            started = False
+            try:
+                async with self._semaphore:
+                    self.upstream_calls += 1
+                    response = await asyncio.wait_for(
+                        self._get_client().complete(messages=messages, model=self.model, stream=True),
+                        self.timeout
+                    )
+                    async with response:
+                        while True:
+                            try:
+                                update = await asyncio.wait_for(response.__anext__(), self.timeout)
+                            except StopAsyncIteration:
+                                break
+                            if update.choices and update.choices[0].delta.content:
+                                started = True
+                                yield update.choices[0].delta.content
+                return
+            except Exception as e:
+                if started or attempt == self.max_retries or not is_retryable(e):
+                    self.failures += 1
+                    raise LLMError(f"Guidance model stream failed: {e!r}") from e
+                self.retries += 1
+                await asyncio.sleep(self.backoff_delay(attempt))
+
+    def backoff_delay(self, attempt):
+        # "Full jitter": spreads retries from many callers over the window
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.close()
+            await self._session.close()
+            self._client = self._session = None
+
+    def stats(self):
+        return {
+            'upstream_calls': self.upstream_calls,
+            'coalesced': self.coalesced,
+            'retries': self.retries,
+            'failures': self.failures,
+            'in_flight': len(self._inflight),
+        }
+
+
+class SharedStream:
+    """One upstream stream fanned out to every caller following it.
+
+    The pieces are kept until the stream ends, so a caller joining late
+    replays them first. The upstream call is cancelled once no caller is
+    following it any more.
+    """
+
+    def __init__(self, source, on_done):
+        self.pieces = []
+        self.error = None
+        self.done = False
+        self.followers = 0
+        self._on_done = on_done
+        self._changed = asyncio.Event()
+        self.task = asyncio.ensure_future(self._pump(source))
+
+    async def _pump(self, source):
+        try:
+            async for piece in source:
+                self.pieces.append(piece)
+                self._notify()
+        except asyncio.CancelledError:
+            self.error = LLMError("Guidance model stream was cancelled")
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            # Removed before anyone else can join, so late callers start a fresh call
+            self.done = True
+            self._on_done()
+            self._notify()
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def follow(self):
+        self.followers += 1
+        index = 0
+        try:
+            while True:
+                while index < len(self.pieces):
+                    index += 1
+                    yield self.pieces[index - 1]
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                await self._changed.wait()
+        finally:
+            self.followers -= 1
+            if not self.followers and not self.done:
+                self.task.cancel()
+
+
+class LLMRunner:
+    """Runs an ``AsyncLLMClient`` on a background event loop for synchronous callers."""
+
+    def __init__(self, client):
+        self.client = client
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name='llm-client', daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro, timeout=None):
+        """Run a coroutine on the client's loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop()).result(timeout)
+
+    def complete(self, messages, key=None, timeout=None):
+        return self.run(self.client.complete(messages, key=key), timeout)
+
+    def stream(self, messages, key=None):
+        """Yield the pieces of ``AsyncLLMClient.stream`` in the calling thread."""
+        pieces = queue.Queue()
+        done = object()
+
+        async def pump():
+            try:
+                async for piece in self.client.stream(messages, key=key):
+                    pieces.put(piece)
+            except Exception as e:
+                pieces.put(e)
+            finally:
+                pieces.put(done)
+
+        future = asyncio.run_coroutine_threadsafe(pump(), self._get_loop())
+        try:
+            while True:
+                item = pieces.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            # Stops the upstream call if the caller gave up early
+            future.cancel()
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.client.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
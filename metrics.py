@@ -0,0 +1,329 @@
+"""
+Lightweight counters and histograms exposed in the Prometheus text format.
+
+Metrics live in a process-wide ``REGISTRY`` and are rendered by the app's
+``/metrics`` endpoint. Set ``METRICS_ENABLED=0`` to switch them off: every
+``inc``/``observe`` then returns after a single attribute check and
+``stage()`` hands back a shared no-op context manager.
+
+Resume extraction runs in worker processes, whose metrics would never
+reach the endpoint. Jobs therefore take a ``snapshot()`` of the worker's
+registry before running and send ``changes_since(snapshot)`` back with
+their result, which the web process adds to its own registry with
+``merge()``.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+
+# Upper bounds in seconds; the fast end covers parsing and cache lookups
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_NULL_TIMER = nullcontext()
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Timer:
+    """Observes the time spent inside a ``with`` block."""
+
+    __slots__ = ('histogram', 'labels', 'started')
+
+    def __init__(self, histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+
+
+class Counter:
+    """Monotonically increasing count, one series per combination of label values."""
+
+    kind = 'counter'
+
+    def __init__(self, registry, name, documentation, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._values)
+
+    def changes_since(self, before):
+        return {labels: value - before.get(labels, 0)
+                for labels, value in self.snapshot().items() if value != before.get(labels, 0)}
+
+    def merge(self, changes):
+        with self._lock:
+            for labels, amount in changes.items():
+                labels = tuple(labels)
+                self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self):
+        for labels, value in sorted(self.snapshot().items()):
+            yield self.name + _format_labels(self.labelnames, labels), value
+
+
+class Histogram:
+    """Distribution of observed values in fixed buckets, with their sum and count."""
+
+    kind = 'histogram'
+
+    def __init__(self, registry, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [count per bucket..., count above the last bucket, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        if not self.registry.enabled:
+            return
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def time(self, *labels):
+        """Context manager that observes how long its block takes."""
+        if not self.registry.enabled:
+            return _NULL_TIMER
+        return _Timer(self, labels)
+
+    def count(self, *labels):
+        with self._lock:
+            series = self._series.get(labels)
+            return sum(series[:-1]) if series else 0
+
+    def snapshot(self):
+        with self._lock:
+            return {labels: list(series) for labels, series in self._series.items()}
+
+    def changes_since(self, before):
+        changes = {}
+        for labels, series in self.snapshot().items():
+            old = before.get(labels)
+            if old is not None:
+                series = [new - previous for new, previous in zip(series, old)]
+            if any(series[:-1]):
+                changes[labels] = series
+        return changes
+
+    def merge(self, changes):
+        with self._lock:
+            for labels, delta in changes.items():
+                labels = tuple(labels)
+                series = self._series.get(labels)
+                if series is None:
+                    series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+                for index, amount in enumerate(delta):
+                    series[index] += amount
+
+    def samples(self):
+        for labels, series in sorted(self.snapshot().items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), series[:-1]):
+                cumulative += count
+                le = 'le="' + _format_value(bound) + '"'
+                yield self.name + '_bucket' + _format_labels(self.labelnames, labels, le), cumulative
+            yield self.name + '_sum' + _format_labels(self.labelnames, labels), series[-1]
+            yield self.name + '_count' + _format_labels(self.labelnames, labels), cumulative
+
+
+class Registry:
+    """A named set of metrics that renders itself for Prometheus."""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram, name, documentation, labelnames, buckets)
+
+    def snapshot(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def changes_since(self, before):
+        """Return what every metric gained since ``before``, ready for ``merge``."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        changes = {}
+        for metric in metrics:
+            delta = metric.changes_since(before.get(metric.name, {}))
+            if delta:
+                changes[metric.name] = delta
+        return changes
+
+    def merge(self, changes):
+        """Add changes recorded in another process to this registry's metrics."""
+        for name, delta in changes.items():
+            metric = self._metrics.get(name)
+            if metric is not None:
+                metric.merge(delta)
+
+    def render(self):
+        """Return every metric in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for sample, value in metric.samples():
+                lines.append(f'{sample} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry(enabled=os.environ.get('METRICS_ENABLED', '1') == '1')
+
+REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds',
+    'Time from receiving a request to sending its response headers.',
+    ['method', 'route', 'status'])
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'pipeline_stage_seconds',
+    'Time spent in each resume extraction and career analysis stage.',
+    ['stage'])
+
+TEMPLATE_SECONDS = REGISTRY.histogram(
+    'template_render_seconds',
+    'Time spent rendering each Jinja template.',
+    ['template'])
+
+RESUME_UPLOADS = REGISTRY.counter(
+    'resume_uploads_total',
+    'Resumes uploaded, by file format.',
+    ['format'])
+
+EXTRACTION_FAILURES = REGISTRY.counter(
+    'resume_extraction_failures_total',
+    'Resumes whose text could not be fully extracted, by file format.',
+    ['format'])
+
+EXTRACTION_JOBS = REGISTRY.counter(
+    'resume_extraction_jobs_total',
+    'Finished background extraction jobs, by outcome.',
+    ['status'])
+
+CACHE_LOOKUPS = REGISTRY.counter(
+    'cache_lookups_total',
+    'Cache lookups, by cache and result.',
+    ['cache', 'result'])
+
+MODEL_BATCH_SIZE = REGISTRY.histogram(
+    'career_model_batch_size',
+    'Profiles scored per career model batch.',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256))
+
+
+def stage(name):
+    """Time a pipeline stage: ``with stage('parse'): ...``."""
+    if not REGISTRY.enabled:
+        return _NULL_TIMER
+    return _Timer(STAGE_SECONDS, (name,))
+
+
+def timed_iter(iterable, name):
+    """Yield from ``iterable`` and record the total time spent producing its items as stage ``name``.
+
+    Time the consumer spends between items is not counted.
+    """
+    iterator = iter(iterable)
+    elapsed = 0.0
+    try:
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                elapsed += time.perf_counter() - started
+            yield item
+    finally:
+        close = getattr(iterator, 'close', None)
+        if close is not None:
+            close()
+        STAGE_SECONDS.observe(elapsed, name)
+
+
+# Set by the app on each request so timings are grouped by URL rule, not raw path
+ROUTE_ENVIRON_KEY = 'metrics.route'
+
+
+class RequestMetricsMiddleware:
+    """WSGI middleware timing every request up to its response headers."""
+
+    def __init__(self, wsgi_app, registry=REGISTRY):
+        self.wsgi_app = wsgi_app
+        self.registry = registry
+
+    def __call__(self, environ, start_response):
+        if not self.registry.enabled:
+            return self.wsgi_app(environ, start_response)
+        started = time.perf_counter()
+
+        def timed_start_response(status, headers, exc_info=None):
+            REQUEST_SECONDS.observe(time.perf_counter() - started, environ.get('REQUEST_METHOD', ''),
+                                    environ.get(ROUTE_ENVIRON_KEY, 'unmatched'), status.split(' ', 1)[0])
+            return start_response(status, headers, exc_info)
+
+        return self.wsgi_app(environ, timed_start_response)
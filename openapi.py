@@ -1,28 +1,49 @@
 import os
-from dotenv import load_dotenv
-from azure.ai.inference import ChatCompletionsClient
-from azure.ai.inference.models import SystemMessage, UserMessage
-from azure.core.credentials import AzureKeyCredential
-from azure.core.exceptions import AzureError
+import re
+import json
+import hashlib
 from typing import List, Dict, Any, Optional
-from flask import Flask, request, jsonify
-
-# Load environment variables from .env file
-load_dotenv()
+from guidance_cache import GuidanceCache, cache_key, match_band, skill_bucket
+from career_scoring import normalize_skill
 
 # Configuration
-endpoint = "https://models.github.ai/inference"
+DEFAULT_AI_ENDPOINT = "https://models.github.ai/inference"
 model = "deepseek/DeepSeek-V3-0324"
 
-# Get token from environment variables
-token = os.getenv("GITHUB_PAT")
-if not token:
-    # Allow deployment to proceed with warning
-    print("Warning: GITHUB_PAT environment variable is not set. AI features may not work properly.")
-    token = "placeholder_token"
+# Set by load_environment(), which the first AI client and create_app() call
+endpoint = None
+token = None
+
+def load_environment():
+    """Load .env once and read the AI endpoint and token from the environment.
+
+    Runs on first use rather than at import, so importing this module (and
+    the app) does not touch the filesystem looking for a .env file.
+    """
+    global endpoint, token
+    if token is not None:
+        return
+    from dotenv import load_dotenv
 
-def get_ai_client() -> ChatCompletionsClient:
+    load_dotenv()
+    endpoint = os.getenv("AI_ENDPOINT", DEFAULT_AI_ENDPOINT)
+    # Get token from environment variables
+    pat = os.getenv("GITHUB_PAT")
+    if not pat:
+        # Allow deployment to proceed with warning
+        print("Warning: GITHUB_PAT environment variable is not set. AI features may not work properly.")
+        pat = "placeholder_token"
+    token = pat
+
+# The Azure SDK, aiohttp and the LLM client are imported on first use only,
+# so importing this module (and the app) stays fast
+
+def get_ai_client() -> "ChatCompletionsClient":
     """Initialize and return the Azure AI client."""
+    from azure.ai.inference import ChatCompletionsClient
+    from azure.core.credentials import AzureKeyCredential
+
+    load_environment()
     try:
         return ChatCompletionsClient(
             endpoint=endpoint,
@@ -31,6 +52,50 @@ def get_ai_client() -> ChatCompletionsClient:
     except Exception as e:
         raise Exception(f"Failed to initialize AI client: {str(e)}")
 
+# Limits for the shared async client used by AI guidance
+AI_MAX_CONCURRENCY = int(os.getenv("AI_MAX_CONCURRENCY", 8))
+AI_TIMEOUT = float(os.getenv("AI_TIMEOUT", 30))
+AI_MAX_RETRIES = int(os.getenv("AI_MAX_RETRIES", 3))
+
+_guidance_llm = None
+
+def get_guidance_llm() -> "LLMRunner":
+    """Return the process-wide AI guidance client, creating it on first use."""
+    global _guidance_llm
+    if _guidance_llm is None:
+        from llm_client import AsyncLLMClient, LLMRunner
+
+        load_environment()
+        _guidance_llm = LLMRunner(AsyncLLMClient(
+            endpoint, model, token,
+            max_concurrency=AI_MAX_CONCURRENCY,
+            timeout=AI_TIMEOUT,
+            max_retries=AI_MAX_RETRIES
+        ))
+    return _guidance_llm
+
+# Cache of model answers shared by users with similar profiles
+AI_GUIDANCE_CACHE = os.getenv("AI_GUIDANCE_CACHE", os.path.join("guidance_cache", "guidance.db"))
+AI_GUIDANCE_CACHE_TTL = int(os.getenv("AI_GUIDANCE_CACHE_TTL", 7 * 24 * 3600))
+AI_GUIDANCE_CACHE_MAX_ENTRIES = int(os.getenv("AI_GUIDANCE_CACHE_MAX_ENTRIES", 5000))
+AI_GUIDANCE_CACHE_MAX_BYTES = int(os.getenv("AI_GUIDANCE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+AI_GUIDANCE_SIMILARITY = float(os.getenv("AI_GUIDANCE_SIMILARITY", 0.8))
+
+_guidance_cache = None
+
+def get_guidance_cache() -> GuidanceCache:
+    """Return the AI guidance response cache, opening it on first use."""
+    global _guidance_cache
+    if _guidance_cache is None:
+        _guidance_cache = GuidanceCache(
+            AI_GUIDANCE_CACHE,
+            ttl=AI_GUIDANCE_CACHE_TTL,
+            max_entries=AI_GUIDANCE_CACHE_MAX_ENTRIES,
+            max_bytes=AI_GUIDANCE_CACHE_MAX_BYTES,
+            threshold=AI_GUIDANCE_SIMILARITY
+        )
+    return _guidance_cache
+
 # Career-specific learning paths and guidance
 CAREER_GUIDANCE = {
     'Software Engineer': {
@@ -127,6 +192,33 @@ CAREER_GUIDANCE = {
     }
 }
 
+# The static part of each career's guidance, built once at import
+GUIDANCE_SECTIONS = {
+    title: {
+        'overview': info['overview'],
+        'skills': info['skills_needed'],
+        'learning_path': info['learning_path'],
+        'resources': info['resources']
+    }
+    for title, info in CAREER_GUIDANCE.items()
+}
+
+def career_slug(title: str) -> str:
+    """URL-style slug of a career title: "Data Scientist" -> "data-scientist"."""
+    return re.sub(r'[^a-z0-9]+', '-', title.lower()).strip('-')
+
+# Slug -> CAREER_GUIDANCE key, so lookups ignore case, spacing and dashes
+CAREER_KEY_INDEX = {career_slug(title): title for title in CAREER_GUIDANCE}
+
+def find_career_key(title: str) -> Optional[str]:
+    """Return the CAREER_GUIDANCE key for a title or slug, or None if there is none."""
+    return CAREER_KEY_INDEX.get(career_slug(title.replace('%20', ' ')))
+
+# Changes whenever any guidance text does; used to build HTTP cache validators
+GUIDANCE_VERSION = hashlib.sha256(
+    json.dumps(CAREER_GUIDANCE, sort_keys=True).encode('utf-8')
+).hexdigest()[:16]
+
 def generate_career_guidance(career_title: str, match_percentage: int, growth: str, user_skills: Dict[str, Any]) -> Dict[str, Any]:
     """
     Generate comprehensive career guidance with learning path.
@@ -140,29 +232,168 @@ def generate_career_guidance(career_title: str, match_percentage: int, growth: s
     Returns:
         Dictionary containing structured guidance and learning path
     """
-    import time
-    
-    # Small delay for better UX
-    time.sleep(0.3)
-    
     # Get career guidance or default
-    career_info = CAREER_GUIDANCE.get(career_title, CAREER_GUIDANCE['default'])
+    sections = GUIDANCE_SECTIONS.get(career_title, GUIDANCE_SECTIONS['default'])
     
     # Return structured data instead of HTML
-    return {
+    guidance = {
         'title': career_title,
         'match': match_percentage,
-        'growth': growth,
-        'overview': career_info['overview'],
-        'skills': career_info['skills_needed'],
-        'learning_path': career_info['learning_path'],
-        'resources': career_info['resources']
+        'growth': growth
     }
+    guidance.update(sections)
+    return guidance
+
+GUIDANCE_PROMPT = (
+    "You are a career coach. The user matches the career \"{title}\" at about {band}-{band_end}% "
+    "and already knows: {skills}. Reply with only a JSON object with the keys "
+    "\"overview\" (one or two sentences), \"skills\" (five key skills they still need), "
+    "\"learning_path\" (five ordered steps) and \"resources\" (four learning resources)."
+)
+
+def profile_skills(user_skills: Dict[str, Any]) -> List[str]:
+    """Return the user's normalized technical and soft skills."""
+    skills = []
+    for field in ('technical_skills', 'soft_skills'):
+        values = user_skills.get(field) if isinstance(user_skills, dict) else None
+        if isinstance(values, list):
+            skills.extend(normalize_skill(skill) for skill in values if isinstance(skill, str))
+    return skill_bucket(skills)
 
-app = Flask(__name__)
+def guidance_messages(career_title: str, skills: List[str], band: int) -> List[Any]:
+    # Only the cache inputs go into the prompt, so a cached answer fits every user it is served to
+    from azure.ai.inference.models import SystemMessage, UserMessage
+
+    prompt = GUIDANCE_PROMPT.format(title=career_title, band=band, band_end=band + 9,
+                                    skills=', '.join(skills) or 'nothing relevant yet')
+    return [
+        SystemMessage(content="You give concise, practical career guidance."),
+        UserMessage(content=prompt)
+    ]
+
+GUIDANCE_SECTION_NAMES = ('overview', 'skills', 'learning_path', 'resources')
+
+def valid_section(name: str, value: Any) -> bool:
+    if name == 'overview':
+        return isinstance(value, str)
+    return isinstance(value, list) and all(isinstance(item, str) for item in value)
+
+def parse_guidance_reply(reply: str) -> Optional[Dict[str, Any]]:
+    """Return the guidance sections from a model reply, or None if it is unusable."""
+    start, end = reply.find('{'), reply.rfind('}')
+    if start == -1 or end < start:
+        return None
+    try:
+        data = json.loads(reply[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    sections = {name: data.get(name) for name in GUIDANCE_SECTION_NAMES}
+    if not all(valid_section(name, value) for name, value in sections.items()):
+        return None
+    return sections
+
+class SectionStreamParser:
+    """Pulls top-level ``"name": value`` pairs out of a JSON reply while it streams in."""
+
+    def __init__(self, names):
+        self.buffer = ''
+        self.pending = {name: re.compile(r'"%s"\s*:\s*' % re.escape(name)) for name in names}
+        self.decoder = json.JSONDecoder()
+
+    def feed(self, text: str) -> List[Any]:
+        """Add reply text and return the ``(name, value)`` pairs it completed."""
+        self.buffer += text
+        found = []
+        for name, pattern in list(self.pending.items()):
+            match = pattern.search(self.buffer)
+            if not match:
+                continue
+            try:
+                value, _ = self.decoder.raw_decode(self.buffer, match.end())
+            except ValueError:
+                continue  # The value has not finished streaming yet
+            del self.pending[name]
+            found.append((name, value))
+        return found
+
+def iter_career_guidance_sections(career_title: str, match_percentage: int, user_skills: Dict[str, Any], use_ai: bool = True):
+    """
+    Yield ``(section, value)`` pairs of the guidance as each becomes available.
+    
+    Static and cached guidance come out at once. A fresh model answer is
+    parsed while it streams, so each section is sent as soon as the model
+    has finished writing it. Sections the model leaves out or gets wrong
+    fall back to the static guidance. Concurrent misses for the same
+    profile follow one model call, shared with ``generate_ai_career_guidance``.
+    """
+    static = GUIDANCE_SECTIONS.get(career_title, GUIDANCE_SECTIONS['default'])
+    if not use_ai:
+        yield from static.items()
+        return
+
+    skills = profile_skills(user_skills)
+    cache = get_guidance_cache()
+    sections, tier = cache.get(career_title, skills, match_percentage)
+    if sections is not None:
+        for name in GUIDANCE_SECTION_NAMES:
+            yield name, sections[name]
+        return
+
+    from llm_client import LLMError
+
+    band = match_band(match_percentage)
+    parser = SectionStreamParser(GUIDANCE_SECTION_NAMES)
+    sent = {}
+    try:
+        for piece in get_guidance_llm().stream(guidance_messages(career_title, skills, band),
+                                               key=cache_key(career_title, skills, band)):
+            for name, value in parser.feed(piece):
+                if valid_section(name, value):
+                    sent[name] = value
+                    yield name, value
+    except LLMError as e:
+        print(f"AI guidance failed: {str(e)}")
+    for name in GUIDANCE_SECTION_NAMES:
+        if name not in sent:
+            yield name, static[name]
+    if len(sent) == len(GUIDANCE_SECTION_NAMES):
+        cache.put(career_title, skills, match_percentage, sent)
+
+def generate_ai_career_guidance(career_title: str, match_percentage: int, growth: str, user_skills: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate career guidance with the AI model, falling back to the static guidance.
+    
+    Answers are cached by career, normalized skills and match band, and
+    reused for users whose skills are close enough to a cached profile.
+    Concurrent misses for the same profile share one model call, also with
+    the streaming path in ``iter_career_guidance_sections``.
+    """
+    guidance = generate_career_guidance(career_title, match_percentage, growth, user_skills)
+    skills = profile_skills(user_skills)
+    cache = get_guidance_cache()
+    sections, tier = cache.get(career_title, skills, match_percentage)
+    if sections is None:
+        from llm_client import LLMError
+
+        band = match_band(match_percentage)
+        try:
+            reply = get_guidance_llm().complete(guidance_messages(career_title, skills, band),
+                                                key=cache_key(career_title, skills, band))
+        except LLMError as e:
+            print(f"AI guidance failed: {str(e)}")
+            return guidance
+        sections = parse_guidance_reply(reply)
+        if sections:
+            cache.put(career_title, skills, match_percentage, sections)
+    if sections:
+        guidance.update(sections)
+    return guidance
 
-@app.route('/api/guidance', methods=['POST'])
 def api_guidance():
+    from flask import request, jsonify
+
     data = request.get_json()
     career_title = data.get('title')
     match_percentage = data.get('match')
@@ -178,6 +409,15 @@ def api_guidance():
     )
     return jsonify(guidance)
 
+def create_app():
+    """Build a standalone Flask app serving only the guidance API."""
+    from flask import Flask
+
+    load_environment()
+    app = Flask(__name__)
+    app.add_url_rule('/api/guidance', view_func=api_guidance, methods=['POST'])
+    return app
+
 def main():
     """Example usage of the career guidance generator."""
     # Example data - this would come from your application
@@ -216,4 +456,4 @@ def main():
         print("="*50)
 
 if __name__ == "__main__":
-    app.run(debug=True)
+    create_app().run(debug=True)
@@ -0,0 +1,131 @@
+"""
+Content-addressed cache for extracted resume text and parsed fields.
+
+Entries are keyed by the SHA-256 of the uploaded bytes plus the extractor
+version, so re-uploading the same resume skips extraction entirely. Each
+entry is a small JSON file; the least recently used entries are evicted
+once the cache grows past its entry or byte limit.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from metrics import CACHE_LOOKUPS
+from resume_parser import EXTRACTOR_VERSION
+
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResumeCache:
+    """On-disk LRU cache of ``{'text', 'info'}`` records."""
+
+    def __init__(self, cache_dir, max_entries=1000, max_bytes=64 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def __getstate__(self):
+        # Instances are sent to extraction workers, which cannot pickle the lock
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def key_for_file(self, file_path):
+        return self.key_for_digest(hash_file(file_path))
+
+    def key_for_digest(self, sha256):
+        """Key for a file whose SHA-256 is already known, e.g. hashed while it was uploaded."""
+        return f"{sha256}-v{EXTRACTOR_VERSION}"
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.json')
+
+    def get(self, key):
+        """Return the cached record for ``key`` or None, counting hits and misses."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            # Touch the entry so eviction treats it as recently used
+            os.utime(path, None)
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            CACHE_LOOKUPS.inc('resume', 'miss')
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self.saved_seconds += record.get('extract_seconds', 0.0)
+        CACHE_LOOKUPS.inc('resume', 'hit')
+        return record
+
+    def put(self, key, text, info, extract_seconds=0.0):
+        """Store a record atomically, then evict old entries if over the limits."""
+        record = {'text': text, 'info': info, 'extract_seconds': extract_seconds}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until within max_entries and max_bytes."""
+        entries = []
+        total_bytes = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith('.json'):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_bytes += stat.st_size
+
+        entries.sort()
+        removed = 0
+        while entries and (len(entries) > self.max_entries or total_bytes > self.max_bytes):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_bytes -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'saved_seconds': round(self.saved_seconds, 3)
+            }
@@ -0,0 +1,203 @@
+"""
+Background resume extraction queue.
+
+Uploads hand the resume, as bytes or the path of a spilled upload, to a
+small process pool instead of parsing it inside the request. Each submission gets a job ID that the client can poll
+until the parsed fields are ready.
+"""
+
+import os
+import signal
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from metrics import REGISTRY, EXTRACTION_JOBS, stage
+from resume_parser import extract_resume, init_extraction_worker
+
+
+class QueueFullError(Exception):
+    """Raised when too many extraction jobs are already waiting."""
+
+
+class ExtractionTimeout(BaseException):
+    """Raised inside a worker when a job runs past its time limit.
+
+    Derives from BaseException so the broad ``except Exception`` blocks in the
+    extractors cannot swallow it and keep a stuck worker busy.
+    """
+
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+
+@contextmanager
+def time_limit(seconds):
+    """Raise ExtractionTimeout in the current process after ``seconds``.
+
+    Uses SIGALRM, so it only applies on Unix and in the main thread, which
+    is where pool workers run their jobs.
+    """
+    use_alarm = seconds and hasattr(signal, 'SIGALRM')
+    if use_alarm:
+        previous = signal.signal(signal.SIGALRM, _raise_timeout)
+        signal.alarm(int(seconds))
+    try:
+        yield
+    finally:
+        if use_alarm:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous)
+
+
+def run_extraction_job(source, cache=None, cache_key=None, timeout=None, file_format=None,
+                       remove_source=False):
+    """Extract and parse one resume, giving up after ``timeout`` seconds.
+
+    ``source`` is a file path or the resume's bytes. When a cache and key
+    are given the text and parsed fields are stored so the next upload of
+    the same file skips extraction. ``remove_source`` deletes the file at
+    ``source`` afterwards, for spilled uploads the job was handed.
+    """
+    try:
+        with time_limit(timeout), stage('extract'):
+            started = time.perf_counter()
+            text, info = extract_resume(source, file_format)
+            if cache is not None and cache_key:
+                try:
+                    cache.put(cache_key, text, info, time.perf_counter() - started)
+                except OSError as e:
+                    print(f"Error caching resume result for {cache_key}: {str(e)}")
+            return info
+    finally:
+        if remove_source:
+            try:
+                os.remove(source)
+            except OSError:
+                pass
+
+
+def run_instrumented(job_func, *args, **kwargs):
+    """Run ``job_func`` in a worker and return ``(result, metric changes)``.
+
+    The changes are what the job added to the worker's metrics; the queue
+    merges them into the web process so ``/metrics`` covers extraction.
+    """
+    if not REGISTRY.enabled:
+        return job_func(*args, **kwargs), {}
+    before = REGISTRY.snapshot()
+    result = job_func(*args, **kwargs)
+    return result, REGISTRY.changes_since(before)
+
+
+class ResumeJobQueue:
+    """Bounded process-pool queue with an in-memory result store."""
+
+    def __init__(self, max_workers=2, max_pending=32, job_timeout=30,
+                 result_ttl=600, job_func=run_extraction_job):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.job_timeout = job_timeout
+        self.result_ttl = result_ttl
+        self.job_func = job_func
+        self._executor = None
+        self._jobs = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Created on first use so importing the app never forks workers. Workers
+        # import the extractor backends as they start, not on their first job
+        with self._lock:
+            if self._executor is None:
+                from concurrent.futures import ProcessPoolExecutor
+
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                     initializer=init_extraction_worker)
+            return self._executor
+
+    def _discard_executor(self, executor):
+        """Drop a broken pool so the next submit starts a fresh one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, *args, **kwargs):
+        """Queue a job and return its ID, or raise QueueFullError."""
+        with self._lock:
+            self._prune()
+            if self._pending >= self.max_pending:
+                raise QueueFullError('Resume extraction queue is full')
+            self._pending += 1
+            job_id = str(uuid.uuid4())
+            self._jobs[job_id] = {
+                'status': 'pending',
+                'result': None,
+                'error': None,
+                'submitted_at': time.time(),
+                'finished_at': None,
+            }
+
+        try:
+            executor = self._get_executor()
+            from concurrent.futures.process import BrokenProcessPool
+
+            try:
+                future = executor.submit(run_instrumented, self.job_func, *args,
+                                         timeout=self.job_timeout, **kwargs)
+            except BrokenProcessPool:
+                # A worker died (killed, out of memory); retry once on a new pool
+                self._discard_executor(executor)
+                future = self._get_executor().submit(run_instrumented, self.job_func, *args,
+                                                     timeout=self.job_timeout, **kwargs)
+        except Exception:
+            with self._lock:
+                self._pending -= 1
+                del self._jobs[job_id]
+            raise
+        future.add_done_callback(lambda f, job_id=job_id: self._finish(job_id, f))
+        return job_id
+
+    def _finish(self, job_id, future):
+        try:
+            result, changes = future.result()
+            REGISTRY.merge(changes)
+            status, error = 'done', None
+        except ExtractionTimeout:
+            result, status, error = None, 'timeout', 'Extraction timed out'
+        except BaseException as e:
+            result, status, error = None, 'failed', str(e)
+
+        EXTRACTION_JOBS.inc(status)
+        with self._lock:
+            self._pending -= 1
+            job = self._jobs.get(job_id)
+            if job is not None:
+                job.update(status=status, result=result, error=error,
+                           finished_at=time.time())
+
+    def _prune(self):
+        """Drop finished jobs older than result_ttl. Caller holds the lock."""
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job['finished_at'] is not None and job['finished_at'] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def status(self, job_id):
+        """Return a copy of the job record, or None if it is unknown."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def pending_count(self):
+        with self._lock:
+            return self._pending
+
+    def shutdown(self, wait=True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
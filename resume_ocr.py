@@ -0,0 +1,170 @@
+"""
+OCR stage for image resumes and scanned PDFs.
+
+Images are converted to grayscale, scaled to roughly 300 DPI for a
+letter-size page and binarized before tesseract sees them. PDF pages with
+no text layer are rasterized and OCRed a few at a time in a bounded process
+pool, each page with its own time limit. Inside extraction workers, which
+already run one document per core, pages are OCRed inline instead.
+"""
+
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from PIL import Image, ImageOps
+import pytesseract
+
+from metrics import stage
+from resume_parser import page_pool_allowed
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# Render scanned PDF pages at the resolution tesseract is tuned for
+OCR_PDF_DPI = 300
+
+# Longest side of a letter-size page at 300 DPI; larger photos are scaled down
+OCR_MAX_SIDE = 3300
+
+# Small images are scaled up so characters are tall enough to recognise
+OCR_MIN_SIDE = 1000
+
+OCR_WORKERS = int(os.environ.get('RESUME_OCR_WORKERS', min(4, os.cpu_count() or 1)))
+OCR_PAGE_TIMEOUT = int(os.environ.get('RESUME_OCR_PAGE_TIMEOUT', 20))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=OCR_WORKERS)
+        return _pool
+
+def otsu_threshold(histogram):
+    """Return the grey level that best separates a 256-bin histogram into two classes."""
+    total = sum(histogram)
+    if not total:
+        return 128
+    weighted_total = sum(level * count for level, count in enumerate(histogram))
+
+    background = 0
+    background_sum = 0
+    best_level, best_variance = 0, -1.0
+    for level, count in enumerate(histogram):
+        background += count
+        if background == 0:
+            continue
+        foreground = total - background
+        if foreground == 0:
+            break
+        background_sum += level * count
+        background_mean = background_sum / background
+        foreground_mean = (weighted_total - background_sum) / foreground
+        variance = background * foreground * (background_mean - foreground_mean) ** 2
+        if variance > best_variance:
+            best_level, best_variance = level, variance
+    return best_level
+
+def preprocess_image(image):
+    """Return a resized, binarized copy of ``image`` ready for tesseract."""
+    image = ImageOps.exif_transpose(image)
+    image = image.convert('L')
+
+    longest = max(image.size)
+    if longest > OCR_MAX_SIDE:
+        image.thumbnail((OCR_MAX_SIDE, OCR_MAX_SIDE), Image.LANCZOS)
+    elif 0 < longest < OCR_MIN_SIDE:
+        scale = OCR_MIN_SIDE / longest
+        image = image.resize((round(image.width * scale), round(image.height * scale)), Image.LANCZOS)
+
+    image = ImageOps.autocontrast(image)
+    threshold = otsu_threshold(image.histogram())
+    return image.point(lambda level: 255 if level > threshold else 0, mode='1')
+
+def ocr_image(image, timeout=None):
+    """OCR a PIL image, returning '' if tesseract fails or runs too long."""
+    if timeout is None:
+        timeout = OCR_PAGE_TIMEOUT
+    try:
+        return pytesseract.image_to_string(preprocess_image(image), timeout=timeout)
+    except (RuntimeError, pytesseract.TesseractError, pytesseract.TesseractNotFoundError) as e:
+        print(f"OCR failed: {str(e)}")
+        return ''
+
+def ocr_pdf_page(source, index, timeout=None):
+    """Rasterize one PDF page, from a path or the PDF's bytes, and OCR it."""
+    if pdfium is None:
+        return ''
+    pdf = pdfium.PdfDocument(source)
+    try:
+        page = pdf[index]
+        bitmap = page.render(scale=OCR_PDF_DPI / 72, grayscale=True)
+        image = bitmap.to_pil()
+        page.close()
+    finally:
+        pdf.close()
+    return ocr_image(image, timeout)
+
+def ocr_pdf_pages(source, indexes, timeout=None):
+    """OCR several PDF pages concurrently and return ``{index: text}``."""
+    if timeout is None:
+        timeout = OCR_PAGE_TIMEOUT
+    with stage('ocr'):
+        if len(indexes) == 1 or OCR_WORKERS < 2 or not page_pool_allowed():
+            return {index: ocr_pdf_page(source, index, timeout) for index in indexes}
+
+        temp_path = None
+        futures = {}
+        try:
+            if not isinstance(source, str):
+                # Every task opens the document, so hand them a path rather than a copy of the bytes each
+                fd, temp_path = tempfile.mkstemp(suffix='.pdf')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(source)
+                source = temp_path
+            pool = _get_pool()
+            futures = {index: pool.submit(ocr_pdf_page, source, index, timeout) for index in indexes}
+            results = {}
+            for index, future in futures.items():
+                try:
+                    # Tesseract enforces the limit itself; the slack covers rasterizing
+                    results[index] = future.result(timeout=timeout + 10)
+                except FutureTimeoutError:
+                    results[index] = ''
+            return results
+        finally:
+            for future in futures.values():
+                future.cancel()
+            if temp_path:
+                os.remove(temp_path)
+
+def fill_blank_pages(source, pages, window=None):
+    """Yield page texts in order, OCRing pages whose text layer is empty.
+
+    Pages are read ``window`` at a time so blank pages in the same window
+    are OCRed in parallel while text pages pass straight through.
+    """
+    if window is None:
+        window = max(1, OCR_WORKERS)
+    batch = []
+    start = 0
+    for text in pages:
+        batch.append(text)
+        if len(batch) >= window:
+            yield from _fill_batch(source, start, batch)
+            start += len(batch)
+            batch = []
+    if batch:
+        yield from _fill_batch(source, start, batch)
+
+def _fill_batch(source, start, batch):
+    blank = [start + offset for offset, text in enumerate(batch) if not text.strip()]
+    ocr_text = ocr_pdf_pages(source, blank) if blank else {}
+    for offset, text in enumerate(batch):
+        yield ocr_text.get(start + offset, text)
@@ -0,0 +1,466 @@
+"""
+Resume text extraction and field parsing.
+
+PDFs are read page by page through ``iter_pdf_pages`` so callers can stop as
+soon as they have what they need.
+
+A resume source is either a file path or the uploaded bytes themselves.
+In-memory uploads are handed to pdfium as-is and to the other backends
+wrapped in a BytesIO, which shares the bytes instead of copying them. The
+format comes from the path's extension unless it is passed explicitly.
+
+Each file format has an extractor in ``EXTRACTORS``, registered with
+``register_extractor``. Extractors import their backend (pdfplumber,
+python-docx, Pillow, tesseract) on first use, so importing this module, and
+the app, stays cheap; ``init_extraction_worker`` imports them all up front
+in worker processes.
+
+Kept separate from app.py so the background extraction workers can import
+it without building the Flask app.
+"""
+
+import importlib
+import io
+import os
+import re
+import tempfile
+import threading
+
+from career_scoring import extract_skills
+from metrics import stage, timed_iter, EXTRACTION_FAILURES
+
+# Bump whenever extraction or parsing output changes so cached results are not reused
+EXTRACTOR_VERSION = 5
+
+# Resumes rarely run past a few pages; anything longer is truncated
+PDF_PAGE_CAP = int(os.environ.get('RESUME_PDF_PAGE_CAP', 20))
+
+# Documents with at least this many pages are split across a process pool
+PDF_PARALLEL_THRESHOLD = 8
+PDF_PARALLEL_WORKERS = min(4, os.cpu_count() or 1)
+PDF_PAGES_PER_TASK = 4
+
+# Pool the long documents are split across, created on first use. Processes
+# that are themselves extraction pool workers never create one
+_page_pool = None
+_page_pool_allowed = True
+_page_pool_lock = threading.Lock()
+
+def _pdfium():
+    """Return pypdfium2, or None if it is missing."""
+    try:
+        import pypdfium2
+    except ImportError:  # pdfplumber normally installs it, but stay usable without it
+        return None
+    return pypdfium2
+
+def _as_file(source):
+    """Return something the backends can open: the path, or a file object over the bytes."""
+    return source if isinstance(source, str) else io.BytesIO(source)
+
+def _source_format(source, file_format=None):
+    if file_format:
+        return file_format.lower()
+    return source.lower().split('.')[-1] if isinstance(source, str) else ''
+
+def _describe(source):
+    return source if isinstance(source, str) else f'uploaded file ({len(source)} bytes)'
+
+def _clean_page_text(text):
+    """Normalise line endings and trailing spaces from the PDF text layer."""
+    return '\n'.join(line.rstrip() for line in text.splitlines())
+
+def _iter_pdf_page_range(source, start, stop, fast=True):
+    """Yield the text of pages [start, stop), opening the document once."""
+    pdfium = _pdfium() if fast else None
+    if pdfium is not None:
+        # Read the text layer directly, skipping pdfplumber's layout analysis
+        try:
+            pdf = pdfium.PdfDocument(source)
+        except pdfium.PdfiumError:
+            pdf = None  # Let pdfplumber have a go at damaged files
+        if pdf is not None:
+            try:
+                for index in range(start, min(stop, len(pdf))):
+                    page = pdf[index]
+                    textpage = page.get_textpage()
+                    text = _clean_page_text(textpage.get_text_range())
+                    textpage.close()
+                    page.close()
+                    yield text
+                return
+            finally:
+                pdf.close()
+
+    import pdfplumber
+    with pdfplumber.open(_as_file(source)) as pdf:
+        for page in pdf.pages[start:stop]:
+            yield page.extract_text() or ''
+
+def _extract_pdf_page_range(source, start, stop, fast=True):
+    """Return the text of pages [start, stop) as a list of strings."""
+    return list(_iter_pdf_page_range(source, start, stop, fast))
+
+def _count_pdf_pages(source):
+    pdfium = _pdfium()
+    if pdfium is not None:
+        try:
+            pdf = pdfium.PdfDocument(source)
+        except pdfium.PdfiumError:
+            pdf = None
+        if pdf is not None:
+            try:
+                return len(pdf)
+            finally:
+                pdf.close()
+    import pdfplumber
+    with pdfplumber.open(_as_file(source)) as pdf:
+        return len(pdf.pages)
+
+def _get_page_pool():
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+
+            _page_pool = ProcessPoolExecutor(max_workers=PDF_PARALLEL_WORKERS)
+        return _page_pool
+
+def init_extraction_worker():
+    """Pool initializer for processes that run whole extractions.
+
+    Imports every extractor backend up front, and reads PDFs in the worker
+    itself: the pool already runs a document per core, so a page pool
+    inside each worker would only oversubscribe the CPUs.
+    """
+    global _page_pool_allowed
+    _page_pool_allowed = False
+    preload_extractors()
+
+def page_pool_allowed():
+    """False inside extraction workers, which read each document in-process."""
+    return _page_pool_allowed
+
+def iter_pdf_pages(source, max_pages=None, fast=True):
+    """Yield the text of each PDF page in order, up to ``max_pages``.
+
+    Pages are read from one open document. Outside extraction workers,
+    long documents are instead fanned out across a shared process pool a
+    few pages per task. Closing the generator early cancels the pages not
+    yet started.
+    """
+    if max_pages is None:
+        max_pages = PDF_PAGE_CAP
+    if _page_pool_allowed and PDF_PARALLEL_WORKERS >= 2:
+        page_count = min(_count_pdf_pages(source), max_pages)
+        if page_count >= PDF_PARALLEL_THRESHOLD:
+            yield from _iter_pdf_pages_parallel(source, page_count, fast)
+            return
+    yield from _iter_pdf_page_range(source, 0, max_pages, fast)
+
+def _iter_pdf_pages_parallel(source, page_count, fast):
+    temp_path = None
+    futures = []
+    try:
+        if not isinstance(source, str):
+            # Every task opens the document, so hand them a path rather than a copy of the bytes each
+            fd, temp_path = tempfile.mkstemp(suffix='.pdf')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(source)
+            source = temp_path
+        pool = _get_page_pool()
+        futures = [
+            pool.submit(_extract_pdf_page_range, source, start,
+                        min(start + PDF_PAGES_PER_TASK, page_count), fast)
+            for start in range(0, page_count, PDF_PAGES_PER_TASK)
+        ]
+        for future in futures:
+            yield from future.result()
+    finally:
+        for future in futures:
+            future.cancel()
+        if temp_path:
+            os.remove(temp_path)
+
+# File extension -> function yielding the text of a file in chunks
+EXTRACTORS = {}
+
+# Modules each extractor needs, imported by preload_extractors
+EXTRACTOR_BACKENDS = {}
+
+def register_extractor(extensions, backends=()):
+    """Register the decorated function as the text extractor for ``extensions``."""
+    def decorator(func):
+        for extension in extensions:
+            EXTRACTORS[extension] = func
+            EXTRACTOR_BACKENDS[extension] = tuple(backends)
+        return func
+    return decorator
+
+@register_extractor(['pdf'], backends=['pypdfium2', 'pdfplumber', 'resume_ocr'])
+def _iter_pdf_text(source):
+    from resume_ocr import fill_blank_pages
+
+    # Scanned pages have no text layer and go through OCR instead
+    yield from fill_blank_pages(source, iter_pdf_pages(source))
+
+@register_extractor(['doc', 'docx'], backends=['docx'])
+def _iter_docx_text(source):
+    from docx import Document
+
+    doc = Document(_as_file(source))
+    yield '\n'.join(paragraph.text for paragraph in doc.paragraphs) + '\n'
+
+@register_extractor(['png', 'jpg', 'jpeg', 'gif'], backends=['PIL.Image', 'resume_ocr'])
+def _iter_image_text(source):
+    from PIL import Image
+    from resume_ocr import ocr_image
+
+    with Image.open(_as_file(source)) as image, stage('ocr'):
+        text = ocr_image(image)
+    yield text
+
+@register_extractor(['txt'])
+def _iter_plain_text(source):
+    if not isinstance(source, str):
+        yield bytes(source).decode('utf-8')
+        return
+    with open(source, 'r', encoding='utf-8') as f:
+        yield f.read()
+
+# File extensions the extractors understand
+SUPPORTED_EXTENSIONS = set(EXTRACTORS)
+
+def preload_extractors():
+    """Import every extractor backend now, e.g. when a worker process starts."""
+    for backends in EXTRACTOR_BACKENDS.values():
+        for name in backends:
+            try:
+                importlib.import_module(name)
+            except ImportError:
+                pass  # Reported when a file of that format is extracted
+
+def iter_text_from_file(source, file_format=None):
+    """Yield the text of a resume in chunks (one per PDF page)."""
+    extractor = EXTRACTORS.get(_source_format(source, file_format))
+    if extractor is not None:
+        yield from extractor(source)
+
+def extract_text_from_file(source, file_format=None):
+    """Extract text from various file formats"""
+    chunks = []
+    try:
+        for chunk in iter_text_from_file(source, file_format):
+            if chunk:
+                chunks.append(chunk if chunk.endswith('\n') else chunk + '\n')
+    except Exception as e:
+        EXTRACTION_FAILURES.inc(_source_format(source, file_format))
+        print(f"Error extracting text from {_describe(source)}: {str(e)}")
+    
+    return ''.join(chunks)
+
+# Fields that must be filled before extraction can stop early. Many resumes
+# have no LinkedIn URL, so waiting for one would mean reading every page
+REQUIRED_FIELDS = ('name', 'email', 'phone', 'college', 'degree')
+INFO_FIELDS = REQUIRED_FIELDS + ('linkedin',)
+
+def extract_resume(source, file_format=None):
+    """Extract text and parse fields, stopping once every field is filled.
+
+    Returns ``(text, info)`` where ``text`` covers only the pages read and
+    ``info['skills']`` lists the catalogue skills mentioned in that text.
+    """
+    file_ext = _source_format(source, file_format)
+    chunks = []
+    info = parse_resume_info('')
+    lines_read = 0
+    pages = timed_iter(iter_text_from_file(source, file_ext), 'read_' + file_ext)
+    try:
+        for chunk in pages:
+            if not chunk:
+                continue
+            chunk = chunk if chunk.endswith('\n') else chunk + '\n'
+            chunks.append(chunk)
+            # Each page is parsed once, for the fields still empty. A field's first
+            # hit in the earliest page holding one is its first hit in the text
+            missing = [field for field in INFO_FIELDS if not info.get(field)]
+            with stage('parse'):
+                found = parse_resume_info(chunk, missing, max(0, NAME_LINES - lines_read))
+            info.update((field, value) for field, value in found.items() if value)
+            lines_read += chunk.count('\n')
+            if all(info.get(field) for field in REQUIRED_FIELDS):
+                break
+    except Exception as e:
+        EXTRACTION_FAILURES.inc(file_ext)
+        print(f"Error extracting text from {_describe(source)}: {str(e)}")
+    finally:
+        pages.close()
+
+    text = ''.join(chunks)
+    with stage('skills'):
+        info['skills'] = extract_skills(text)
+    return text, info
+
+# Patterns are compiled once at import; parse_resume_info runs on every upload
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Phone patterns in priority order. A bare 10-digit run is already covered
+# by the local pattern, so it needs no pattern of its own.
+PHONE_RES = [
+    re.compile(r'\+?\d{1,3}[\s-]?\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}'),
+    re.compile(r'\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}'),
+]
+
+LINKEDIN_RE = re.compile(r'linkedin\.com/in/[\w-]+|linkedin\.com/pub/[\w-]+', re.IGNORECASE)
+NAME_LINES = 5  # The name is looked for in this many leading lines
+NAME_EXCLUDE_RE = re.compile(r'@|\d{10}|linkedin|resume|cv', re.IGNORECASE)
+
+EDUCATION_KEYWORDS = ['university', 'college', 'institute', 'school']
+DEGREE_KEYWORDS = ['bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'bca', 'mca', 'be', 'me']
+
+
+# (degree, keywords) checked in order against the first degree line
+DEGREE_SUBJECTS = [
+    ('Computer Science', ('computer', 'cs')),
+    ('Engineering', ('engineering', 'engineer')),
+    ('Business Administration', ('business', 'mba')),
+    ('Data Science', ('data',)),
+]
+
+def _trie_pattern(keywords):
+    """Compile keywords into a regex shaped like a trie of their prefixes.
+
+    ``bachelor|b.tech|bca`` becomes ``b(?:\\.tech|achelor|ca)``, so the regex
+    engine checks each shared prefix once instead of trying every keyword at
+    every offset.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        group = '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            return group + '?'
+        return branches[0] if len(branches) == 1 else group
+
+    return re.compile(build(trie))
+
+class KeywordMatcher:
+    """Find the earliest occurrence of any keyword from a fixed set."""
+
+    def __init__(self, keywords, head=8192):
+        self.keywords = list(keywords)
+        self.pattern = _trie_pattern(self.keywords)
+        self.head = head
+        self.overlap = max(len(keyword) for keyword in self.keywords) - 1
+
+    def find(self, text):
+        """Return the start of the earliest keyword in ``text``, or -1."""
+        # Matches are usually near the top of a resume, where the trie regex
+        # stops at the first hit
+        match = self.pattern.search(text, 0, self.head)
+        if match:
+            return match.start()
+        if len(text) <= self.head:
+            return -1
+
+        # For the rest, per-keyword str.find beats the regex on long text
+        start = self.head - self.overlap
+        best = -1
+        for keyword in self.keywords:
+            stop = len(text) if best == -1 else best + len(keyword) - 1
+            pos = text.find(keyword, start, stop)
+            if pos != -1:
+                best = pos
+        return best
+
+EDUCATION_MATCHER = KeywordMatcher(EDUCATION_KEYWORDS)
+DEGREE_MATCHER = KeywordMatcher(DEGREE_KEYWORDS)
+
+def _line_bounds(text, pos):
+    """Return (start, end) of the line in ``text`` containing ``pos``."""
+    start = text.rfind('\n', 0, pos) + 1
+    end = text.find('\n', pos)
+    return start, (end if end != -1 else len(text))
+
+def _classify_degree(line_lower):
+    for degree, keywords in DEGREE_SUBJECTS:
+        if any(keyword in line_lower for keyword in keywords):
+            return degree
+    if 'information' in line_lower and 'technology' in line_lower:
+        return 'Information Technology'
+    return ''
+
+def parse_resume_info(text, fields=INFO_FIELDS, name_lines=NAME_LINES):
+    """Parse personal information from resume text
+
+    Only ``fields`` are searched for, and the name only in the first
+    ``name_lines`` lines, so extract_resume can parse page by page.
+    """
+    # Each field is one C-level search over the whole text, which stops at
+    # its first hit. A Python loop over the lines filling every field at
+    # once measured 2-8x slower, since it pays interpreter cost per line
+    info = {
+        'name': '',
+        'phone': '',
+        'linkedin': '',
+        'college': '',
+        'degree': '',
+        'age': ''
+    }
+    
+    if 'email' in fields:
+        email_match = EMAIL_RE.search(text)
+        if email_match:
+            info['email'] = email_match.group()
+    
+    # Phone pattern (various formats)
+    if 'phone' in fields:
+        for pattern in PHONE_RES:
+            phone_match = pattern.search(text)
+            if phone_match:
+                info['phone'] = phone_match.group()
+                break
+    
+    if 'linkedin' in fields:
+        linkedin_match = LINKEDIN_RE.search(text)
+        if linkedin_match:
+            info['linkedin'] = 'https://' + linkedin_match.group()
+    
+    # Name extraction (first few lines, excluding email/phone)
+    if 'name' in fields:
+        for line in text.split('\n', name_lines)[:name_lines]:
+            line = line.strip()
+            if line and not NAME_EXCLUDE_RE.search(line):
+                if len(line.split()) >= 2 and len(line) < 50:
+                    info['name'] = line
+                    break
+    
+    if 'college' not in fields and 'degree' not in fields:
+        return info
+    
+    # Education extraction: the first line containing a keyword wins
+    text_lower = text.lower()
+    college_pos = EDUCATION_MATCHER.find(text_lower) if 'college' in fields else -1
+    if college_pos != -1:
+        if len(text_lower) == len(text):
+            start, end = _line_bounds(text_lower, college_pos)
+            info['college'] = text[start:end].strip()
+        else:
+            # Lowercasing changed the length, so map by line number instead
+            line_number = text_lower.count('\n', 0, college_pos)
+            info['college'] = text.split('\n')[line_number].strip()
+    
+    degree_pos = DEGREE_MATCHER.find(text_lower) if 'degree' in fields else -1
+    if degree_pos != -1:
+        start, end = _line_bounds(text_lower, degree_pos)
+        info['degree'] = _classify_degree(text_lower[start:end])
+    
+    return info
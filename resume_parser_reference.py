@@ -0,0 +1,75 @@
+"""
+The original, uncompiled ``parse_resume_info``.
+
+Kept as the reference the tests check the compiled parser against, and
+as the baseline of benchmarks/bench_resume_parser.py.
+"""
+
+import re
+
+
+def legacy_parse_resume_info(text):
+    """The original parse_resume_info."""
+    info = {
+        'name': '',
+        'phone': '',
+        'linkedin': '',
+        'college': '',
+        'degree': '',
+        'age': ''
+    }
+
+    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+    email_match = re.search(email_pattern, text)
+    if email_match:
+        info['email'] = email_match.group()
+
+    phone_patterns = [
+        r'\+?\d{1,3}[\s-]?\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}',
+        r'\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}',
+        r'\d{10}'
+    ]
+    for pattern in phone_patterns:
+        phone_match = re.search(pattern, text)
+        if phone_match:
+            info['phone'] = phone_match.group()
+            break
+
+    linkedin_pattern = r'linkedin\.com/in/[\w-]+|linkedin\.com/pub/[\w-]+'
+    linkedin_match = re.search(linkedin_pattern, text, re.IGNORECASE)
+    if linkedin_match:
+        info['linkedin'] = 'https://' + linkedin_match.group()
+
+    lines = text.split('\n')
+    for line in lines[:5]:
+        line = line.strip()
+        if line and not re.search(r'@|\d{10}|linkedin|resume|cv', line, re.IGNORECASE):
+            if len(line.split()) >= 2 and len(line) < 50:
+                info['name'] = line
+                break
+
+    education_keywords = ['university', 'college', 'institute', 'school']
+    degree_keywords = ['bachelor', 'master', 'phd', 'b.tech', 'm.tech', 'bca', 'mca', 'be', 'me']
+
+    for line in lines:
+        line_lower = line.lower()
+        if any(keyword in line_lower for keyword in education_keywords):
+            info['college'] = line.strip()
+            break
+
+    for line in lines:
+        line_lower = line.lower()
+        if any(keyword in line_lower for keyword in degree_keywords):
+            if 'computer' in line_lower or 'cs' in line_lower:
+                info['degree'] = 'Computer Science'
+            elif 'engineering' in line_lower or 'engineer' in line_lower:
+                info['degree'] = 'Engineering'
+            elif 'business' in line_lower or 'mba' in line_lower:
+                info['degree'] = 'Business Administration'
+            elif 'data' in line_lower:
+                info['degree'] = 'Data Science'
+            elif 'information' in line_lower and 'technology' in line_lower:
+                info['degree'] = 'Information Technology'
+            break
+
+    return info
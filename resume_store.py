@@ -0,0 +1,316 @@
+"""
+Content-addressed storage for uploaded resumes.
+
+Each distinct file is stored once, named by its SHA-256, under
+``blobs/ab/cd/<sha256>``. When another user (or the same one again)
+uploads identical bytes, only a metadata row is added. Blobs are
+zlib-compressed when that saves at least an eighth of their size. DOCX
+files and images are already compressed, so they are stored as they are.
+
+Metadata lives in a WAL-mode SQLite file next to the blobs, shared by
+every worker process on the host:
+
+- ``blobs``: one row per stored file, with its size before and after compression.
+- ``uploads``: one row per (user, file) with the filename, format and the
+  time of the latest upload.
+
+``sweep`` applies retention in three steps:
+
+1. Drop uploads older than ``max_age``.
+2. Drop the oldest remaining uploads until the blobs fit in ``max_bytes``.
+3. Delete blobs that no upload refers to any more.
+
+It only runs indexed queries, in transactions of ``sweep_batch`` rows, so
+its cost depends on how much has expired rather than on how many files
+are stored. Uploads arriving during a sweep wait for one batch at most.
+``start_sweeper`` runs it on a daemon thread.
+"""
+
+import contextlib
+import hashlib
+import os
+import secrets
+import shutil
+import sqlite3
+import threading
+import time
+import zlib
+
+from metrics import stage
+from resume_cache import hash_file
+
+# Formats whose files are already compressed, so compressing them again only costs CPU
+PRECOMPRESSED_FORMATS = {'docx', 'doc', 'png', 'jpg', 'jpeg', 'gif', 'image'}
+
+
+class ResumeStore:
+    """Deduplicated resume files plus the user -> file records pointing at them."""
+
+    def __init__(self, root, max_age=30 * 24 * 3600, max_bytes=1024 * 1024 * 1024, compress=True,
+                 sweep_batch=100):
+        self.root = root
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.sweep_batch = sweep_batch
+        self.blob_dir = os.path.join(root, 'blobs')
+        self.tmp_dir = os.path.join(root, 'tmp')
+        self.last_sweep = None
+        self.sweep_errors = 0
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._sweeper = None
+        self._stop = threading.Event()
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        conn = self._connection()
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS blobs ('
+            ' sha256 TEXT PRIMARY KEY,'
+            ' size INTEGER NOT NULL,'
+            ' stored_size INTEGER NOT NULL,'
+            ' compressed INTEGER NOT NULL)'
+        )
+        conn.execute(
+            'CREATE TABLE IF NOT EXISTS uploads ('
+            ' user TEXT NOT NULL,'
+            ' sha256 TEXT NOT NULL,'
+            ' filename TEXT NOT NULL,'
+            ' format TEXT NOT NULL,'
+            ' uploaded_at REAL NOT NULL,'
+            ' PRIMARY KEY (user, sha256))'
+        )
+        conn.execute('CREATE INDEX IF NOT EXISTS uploads_sha256 ON uploads (sha256)')
+        conn.execute('CREATE INDEX IF NOT EXISTS uploads_uploaded_at ON uploads (uploaded_at)')
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.root, 'index.db'), timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # IMMEDIATE takes the write lock up front, so the blob checks made
+        # inside cannot be invalidated by a concurrent sweep. Threads of one
+        # process queue on a lock first: SQLite's busy handler would make an
+        # upload waiting behind a sweep batch sleep in steps of up to 100 ms
+        conn = self._connection()
+        with self._write_lock:
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            conn.execute('COMMIT')
+
+    def blob_path(self, sha256):
+        return os.path.join(self.blob_dir, sha256[:2], sha256[2:4], sha256)
+
+    def _stage_blob(self, source, file_format):
+        """Write ``source`` (bytes or a path) to a temporary file; return ``(path, stored size, compressed)``."""
+        tmp_path = os.path.join(self.tmp_dir, secrets.token_hex(16))
+        data = source if isinstance(source, bytes) else None
+        if self.compress and file_format not in PRECOMPRESSED_FORMATS:
+            if data is None:
+                with open(source, 'rb') as f:
+                    data = f.read()
+            packed = zlib.compress(data, 6)
+            if len(packed) <= len(data) * 7 // 8:
+                with open(tmp_path, 'wb') as f:
+                    f.write(packed)
+                return tmp_path, len(packed), True
+        if data is not None:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            return tmp_path, len(data), False
+        # A spilled upload on the same filesystem is linked rather than copied
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        return tmp_path, os.path.getsize(tmp_path), False
+
+    def put(self, user, source, sha256=None, filename='', file_format=''):
+        """Record that ``user`` uploaded ``source`` (bytes or a path); store the file if it is new.
+
+        Returns ``{'sha256', 'size', 'stored'}``, where ``stored`` is False
+        when an identical file was already kept.
+        """
+        if sha256 is None:
+            sha256 = hashlib.sha256(source).hexdigest() if isinstance(source, bytes) else hash_file(source)
+        size = len(source) if isinstance(source, bytes) else os.path.getsize(source)
+
+        staged = None
+        if self._connection().execute('SELECT 1 FROM blobs WHERE sha256 = ?', (sha256,)).fetchone() is None:
+            staged = self._stage_blob(source, file_format)
+        stored = False
+        try:
+            with self._transaction() as conn:
+                if conn.execute('SELECT 1 FROM blobs WHERE sha256 = ?', (sha256,)).fetchone() is None:
+                    if staged is None:  # Swept since the check above
+                        staged = self._stage_blob(source, file_format)
+                    tmp_path, stored_size, compressed = staged
+                    path = self.blob_path(sha256)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(tmp_path, path)
+                    staged = None
+                    conn.execute('INSERT INTO blobs (sha256, size, stored_size, compressed) VALUES (?, ?, ?, ?)',
+                                 (sha256, size, stored_size, int(compressed)))
+                    stored = True
+                conn.execute('INSERT OR REPLACE INTO uploads (user, sha256, filename, format, uploaded_at) '
+                             'VALUES (?, ?, ?, ?, ?)', (user, sha256, filename, file_format, time.time()))
+        finally:
+            if staged is not None:
+                os.remove(staged[0])
+        return {'sha256': sha256, 'size': size, 'stored': stored}
+
+    def read(self, sha256):
+        """Return the bytes of a stored file, or None if it is not (or no longer) stored."""
+        row = self._connection().execute('SELECT compressed FROM blobs WHERE sha256 = ?', (sha256,)).fetchone()
+        if row is None:
+            return None
+        try:
+            with open(self.blob_path(sha256), 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return None
+        return zlib.decompress(data) if row[0] else data
+
+    def uploads(self, user):
+        """The user's stored resumes, newest first."""
+        rows = self._connection().execute(
+            'SELECT u.sha256, u.filename, u.format, u.uploaded_at, b.size FROM uploads u '
+            'JOIN blobs b ON b.sha256 = u.sha256 WHERE u.user = ? ORDER BY u.uploaded_at DESC', (user,))
+        return [{'sha256': sha256, 'filename': filename, 'format': file_format, 'uploaded_at': uploaded_at,
+                 'size': size} for sha256, filename, file_format, uploaded_at, size in rows]
+
+    def _drop_uploads(self, query, params, byte_budget=None):
+        """Delete the uploads ``query`` selects and the blobs left unreferenced, in one short transaction.
+
+        With ``byte_budget``, stops once the blobs of the dropped uploads add
+        up to it. Returns ``(uploads dropped, blobs removed, bytes freed)``.
+        """
+        with self._transaction() as conn:
+            rows = conn.execute(query, params).fetchall()
+            if byte_budget is not None:
+                taken, total = [], 0
+                for user, sha256, stored_size in rows:
+                    taken.append((user, sha256, stored_size))
+                    total += stored_size
+                    if total >= byte_budget:
+                        break
+                rows = taken
+            conn.executemany('DELETE FROM uploads WHERE user = ? AND sha256 = ?',
+                             [(user, sha256) for user, sha256, stored_size in rows])
+            orphans = {}
+            for user, sha256, stored_size in rows:
+                if conn.execute('SELECT 1 FROM uploads WHERE sha256 = ? LIMIT 1', (sha256,)).fetchone() is None:
+                    orphans[sha256] = stored_size
+            conn.executemany('DELETE FROM blobs WHERE sha256 = ?', [(sha256,) for sha256 in orphans])
+            # Unlinked inside the transaction, so a concurrent put cannot
+            # re-register a blob whose file is about to disappear
+            for sha256 in orphans:
+                try:
+                    os.remove(self.blob_path(sha256))
+                except FileNotFoundError:
+                    pass
+        return len(rows), len(orphans), sum(orphans.values())
+
+    def stored_bytes(self):
+        return self._connection().execute('SELECT COALESCE(SUM(stored_size), 0) FROM blobs').fetchone()[0]
+
+    def sweep(self, now=None):
+        """Apply the age and size limits; return what was removed and how long it took."""
+        now = time.time() if now is None else now
+        started = time.perf_counter()
+        result = {'expired': 0, 'evicted': 0, 'blobs_removed': 0, 'bytes_freed': 0}
+        select = ('SELECT u.user, u.sha256, b.stored_size FROM uploads u JOIN blobs b ON b.sha256 = u.sha256 '
+                  '{} ORDER BY u.uploaded_at LIMIT ?')
+
+        with stage('resume_store_sweep'):
+            if self.max_age:
+                while True:
+                    dropped, blobs, freed = self._drop_uploads(select.format('WHERE u.uploaded_at < ?'),
+                                                               (now - self.max_age, self.sweep_batch))
+                    result['expired'] += dropped
+                    result['blobs_removed'] += blobs
+                    result['bytes_freed'] += freed
+                    if dropped < self.sweep_batch:
+                        break
+
+            if self.max_bytes:
+                excess = self.stored_bytes() - self.max_bytes
+                while excess > 0:
+                    dropped, blobs, freed = self._drop_uploads(select.format(''), (self.sweep_batch,),
+                                                               byte_budget=excess)
+                    if not dropped:
+                        break
+                    result['evicted'] += dropped
+                    result['blobs_removed'] += blobs
+                    result['bytes_freed'] += freed
+                    excess = self.stored_bytes() - self.max_bytes
+
+            self._remove_stale_tmp(now)
+
+        result['seconds'] = round(time.perf_counter() - started, 4)
+        self.last_sweep = dict(result, finished_at=time.time())
+        return result
+
+    def _remove_stale_tmp(self, now, max_age=3600):
+        # Left behind only by a process that died while storing a file
+        with os.scandir(self.tmp_dir) as it:
+            for entry in it:
+                try:
+                    if entry.stat().st_mtime < now - max_age:
+                        os.remove(entry.path)
+                except OSError:
+                    pass
+
+    def start_sweeper(self, interval=600):
+        """Sweep every ``interval`` seconds on a background thread."""
+        if self._sweeper is not None:
+            return
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, args=(interval,), name='resume-store-sweeper',
+                                         daemon=True)
+        self._sweeper.start()
+
+    def _sweep_loop(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.sweep()
+            except (OSError, sqlite3.Error):
+                self.sweep_errors += 1
+
+    def stop_sweeper(self):
+        if self._sweeper is not None:
+            self._stop.set()
+            self._sweeper.join()
+            self._sweeper = None
+
+    def stats(self):
+        conn = self._connection()
+        uploads, users, upload_bytes = conn.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT u.user), COALESCE(SUM(b.size), 0) FROM uploads u '
+            'JOIN blobs b ON b.sha256 = u.sha256').fetchone()
+        blobs, blob_bytes, stored = conn.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(stored_size), 0) FROM blobs').fetchone()
+        return {
+            'uploads': uploads,
+            'users': users,
+            'blobs': blobs,
+            'upload_bytes': upload_bytes,
+            'stored_bytes': stored,
+            'dedup_saved_bytes': upload_bytes - blob_bytes,
+            'compression_saved_bytes': blob_bytes - stored,
+            'max_age': self.max_age,
+            'max_bytes': self.max_bytes,
+            'last_sweep': self.last_sweep,
+            'sweep_errors': self.sweep_errors,
+        }
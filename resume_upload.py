@@ -0,0 +1,246 @@
+"""
+Buffering and validation of uploaded resumes.
+
+The app receives upload bodies into an ``UploadSpool``: small files stay
+in memory and only files over the threshold spill to a uniquely named file
+in the uploads folder, so two students uploading ``resume.pdf`` never
+share a file. The spool hashes the bytes and keeps the first kilobyte as
+they are written, so the cache key and file type are known without
+reading the upload a second time.
+
+``check_upload`` sniffs the real format from those magic bytes and
+applies per-format size caps, rejecting a bad file before any extractor
+parses it.
+"""
+
+import codecs
+import hashlib
+import io
+import os
+import tempfile
+import zipfile
+
+# Bytes kept from the start of each upload for sniffing. PDF readers accept
+# the %PDF- marker anywhere in the first kilobyte
+HEADER_BYTES = 1024
+
+# Largest accepted upload per format; the request-wide MAX_CONTENT_LENGTH still applies
+FORMAT_SIZE_CAPS = {
+    'pdf': 10 * 1024 * 1024,
+    'docx': 5 * 1024 * 1024,
+    'image': 8 * 1024 * 1024,
+    'txt': 512 * 1024,
+}
+
+# Unpacked size allowed for a DOCX, so a small zip bomb cannot fill a worker's memory
+DOCX_MAX_UNPACKED = 50 * 1024 * 1024
+
+# File extension -> format its content must have
+EXTENSION_FORMATS = {
+    'pdf': 'pdf',
+    'doc': 'docx', 'docx': 'docx',
+    'png': 'image', 'jpg': 'image', 'jpeg': 'image', 'gif': 'image',
+    'txt': 'txt',
+}
+
+FORMAT_NAMES = {'pdf': 'PDF', 'docx': 'Word (DOCX)', 'image': 'image', 'txt': 'text'}
+
+IMAGE_SIGNATURES = (b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a')
+ZIP_SIGNATURE = b'PK\x03\x04'
+OLE_SIGNATURE = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'  # Legacy .doc and other Office 97 files
+
+
+class InvalidUpload(Exception):
+    """Raised when an upload is not a file we can read; the message is shown to the user."""
+
+
+class UploadSpool:
+    """Writable upload buffer kept in memory up to ``max_memory`` bytes, then spilled to disk.
+
+    Expects what the form parser does: sequential writes, then reads. The
+    size, SHA-256 and header are tracked on write.
+    """
+
+    def __init__(self, max_memory, spill_dir):
+        self.max_memory = max_memory
+        self.spill_dir = spill_dir
+        self.size = 0
+        self.header = b''
+        self.path = None
+        self._digest = hashlib.sha256()
+        self._file = io.BytesIO()
+        self._detached = False
+
+    def write(self, data):
+        if self.path is None and self.size + len(data) > self.max_memory:
+            self._spill()
+        if len(self.header) < HEADER_BYTES:
+            self.header += bytes(data[:HEADER_BYTES - len(self.header)])
+        self._digest.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def _spill(self):
+        fd, self.path = tempfile.mkstemp(dir=self.spill_dir, prefix='upload-')
+        spilled = os.fdopen(fd, 'w+b')
+        spilled.write(self._file.getbuffer())
+        self._file.close()
+        self._file = spilled
+
+    @property
+    def sha256(self):
+        return self._digest.hexdigest()
+
+    @property
+    def in_memory(self):
+        return self.path is None
+
+    @property
+    def source(self):
+        """The upload as bytes while in memory, else the path of the spilled file."""
+        if self.path is None:
+            return self._file.getvalue()
+        self._file.flush()
+        return self.path
+
+    def detach(self):
+        """Hand the upload over to a job: its bytes, or the path of the spilled file.
+
+        The spilled file is no longer removed on ``close``; the new owner
+        deletes it.
+        """
+        source = self.source
+        self._detached = self.path is not None
+        return source
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def readinto(self, buffer):
+        return self._file.readinto(buffer)
+
+    def readline(self, size=-1):
+        return self._file.readline(size)
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def flush(self):
+        self._file.flush()
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    @property
+    def closed(self):
+        return self._file.closed
+
+    def close(self):
+        self._file.close()
+        if self.path is not None and not self._detached:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def spool_upload(file_storage, max_memory, spill_dir):
+    """Return the upload's ``UploadSpool``, copying streams that did not come from one."""
+    stream = file_storage.stream
+    if isinstance(stream, UploadSpool):
+        return stream
+    spool = UploadSpool(max_memory, spill_dir)
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(64 * 1024), b''):
+        spool.write(chunk)
+    spool.seek(0)
+    return spool
+
+
+def sniff_format(header):
+    """Return the format of a file from its first bytes: pdf, docx, image, txt, or None."""
+    if b'%PDF-' in header[:HEADER_BYTES]:
+        return 'pdf'
+    if header.startswith(IMAGE_SIGNATURES):
+        return 'image'
+    if header.startswith(ZIP_SIGNATURE):
+        return 'docx'  # Confirmed from the zip directory by check_upload
+    if header.startswith(OLE_SIGNATURE) or b'\x00' in header:
+        return None
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(header, final=False)
+    except UnicodeDecodeError:
+        return None
+    return 'txt'
+
+
+def _format_size(size):
+    return f'{size // (1024 * 1024)} MB' if size >= 1024 * 1024 else f'{size // 1024} KB'
+
+
+def _check_size_cap(file_format, size):
+    cap = FORMAT_SIZE_CAPS[file_format]
+    if size > cap:
+        raise InvalidUpload(f'Resumes in {FORMAT_NAMES[file_format]} format can be at most {_format_size(cap)}.')
+
+
+def check_size(extension, size):
+    """Apply ``check_upload``'s size cap to a file of ``size`` bytes before reading it.
+
+    Raises InvalidUpload when it is too large; unknown extensions pass.
+    """
+    if extension in EXTENSION_FORMATS:
+        _check_size_cap(EXTENSION_FORMATS[extension], size)
+
+
+def _check_docx(spool):
+    try:
+        with zipfile.ZipFile(spool) as archive:
+            members = archive.infolist()
+    except zipfile.BadZipFile:
+        raise InvalidUpload('This Word file is damaged. Please upload it again or as a PDF.')
+    finally:
+        spool.seek(0)
+    if not any(member.filename == 'word/document.xml' for member in members):
+        raise InvalidUpload('This file is not a Word document. Please upload a DOCX or PDF.')
+    if sum(member.file_size for member in members) > DOCX_MAX_UNPACKED:
+        raise InvalidUpload('This Word file is too large to read. Please upload a PDF instead.')
+
+
+def check_upload(spool, extension):
+    """Check an upload's content against its extension and size cap; return its format.
+
+    Raises InvalidUpload with a message for the user when it does not fit.
+    """
+    expected = EXTENSION_FORMATS.get(extension)
+    if expected is None:
+        raise InvalidUpload('Invalid file type. Please upload PDF, DOC, DOCX, or image files.')
+    if spool.size == 0:
+        raise InvalidUpload('The uploaded file is empty.')
+
+    actual = sniff_format(spool.header)
+    if actual != expected:
+        if spool.header.startswith(OLE_SIGNATURE) and expected == 'docx':
+            raise InvalidUpload('Older .doc files are not supported. Please save it as DOCX or PDF.')
+        raise InvalidUpload(f'This file does not look like a {FORMAT_NAMES[expected]} file. '
+                            'Please check the file and upload it again.')
+
+    _check_size_cap(actual, spool.size)
+    if actual == 'docx':
+        _check_docx(spool)
+    return actual
@@ -0,0 +1,134 @@
+"""
+Synthetic resumes for tests and benchmarks.
+
+Builds plain-text resumes and minimal text-layer PDFs without any extra
+dependencies, so the parsers can be exercised on documents of any length.
+DOCX and image resumes use python-docx and Pillow, which the parsers need
+anyway.
+"""
+
+SAMPLE_HEADER = [
+    'Jane Doe',
+    'jane.doe@example.com | +91 987 654 3210',
+    'linkedin.com/in/jane-doe',
+]
+
+SAMPLE_BODY = [
+    'PROFESSIONAL SUMMARY',
+    'Final year student who enjoys building data pipelines and web services.',
+    'EDUCATION',
+    'B.Tech in Computer Science, ABC Institute of Technology, 2021 - 2025',
+    'SKILLS',
+    'Python, SQL, Machine Learning, Data Analysis, Git, Docker',
+    'PROJECTS',
+    'Built a course recommendation engine serving 2,000 students.',
+    'Automated weekly reporting with pandas and scheduled jobs.',
+]
+
+FILLER_LINE = 'Worked with a cross-functional team to deliver features on schedule and on budget.'
+
+
+def resume_pages(page_count=1, lines_per_page=40):
+    """Return a list of pages, each a list of lines, for a resume of ``page_count`` pages."""
+    pages = []
+    for index in range(page_count):
+        lines = list(SAMPLE_HEADER + SAMPLE_BODY) if index == 0 else []
+        while len(lines) < lines_per_page:
+            lines.append(FILLER_LINE)
+        pages.append(lines)
+    return pages
+
+
+def resume_text(page_count=1, lines_per_page=40):
+    return '\n'.join('\n'.join(lines) for lines in resume_pages(page_count, lines_per_page)) + '\n'
+
+
+def no_education_text(page_count):
+    """A resume with no education section, so a parser has to scan every line."""
+    text = resume_text(page_count)
+    return '\n'.join(line for line in text.split('\n')
+                     if 'Institute' not in line and 'B.Tech' not in line)
+
+
+def _pdf_escape(line):
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def make_pdf(pages):
+    """Return the bytes of a PDF with one Helvetica text page per list of lines.
+
+    Pass an empty list for a page to produce a page with no text layer.
+    """
+    objects = []
+    page_ids = []
+    font_id = 3
+    objects.append(None)  # 1: catalog, filled in below
+    objects.append(None)  # 2: page tree, filled in below
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>')
+
+    for lines in pages:
+        content = ['BT', '/F1 10 Tf', '12 TL', '50 780 Td']
+        for line in lines:
+            content.append(f'({_pdf_escape(line)}) Tj T*')
+        content.append('ET')
+        stream = '\n'.join(content).encode('latin-1', 'replace')
+        objects.append(b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            b'/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>' % (font_id, content_id)
+        )
+        page_ids.append(len(objects))
+
+    objects[0] = b'<< /Type /Catalog /Pages 2 0 R >>'
+    kids = b' '.join(b'%d 0 R' % page_id for page_id in page_ids)
+    objects[1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (kids, len(page_ids))
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref_offset = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for offset in offsets:
+        out += b'%010d 00000 n \n' % offset
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref_offset)
+    return bytes(out)
+
+
+def write_pdf(path, page_count=1, lines_per_page=40):
+    with open(path, 'wb') as f:
+        f.write(make_pdf(resume_pages(page_count, lines_per_page)))
+    return path
+
+
+def make_docx(pages):
+    """Return the bytes of a DOCX with one paragraph per line and a page break between pages."""
+    import io
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+
+    document = Document()
+    for index, lines in enumerate(pages):
+        for line in lines:
+            document.add_paragraph(line)
+        if index < len(pages) - 1:
+            document.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def make_image(lines, image_format='PNG'):
+    """Return the bytes of a scanned-looking single page image of ``lines``."""
+    import io
+    from PIL import Image, ImageDraw
+
+    image = Image.new('L', (1275, 60 + 30 * len(lines)), 255)
+    draw = ImageDraw.Draw(image)
+    for index, line in enumerate(lines):
+        draw.text((60, 30 + 30 * index), line, fill=0)
+    out = io.BytesIO()
+    image.save(out, format=image_format)
+    return out.getvalue()
@@ -0,0 +1,353 @@
+"""
+Server-side sessions.
+
+The cookie carries only a random session ID; the session's sections
+(``skills``, ``personal_info``, ...) live in a backend, one row per
+section. A request loads a section only when it reads it, and on the way
+out writes back only the sections whose serialized value changed, so a
+page that touches ``user_email`` never moves the resume fields or skill
+lists.
+
+Backends share the same small interface:
+
+- ``MemorySessionBackend``: per-process LRU, for a single worker.
+- ``SQLiteSessionBackend``: WAL-mode SQLite file shared by every worker
+  process on the host.
+"""
+
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+
+# Same serializer as Flask's cookie sessions, so tuples, bytes, Markup
+# and datetimes round-trip exactly as they did before
+serializer = TaggedJSONSerializer()
+
+# Expiry is pushed back at most this often for sessions that are only read
+TOUCH_INTERVAL = 60
+
+
+class MemorySessionBackend:
+    """In-process LRU of sessions with an idle timeout."""
+
+    def __init__(self, max_sessions=10000, ttl=24 * 3600):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.evictions = 0
+        self._sessions = OrderedDict()  # sid -> [expires_at, {section: serialized}]
+        self._lock = threading.Lock()
+
+    def _live(self, sid):
+        entry = self._sessions.get(sid)
+        if entry is None:
+            return None
+        if entry[0] < time.time():
+            del self._sessions[sid]
+            return None
+        self._sessions.move_to_end(sid)
+        return entry
+
+    def keys(self, sid):
+        """Return ``(section names, expires_at)`` of a live session, or None."""
+        with self._lock:
+            entry = self._live(sid)
+            return None if entry is None else (set(entry[1]), entry[0])
+
+    def load(self, sid, key):
+        with self._lock:
+            entry = self._live(sid)
+            return None if entry is None else entry[1].get(key)
+
+    def save(self, sid, changed, deleted):
+        with self._lock:
+            entry = self._live(sid)
+            if entry is None:
+                entry = self._sessions[sid] = [0, {}]
+            entry[0] = time.time() + self.ttl
+            entry[1].update(changed)
+            for key in deleted:
+                entry[1].pop(key, None)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+
+    def touch(self, sid):
+        with self._lock:
+            entry = self._live(sid)
+            if entry is not None:
+                entry[0] = time.time() + self.ttl
+
+    def delete(self, sid):
+        with self._lock:
+            self._sessions.pop(sid, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'sessions': len(self._sessions),
+                'bytes': sum(len(value) for entry in self._sessions.values() for value in entry[1].values()),
+                'evictions': self.evictions,
+            }
+
+
+class SQLiteSessionBackend:
+    """SQLite-backed sessions shared between processes."""
+
+    def __init__(self, path, ttl=24 * 3600):
+        self.path = path
+        self.ttl = ttl
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS sessions (sid TEXT PRIMARY KEY, expires_at REAL NOT NULL)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS session_sections ('
+                ' sid TEXT NOT NULL,'
+                ' key TEXT NOT NULL,'
+                ' value TEXT NOT NULL,'
+                ' PRIMARY KEY (sid, key))'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires_at)')
+
+    def _connection(self):
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def keys(self, sid):
+        conn = self._connection()
+        row = conn.execute('SELECT expires_at FROM sessions WHERE sid = ?', (sid,)).fetchone()
+        if row is None or row[0] < time.time():
+            return None
+        keys = {key for key, in conn.execute('SELECT key FROM session_sections WHERE sid = ?', (sid,))}
+        return keys, row[0]
+
+    def load(self, sid, key):
+        row = self._connection().execute(
+            'SELECT value FROM session_sections WHERE sid = ? AND key = ?', (sid, key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, sid, changed, deleted):
+        conn = self._connection()
+        now = time.time()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO sessions (sid, expires_at) VALUES (?, ?)', (sid, now + self.ttl))
+            conn.executemany('INSERT OR REPLACE INTO session_sections (sid, key, value) VALUES (?, ?, ?)',
+                             [(sid, key, value) for key, value in changed.items()])
+            conn.executemany('DELETE FROM session_sections WHERE sid = ? AND key = ?',
+                             [(sid, key) for key in deleted])
+            self._purge_expired(conn, now)
+
+    def _purge_expired(self, conn, now):
+        expired = [sid for sid, in conn.execute('SELECT sid FROM sessions WHERE expires_at < ? LIMIT 100', (now,))]
+        if expired:
+            conn.executemany('DELETE FROM session_sections WHERE sid = ?', [(sid,) for sid in expired])
+            conn.executemany('DELETE FROM sessions WHERE sid = ?', [(sid,) for sid in expired])
+
+    def touch(self, sid):
+        conn = self._connection()
+        with conn:
+            conn.execute('UPDATE sessions SET expires_at = ? WHERE sid = ?', (time.time() + self.ttl, sid))
+
+    def delete(self, sid):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM session_sections WHERE sid = ?', (sid,))
+            conn.execute('DELETE FROM sessions WHERE sid = ?', (sid,))
+
+    def stats(self):
+        conn = self._connection()
+        sessions = conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+        size = conn.execute('SELECT COALESCE(SUM(LENGTH(value)), 0) FROM session_sections').fetchone()[0]
+        return {'backend': 'sqlite', 'sessions': sessions, 'bytes': size, 'evictions': 0}
+
+
+class ServerSideSession(SessionMixin):
+    """Session whose sections are fetched from the backend on first access."""
+
+    def __init__(self, backend, sid=None, keys=(), expires_at=0):
+        self.backend = backend
+        self.sid = sid
+        self.new = sid is None
+        self.modified = False
+        self.accessed = False
+        self.expires_at = expires_at
+        self._keys = set(keys)
+        self._values = {}
+        self._original = {}  # section -> serialized value as loaded
+        self._dirty = set()
+        self._deleted = set()
+        self.regenerated = False
+
+    def __getitem__(self, key):
+        self.accessed = True
+        if key not in self._values:
+            if key not in self._keys:
+                raise KeyError(key)
+            data = self.backend.load(self.sid, key)
+            if data is None:  # Removed by another request since this one started
+                self._keys.discard(key)
+                raise KeyError(key)
+            self._values[key] = serializer.loads(data)
+            self._original[key] = data
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        self.accessed = self.modified = True
+        self._keys.add(key)
+        self._values[key] = value
+        self._dirty.add(key)
+        self._deleted.discard(key)
+
+    def __delitem__(self, key):
+        if key not in self._keys:
+            raise KeyError(key)
+        self.accessed = self.modified = True
+        self._keys.discard(key)
+        self._values.pop(key, None)
+        self._dirty.discard(key)
+        self._deleted.add(key)
+
+    def __contains__(self, key):
+        self.accessed = True
+        return key in self._keys
+
+    def __iter__(self):
+        self.accessed = True
+        return iter(list(self._keys))
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        # Drop every section without loading them first
+        if self._keys:
+            self.accessed = self.modified = True
+            self._deleted |= self._keys
+            self._keys.clear()
+            self._values.clear()
+            self._dirty.clear()
+
+    def regenerate(self):
+        """Move the session to a fresh ID when it is saved.
+
+        Called at login, so an ID planted in the browser beforehand (session
+        fixation) never carries the logged-in session.
+        """
+        self.accessed = self.modified = True
+        self.regenerated = True
+
+    def sections(self):
+        """Return every section serialized, loading the ones not yet read."""
+        changed, _ = self.changes()
+        for key in self._keys - set(changed):
+            data = self.backend.load(self.sid, key)
+            if data is not None:
+                changed[key] = data
+        return changed
+
+    def changes(self):
+        """Return ``(changed, deleted)``: serialized sections to write and names to remove.
+
+        Sections read and then mutated in place are caught by comparing
+        their serialized value with what was loaded.
+        """
+        changed = {}
+        for key, value in self._values.items():
+            data = serializer.dumps(value)
+            if key in self._dirty or data != self._original.get(key):
+                changed[key] = data
+        return changed, set(self._deleted)
+
+
+class ServerSideSessionInterface(SessionInterface):
+    """Keeps only a session ID in the cookie and the session data in ``backend``."""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            found = self.backend.keys(sid)
+            if found is not None:
+                keys, expires_at = found
+                return ServerSideSession(self.backend, sid, keys, expires_at)
+        return ServerSideSession(self.backend)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if session.accessed:
+            response.vary.add('Cookie')
+
+        if not session:
+            if not session.new and session.modified:
+                # Logged out or otherwise emptied: forget it entirely
+                self.backend.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path,
+                                       secure=self.get_cookie_secure(app),
+                                       samesite=self.get_cookie_samesite(app),
+                                       httponly=self.get_cookie_httponly(app))
+            return
+
+        old_sid = None
+        if session.regenerated and not session.new:
+            # Copy every section to a new ID, then drop the old one
+            old_sid, session.new = session.sid, True
+            changed, deleted = session.sections(), set()
+        else:
+            changed, deleted = session.changes()
+        if session.new:
+            session.sid = secrets.token_urlsafe(32)
+        if changed or deleted or session.new:
+            self.backend.save(session.sid, changed, deleted)
+            if old_sid:
+                self.backend.delete(old_sid)
+        elif session.expires_at - time.time() < self.backend.ttl - TOUCH_INTERVAL:
+            self.backend.touch(session.sid)
+
+        if session.new or (session.permanent and app.config['SESSION_REFRESH_EACH_REQUEST']):
+            response.set_cookie(
+                name, session.sid,
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+
+
+def regenerate_session(session):
+    """Give ``session`` a fresh ID, as after login.
+
+    Flask's cookie sessions carry their data in the cookie itself and need
+    nothing here.
+    """
+    if isinstance(session, ServerSideSession):
+        session.regenerate()
+
+
+def create_session_backend(url, max_sessions=10000, ttl=24 * 3600):
+    """Build a backend from ``memory`` or ``sqlite:///path/to/file.db``."""
+    if url == 'memory':
+        return MemorySessionBackend(max_sessions=max_sessions, ttl=ttl)
+    if url.startswith('sqlite:///'):
+        return SQLiteSessionBackend(url[len('sqlite:///'):], ttl=ttl)
+    raise ValueError(f"Unknown session store: {url}")
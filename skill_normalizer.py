@@ -0,0 +1,194 @@
+"""
+Skill normalization: maps free-form skill names onto the catalogue's
+canonical skills.
+
+Names are split into tokens and looked up in a token trie, so spacing and
+punctuation variants ("Node JS", "node.js", "NodeJS") land on the same
+entry. A single-word name whose punctuation the tokenizer would drop
+(".net") is only matched with that punctuation, since "net" is a common
+word. Names with no exact entry get a conservative one-typo fuzzy match.
+Results are memoized in a bounded LRU cache.
+"""
+
+import re
+from functools import lru_cache
+
+# Alias -> canonical skill
+SKILL_ALIASES = {
+    'js': 'javascript', 'nodejs': 'javascript', 'node.js': 'javascript',
+    'reactjs': 'javascript', 'react.js': 'javascript',
+    'py': 'python', 'django': 'python', 'flask': 'python',
+    'cpp': 'c++', 'cplusplus': 'c++',
+    'csharp': 'c#', 'dotnet': 'c#', '.net': 'c#',
+    'ml': 'machine learning', 'ai': 'machine learning',
+    'artificial intelligence': 'machine learning',
+    'dl': 'deep learning', 'neural networks': 'deep learning',
+    'aws': 'cloud computing', 'azure': 'cloud computing', 'gcp': 'cloud computing',
+    'mysql': 'sql', 'postgresql': 'sql', 'postgres': 'sql',
+    'mongodb': 'nosql', 'cassandra': 'nosql', 'redis': 'nosql',
+    'html5': 'html', 'css3': 'css',
+    'communication skills': 'communication',
+    'project planning': 'project management',
+    'user interface': 'ui/ux design', 'user experience': 'ui/ux design'
+}
+
+# Letters, digits and the symbols that matter in names like C++ and C#
+TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+
+# The same tokens in text that has not been lowercased, for free-text extraction
+PROSE_TOKEN_RE = re.compile(r'[a-z0-9+#]+', re.IGNORECASE)
+
+# Shorter plain-word matches in free text ("ai", "py") need to be written as
+# an acronym ("AI") or carry a symbol ("c#") to count
+PROSE_MIN_LENGTH = 3
+
+# Names shorter than this are never fuzzy matched ("aws" is not a typo of "gcp")
+FUZZY_MIN_LENGTH = 5
+
+NORMALIZE_CACHE_SIZE = 4096
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def _deletes(word):
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _within_one_edit(a, b):
+    """True if a and b differ by one insert, delete, substitution or adjacent swap."""
+    if a == b:
+        return True
+    if abs(len(a) - len(b)) > 1:
+        return False
+    if len(a) == len(b):
+        diffs = [i for i in range(len(a)) if a[i] != b[i]]
+        if len(diffs) == 1:
+            return True
+        return (len(diffs) == 2 and diffs[1] == diffs[0] + 1
+                and a[diffs[0]] == b[diffs[1]] and a[diffs[1]] == b[diffs[0]])
+    if len(a) > len(b):
+        a, b = b, a
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+def _counts_in_prose(word, min_length):
+    if len(word) < min_length:
+        return False
+    return len(word) >= PROSE_MIN_LENGTH or word.isupper() or not word.isalnum()
+
+
+class SkillNormalizer:
+    """Alias trie plus fuzzy fallback over a fixed vocabulary."""
+
+    def __init__(self, aliases, canonical_skills=()):
+        self.trie = {}
+        self.joined = {}
+        self.literal = {}
+        terms = dict(aliases)
+        for skill in canonical_skills:
+            terms.setdefault(skill, skill)
+        for term, canonical in terms.items():
+            tokens = tokenize(term)
+            if len(tokens) == 1 and tokens[0] != term.lower():
+                self.literal.setdefault(term.lower(), canonical)
+                continue
+            self._insert(tokens, canonical)
+            # "nodejs" and "node js" are the same alias once spacing is ignored
+            self.joined.setdefault(''.join(tokenize(term)), canonical)
+
+        # Symmetric-delete index for one-edit fuzzy lookups
+        self.delete_index = {}
+        for key in self.joined:
+            if len(key) >= FUZZY_MIN_LENGTH:
+                for variant in _deletes(key) | {key}:
+                    self.delete_index.setdefault(variant, set()).add(key)
+
+        self.literal_re = None
+        if self.literal:
+            alternatives = '|'.join(re.escape(term) for term in sorted(self.literal, key=len, reverse=True))
+            self.literal_re = re.compile(r'(?<![a-z0-9+#])(?:%s)(?![a-z0-9+#])' % alternatives, re.IGNORECASE)
+
+        self.normalize = lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(self._normalize)
+
+    def _insert(self, tokens, canonical):
+        if not tokens:
+            return
+        node = self.trie
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node.setdefault(None, canonical)
+
+    def _lookup(self, tokens):
+        node = self.trie
+        for token in tokens:
+            node = node.get(token)
+            if node is None:
+                return None
+        return node.get(None)
+
+    def _fuzzy(self, key):
+        if len(key) < FUZZY_MIN_LENGTH:
+            return None
+        candidates = set()
+        for variant in _deletes(key) | {key}:
+            candidates |= self.delete_index.get(variant, set())
+        matches = {self.joined[candidate] for candidate in candidates if _within_one_edit(key, candidate)}
+        # Ambiguous typos are left alone rather than guessed
+        return matches.pop() if len(matches) == 1 else None
+
+    def _normalize(self, skill):
+        if not skill:
+            return ''
+        skill = skill.strip().lower()
+        if skill in self.literal:
+            return self.literal[skill]
+        tokens = tokenize(skill)
+        if not tokens:
+            return skill
+        match = self._lookup(tokens) or self.joined.get(''.join(tokens)) or self._fuzzy(''.join(tokens))
+        return match or skill
+
+    def extract(self, text, min_length=2):
+        """Return canonical skills mentioned in free text, in order of first mention.
+
+        At each token the longest trie match wins, so "machine learning"
+        is preferred over a shorter alias starting at the same word.
+        Single-letter terms such as "c" are skipped by default because they
+        appear in ordinary prose, and so are two-letter words such as "ai"
+        or "py" unless written as an acronym ("AI").
+        """
+        matches = []
+        if self.literal_re is not None:
+            matches.extend((m.start(), self.literal[m.group().lower()]) for m in self.literal_re.finditer(text))
+        words = [(m.start(), m.group()) for m in PROSE_TOKEN_RE.finditer(text)]
+        tokens = [word.lower() for start, word in words]
+        i = 0
+        while i < len(tokens):
+            node = self.trie
+            match, match_end = None, i
+            j = i
+            while j < len(tokens):
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+                j += 1
+                if None in node:
+                    match, match_end = node[None], j
+            if match is not None and _counts_in_prose(''.join(word for start, word in words[i:match_end]), min_length):
+                matches.append((words[i][0], match))
+                i = match_end
+            else:
+                i += 1
+
+        found = []
+        seen = set()
+        for start, match in sorted(matches, key=lambda item: item[0]):
+            if match not in seen:
+                seen.add(match)
+                found.append(match)
+        return found
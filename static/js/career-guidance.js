@@ -13,15 +13,62 @@ function showGuidance(button) {
     // Get the career title from the ID
     const careerTitle = careerId.replace(/-/g, ' ');
     
-    // Show loading state briefly for better UX
-    setTimeout(() => {
-        // Navigate to the career guidance page
-        window.location.href = `/career-guidance/${encodeURIComponent(careerTitle)}?match=${matchPercentage}&growth=${growth}`;
-    }, 300);
+    // Navigate straight away; the spinner stays up until the page arrives
+    // and the guidance page animates its sections in on its own
+    window.location.href = `/career-guidance/${encodeURIComponent(careerTitle)}?match=${matchPercentage}&growth=${growth}`;
+}
+
+// Icons shown before each item of the list sections
+const SECTION_ICONS = {
+    skills: 'fas fa-check',
+    resources: 'fas fa-external-link-alt'
+};
+
+// Replace a section's placeholders with the streamed value
+function renderGuidanceSection(name, value) {
+    const target = document.querySelector(`[data-section="${name}"]`);
+    if (!target) return;
+
+    if (name === 'overview') {
+        target.textContent = value;
+    } else {
+        target.replaceChildren(...value.map(text => {
+            const item = document.createElement('li');
+            if (SECTION_ICONS[name]) {
+                const icon = document.createElement('i');
+                icon.className = SECTION_ICONS[name];
+                const label = document.createElement('span');
+                label.textContent = text;
+                item.append(icon, label);
+            } else {
+                item.textContent = text;
+            }
+            return item;
+        }));
+    }
+}
+
+// Fill in the guidance page section by section as the server streams it
+function streamGuidance(container) {
+    const source = new EventSource(container.dataset.streamUrl);
+
+    source.addEventListener('section', event => {
+        const section = JSON.parse(event.data);
+        renderGuidanceSection(section.name, section.value);
+    });
+    source.addEventListener('done', () => source.close());
+
+    // Don't let EventSource reconnect and generate the guidance again
+    source.onerror = () => source.close();
 }
 
 // Add event listeners when the page loads
 document.addEventListener('DOMContentLoaded', function() {
+    const streamContainer = document.querySelector('[data-stream-url]');
+    if (streamContainer) {
+        streamGuidance(streamContainer);
+    }
+
     // Add click event to all guidance buttons
     document.querySelectorAll('.guidance-btn').forEach(button => {
         button.addEventListener('click', function() {
@@ -111,6 +111,43 @@ document.addEventListener("DOMContentLoaded", () => {
     })
   })
 
+  // Poll the background resume extraction job and pre-fill empty fields
+  const resumeJobNotice = document.getElementById("resumeJobNotice")
+  if (resumeJobNotice) {
+    const jobUrl = resumeJobNotice.dataset.jobUrl
+
+    function fillExtractedInfo(info) {
+      Object.keys(info).forEach((key) => {
+        const field = document.getElementById(key)
+        if (field && info[key] && !field.value) {
+          field.value = info[key]
+        }
+      })
+    }
+
+    function pollResumeJob() {
+      fetch(jobUrl)
+        .then((response) => response.json())
+        .then((data) => {
+          if (data.status === "pending") {
+            setTimeout(pollResumeJob, 1000)
+            return
+          }
+          if (data.status === "done") {
+            fillExtractedInfo(data.result)
+            resumeJobNotice.innerHTML =
+              '<i class="fas fa-info-circle"></i> Information has been extracted from your resume and pre-filled below. Please review and update as needed.'
+          } else {
+            resumeJobNotice.innerHTML =
+              '<i class="fas fa-info-circle"></i> We could not read your resume. Please fill the form manually.'
+          }
+        })
+        .catch(() => resumeJobNotice.remove())
+    }
+
+    pollResumeJob()
+  }
+
   // Form validation
   const forms = document.querySelectorAll("form")
   forms.forEach((form) => {
@@ -0,0 +1,103 @@
+"""
+Fragment caching and startup compilation for the app's Jinja templates.
+
+``{% cache key, ... %}...{% endcache %}`` renders its body once per key
+and then serves the stored markup. The key is the tag's values plus the
+template name and line, so two blocks never share entries. A key must
+cover everything the body renders, e.g. a career title and the catalogue
+version its text comes from. If any key value is none or undefined, the
+body is rendered without caching, so a page opts in by passing the
+version. A cache with ``max_entries`` 0 caches nothing.
+
+``precompile_templates`` compiles every template when the app starts,
+so the first request to each page does not pay for it. With a
+``FileSystemBytecodeCache`` configured, later processes load the compiled
+code instead of parsing the templates again.
+"""
+
+import threading
+from collections import OrderedDict
+
+from jinja2 import Undefined, nodes
+from jinja2.ext import Extension
+
+from metrics import CACHE_LOOKUPS
+
+
+class FragmentCache:
+    """LRU of rendered template fragments."""
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, key, render):
+        with self._lock:
+            markup = self._entries.get(key)
+            if markup is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if markup is not None:
+            CACHE_LOOKUPS.inc('fragment', 'hit')
+            return markup
+
+        # Rendered outside the lock; two requests may both render a new key once
+        markup = render()
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = markup
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        CACHE_LOOKUPS.inc('fragment', 'miss')
+        return markup
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+class FragmentCacheExtension(Extension):
+    """Adds the ``{% cache %}`` tag, backed by ``environment.fragment_cache``."""
+
+    tags = {'cache'}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=FragmentCache())
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        key = [nodes.Const(parser.name), nodes.Const(lineno), parser.parse_expression()]
+        while parser.stream.skip_if('comma'):
+            key.append(parser.parse_expression())
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', [nodes.Tuple(key, 'load')]), [], [], body).set_lineno(lineno)
+
+    def _render(self, key, caller):
+        cache = self.environment.fragment_cache
+        if not cache.max_entries or any(part is None or isinstance(part, Undefined) for part in key):
+            return caller()
+        return cache.render(key, caller)
+
+
+def precompile_templates(environment, extensions=('html',)):
+    """Compile (or load from the bytecode cache) every template; return how many there are."""
+    names = environment.list_templates(extensions=extensions)
+    for name in names:
+        environment.get_template(name)
+    return len(names)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for memoizing career analyses by normalized skill profile
+"""
+
+import career_scoring
+from analysis_store import AnalysisMemo
+from app import app, analysis_memo
+from career_scoring import JOB_SKILLS_MAPPING, SkillMatrix
+
+
+def test_equivalent_skill_lists_share_a_profile_key():
+    matrix = SkillMatrix(JOB_SKILLS_MAPPING)
+
+    assert matrix.profile_key(['Python', 'ML', 'SQL']) == matrix.profile_key(['sql', 'machine learning', 'py'])
+    # Every listed skill counts toward the score, so duplicates do too
+    assert matrix.profile_key(['python']) != matrix.profile_key(['python', 'python'])
+
+
+def test_catalogue_change_changes_the_version():
+    changed = dict(JOB_SKILLS_MAPPING, **{'Data Scientist': ['python', 'statistics']})
+
+    assert SkillMatrix(changed).version != SkillMatrix(JOB_SKILLS_MAPPING).version
+    assert SkillMatrix(changed).profile_key(['python']) != SkillMatrix(JOB_SKILLS_MAPPING).profile_key(['python'])
+
+
+def test_memo_counts_hits_and_drops_entries_of_old_versions():
+    memo = AnalysisMemo(max_entries=2)
+    assert memo.get('v1', 'a') is None
+    memo.put('v1', 'a', {'score': 1})
+
+    assert memo.get('v1', 'a') == {'score': 1}
+    assert memo.get('v2', 'a') is None
+    assert memo.stats()['invalidations'] == 1
+    assert memo.stats()['hits'] == 1
+    assert memo.stats()['misses'] == 2
+
+
+def test_reload_catalogue_invalidates_memoized_analyses(monkeypatch):
+    old_matrix = career_scoring.current_skill_matrix()
+    monkeypatch.setitem(JOB_SKILLS_MAPPING, 'Data Scientist', ['python', 'statistics'])
+    try:
+        new_matrix = career_scoring.reload_catalogue()
+        assert new_matrix.version != old_matrix.version
+        assert career_scoring.current_skill_matrix() is new_matrix
+    finally:
+        monkeypatch.undo()
+        career_scoring.reload_catalogue()
+    assert career_scoring.current_skill_matrix().version == old_matrix.version
+
+
+def test_refreshing_career_analysis_reuses_result_and_id():
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_email'] = 'user@example.com'
+        sess['skills'] = {'technical_skills': ['Python', 'Statistics', 'Machine Learning'], 'soft_skills': ['Communication']}
+
+    hits = analysis_memo.hits
+    assert client.get('/career-analysis').status_code == 200
+    with client.session_transaction() as sess:
+        first_id = sess['current_analysis_id']
+    assert client.get('/career-analysis').status_code == 200
+    with client.session_transaction() as sess:
+        assert sess['current_analysis_id'] == first_id
+
+    assert analysis_memo.hits >= hits + 1
+    results = client.get('/api/analysis').get_json()['results']
+    assert results['recommended_careers'][0]['title'] == 'Data Scientist'
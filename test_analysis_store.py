@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for the career analysis result stores
+"""
+
+import time
+
+from analysis_store import MemoryAnalysisStore, SQLiteAnalysisStore, create_analysis_store, serialize
+
+RESULTS = {
+    'recommended_careers': [{'title': 'Data Scientist', 'match': 77.0, 'growth': 'Very High'}],
+    'user_skills': {'technical_skills': ['Python', 'SQL'], 'soft_skills': []},
+    'skill_gaps': [],
+    'trending_jobs_suitability': 77,
+    'recommended_courses': [],
+}
+
+
+def test_memory_store_evicts_least_recently_used():
+    store = MemoryAnalysisStore(max_entries=2)
+    store.put('a', RESULTS)
+    store.put('b', RESULTS)
+    store.get('a')
+    store.put('c', RESULTS)
+
+    assert store.get('b') is None
+    assert store.get('a') == RESULTS
+    assert store.stats()['evictions'] == 1
+    assert store.stats()['bytes'] == 2 * len(serialize(RESULTS))
+
+
+def test_memory_store_expires_entries():
+    store = MemoryAnalysisStore(ttl=0.05)
+    store.put('a', RESULTS)
+    time.sleep(0.1)
+
+    assert store.get('a') is None
+    assert store.stats()['expirations'] == 1
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "analyses.db")
+    writer = SQLiteAnalysisStore(path)
+    reader = SQLiteAnalysisStore(path)
+
+    writer.put('a', RESULTS)
+
+    assert reader.get('a') == RESULTS
+    assert reader.stats()['entries'] == 1
+
+
+def test_sqlite_store_evicts_least_recently_used(tmp_path):
+    store = SQLiteAnalysisStore(str(tmp_path / 'analyses.db'), max_entries=2, touch_interval=0.005)
+    store.put('a', RESULTS)
+    time.sleep(0.01)
+    store.put('b', RESULTS)
+    time.sleep(0.01)
+    store.get('a')
+    time.sleep(0.01)
+    store.put('c', RESULTS)
+
+    assert store.get('b') is None
+    assert store.get('a') == RESULTS
+    assert store.stats()['evictions'] == 1
+
+
+def test_sqlite_reads_of_recently_used_entries_do_not_write(tmp_path):
+    store = SQLiteAnalysisStore(str(tmp_path / 'analyses.db'))
+    store.put('a', RESULTS)
+    conn = store._connection()
+    writes = conn.total_changes
+
+    for _ in range(5):
+        assert store.get('a') == RESULTS
+
+    assert conn.total_changes == writes
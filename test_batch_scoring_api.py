@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for the /api/score/batch endpoint
+"""
+
+import json
+
+from app import app
+
+
+def test_json_batch_returns_top_k_per_candidate():
+    client = app.test_client()
+    response = client.post('/api/score/batch', json={
+        'k': 3,
+        'candidates': [
+            {'id': 'alice', 'skills': ['Python', 'SQL', 'Statistics', 'ML']},
+            {'id': 'bob', 'technical_skills': ['HTML5', 'CSS3', 'JS'], 'soft_skills': []},
+        ]
+    })
+
+    results = response.get_json()['results']
+    assert response.status_code == 200
+    assert [result['id'] for result in results] == ['alice', 'bob']
+    assert results[0]['careers'][0]['title'] == 'Data Scientist'
+    assert results[1]['careers'][0]['title'] == 'Web Developer'
+    assert len(results[0]['careers']) == 3
+
+
+def test_malformed_json_batch_is_rejected():
+    client = app.test_client()
+    response = client.post('/api/score/batch', json={'candidates': [{'skills': 'python'}]})
+
+    assert response.status_code == 400
+
+
+def test_non_list_wizard_skills_are_rejected():
+    client = app.test_client()
+    response = client.post('/api/score/batch', json={'candidates': [
+        {'skills': ['python']},
+        {'technical_skills': 'python', 'soft_skills': ['Teamwork']},
+        {'technical_skills': ['python'], 'soft_skills': {'a': 1}},
+    ]})
+
+    assert response.status_code == 400
+    assert response.get_json()['indexes'] == [1, 2]
+
+
+def test_ndjson_batch_streams_one_line_per_candidate():
+    client = app.test_client()
+    body = '\n'.join([
+        json.dumps({'id': 1, 'skills': ['linux', 'networking', 'security']}),
+        'not json',
+        json.dumps(['java', 'kotlin', 'swift']),
+    ]) + '\n'
+
+    response = client.post('/api/score/batch?k=1', data=body, content_type='application/x-ndjson')
+    lines = [json.loads(line) for line in response.data.decode().splitlines()]
+
+    assert lines[0]['careers'][0]['title'] == 'Network Engineer'
+    assert lines[1] == {'id': 1, 'error': 'Malformed candidate'}
+    assert lines[2]['careers'][0]['title'] == 'Mobile App Developer'
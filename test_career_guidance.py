@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for career guidance generation, lookup, the JSON APIs and the page HTTP cache
+"""
+
+import time
+
+from app import app, get_career_key
+from openapi import generate_career_guidance, find_career_key, CAREER_GUIDANCE
+
+
+def login(client):
+    with client.session_transaction() as sess:
+        sess['user_email'] = 'user@example.com'
+
+
+def test_guidance_is_generated_without_delay():
+    started = time.perf_counter()
+    guidance = generate_career_guidance('Data Scientist', 88, 'Very High', {})
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.05
+    assert guidance['title'] == 'Data Scientist'
+    assert guidance['match'] == 88
+    assert guidance['skills'] == CAREER_GUIDANCE['Data Scientist']['skills_needed']
+
+
+def test_unknown_career_gets_default_guidance():
+    guidance = generate_career_guidance('Astronaut', 40, 'Low', {})
+
+    assert guidance['title'] == 'Astronaut'
+    assert guidance['overview'] == CAREER_GUIDANCE['default']['overview']
+
+
+def test_repeat_view_returns_304():
+    client = app.test_client()
+    login(client)
+    first = client.get('/career-guidance/Data%20Scientist?match=88&growth=High')
+
+    assert first.status_code == 200
+    assert first.headers['ETag']
+    assert first.headers['Last-Modified']
+    assert 'private' in first.headers['Cache-Control']
+
+    repeat = client.get('/career-guidance/Data%20Scientist?match=88&growth=High',
+                        headers={'If-None-Match': first.headers['ETag']})
+    assert repeat.status_code == 304
+    assert repeat.data == b''
+
+    since = client.get('/career-guidance/Data%20Scientist?match=88&growth=High',
+                       headers={'If-Modified-Since': first.headers['Last-Modified']})
+    assert since.status_code == 304
+
+
+def test_etag_depends_on_career_and_match():
+    client = app.test_client()
+    login(client)
+    first = client.get('/career-guidance/Data%20Scientist?match=88&growth=High')
+
+    other_match = client.get('/career-guidance/Data%20Scientist?match=70&growth=High',
+                             headers={'If-None-Match': first.headers['ETag']})
+    other_career = client.get('/career-guidance/Software%20Engineer?match=88&growth=High',
+                              headers={'If-None-Match': first.headers['ETag']})
+
+    assert other_match.status_code == 200
+    assert other_career.status_code == 200
+    assert other_match.headers['ETag'] != first.headers['ETag']
+
+
+def test_career_lookup_ignores_case_spacing_and_slugs():
+    assert find_career_key('data scientist') == 'Data Scientist'
+    assert find_career_key('Data%20Scientist') == 'Data Scientist'
+    assert find_career_key('product-manager') == 'Product Manager'
+    assert find_career_key('Astronaut') is None
+    assert get_career_key('Astronaut') == 'default'
+
+
+def test_guidance_api_returns_the_payload_directly():
+    client = app.test_client()
+    response = client.get('/api/career-guidance/data-scientist?match=88&growth=Very%20High')
+
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['title'] == 'Data Scientist'
+    assert data['match'] == 88
+    assert data['learning_path'] == CAREER_GUIDANCE['Data Scientist']['learning_path']
+
+    repeat = client.get('/api/career-guidance/data-scientist?match=88&growth=Very%20High',
+                        headers={'If-None-Match': response.headers['ETag']})
+    assert repeat.status_code == 304
+
+
+def test_bulk_guidance_covers_every_recommended_career():
+    client = app.test_client()
+    login(client)
+    with client.session_transaction() as sess:
+        sess['skills'] = {'technical_skills': ['Python', 'Statistics', 'Machine Learning'], 'soft_skills': []}
+    assert client.get('/api/analysis/guidance').status_code == 404
+    client.get('/career-analysis')
+
+    response = client.get('/api/analysis/guidance')
+
+    careers = response.get_json()['careers']
+    analysis = client.get('/api/analysis').get_json()['results']
+    assert [career['title'] for career in careers] == [
+        career['title'] for career in analysis['recommended_careers']]
+    assert len(careers) == 5
+    assert careers[0]['overview'] == CAREER_GUIDANCE['Data Scientist']['overview']
+    # Careers without their own guidance get the default sections
+    assert all(career['overview'] for career in careers)
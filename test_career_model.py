@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Tests for the career model artifact, batched forest evaluation and micro-batching
+"""
+
+import json
+import threading
+
+import numpy as np
+import pytest
+
+import app as app_module
+from benchmarks.bench_career_model import PROFILES, export_synthetic, synthetic_forest
+from career_model import CareerPredictor, MicroBatcher, dataset_skill, load_model, save_model
+
+
+@pytest.fixture(scope='module')
+def model_root(tmp_path_factory):
+    root = tmp_path_factory.mktemp('career_model')
+    export_synthetic(str(root), trees=20, depth=8, leaves=40, classes=6, seed=1)
+    return str(root)
+
+
+def walk_tree(model, row, node):
+    """Reference evaluation: follow one tree node by node."""
+    children = model.children.reshape(-1, 2)
+    while children[node][0] != node:
+        node = children[node][0] if row[model.feature[node]] <= model.threshold[node] else children[node][1]
+    return model.value[node]
+
+
+def test_batched_evaluation_matches_walking_each_tree(model_root):
+    model = load_model(model_root)
+    rows = np.random.default_rng(0).uniform(0, 10, size=(50, model.n_features)).astype(np.float32)
+    rows[:, 12:] = rows[:, 12:] > 5  # Skills are 0/1
+
+    expected = [np.mean([walk_tree(model, row, root) for root in model.roots], axis=0) for row in rows]
+
+    assert np.allclose(model.predict_proba(rows), expected)
+    assert np.allclose(model.predict_proba(rows).sum(axis=1), 1)
+
+
+def test_artifact_is_versioned_and_memory_mapped(model_root, tmp_path):
+    model = load_model(model_root)
+    with open(f'{model_root}/CURRENT') as f:
+        assert f.read().strip() == model.version
+    assert isinstance(np.load(f'{model_root}/{model.version}/value.npy', mmap_mode='r'), np.memmap)
+
+    # Identical arrays give the same version; a changed forest gets a new one
+    arrays, manifest = synthetic_forest(trees=20, depth=8, leaves=40, classes=6, seed=1)
+    assert save_model(str(tmp_path), arrays, manifest) == model.version
+    arrays, manifest = synthetic_forest(trees=20, depth=8, leaves=40, classes=6, seed=2)
+    assert save_model(str(tmp_path), arrays, manifest) != model.version
+    assert load_model(str(tmp_path)).version != model.version
+
+
+def test_unknown_artifact_format_is_rejected(model_root):
+    path = f'{model_root}/{load_model(model_root).version}/manifest.json'
+    with open(path) as f:
+        manifest = json.load(f)
+    with open(path, 'w') as f:
+        json.dump(dict(manifest, format=99), f)
+    try:
+        with pytest.raises(ValueError):
+            load_model(model_root)
+    finally:
+        with open(path, 'w') as f:
+            json.dump(manifest, f)
+
+
+def test_features_come_from_the_wizard_session(model_root):
+    model = load_model(model_root)
+    row = model.features(
+        {'age': '21', 'degree': 'Computer Science', 'year_of_study': '3rd Year'},
+        {'technical_skills': ['Python', 'MySQL'], 'soft_skills': ['Public Speaking']},
+        {'logical_reasoning': 'B', 'analytical_thinking': 'B', 'creativity': 'A',
+         'problem_solving': 'B', 'leadership': 'C'})
+    value = dict(zip(model.feature_names, row))
+
+    assert value['Age'] == 21 and value['Year_of_Study'] == 3
+    assert value['Aptitude_Score'] == 7  # Two of three right on a 1-10 scale
+    assert value['Communication_Score'] == 5
+    assert value['Specialization'] == model.encoders['Specialization']['CSE']
+    assert value['skill:python'] == value['skill:sql'] == value['skill:communication'] == 1
+    assert value['GPA'] == model.manifest['defaults']['GPA']
+
+    empty = model.features()
+    assert np.array_equal(empty, model.defaults)
+
+
+def test_dataset_skill_normalization():
+    assert dataset_skill('ReactJS') == 'javascript'
+    assert dataset_skill('Python Programming Language') == 'python'
+    assert dataset_skill('C#') == 'c#'
+    assert dataset_skill('Data Structures') == 'data structures'
+
+
+def test_micro_batcher_groups_concurrent_rows():
+    release = threading.Event()
+    batches = []
+
+    def predict_batch(rows):
+        release.wait()
+        batches.append(len(rows))
+        return rows * 2
+
+    batcher = MicroBatcher(predict_batch, max_batch=8)
+    futures = [batcher.submit(np.array([float(index)])) for index in range(20)]
+    release.set()
+
+    assert [float(future.result(timeout=5)[0]) for future in futures] == [index * 2 for index in range(20)]
+    assert sum(batches) == 20 and max(batches) == 8 and len(batches) < 20
+    assert batcher.stats()['largest_batch'] == 8
+    batcher.close()
+
+
+def test_micro_batcher_reports_errors_to_every_caller():
+    def predict_batch(rows):
+        raise RuntimeError('model failed')
+
+    batcher = MicroBatcher(predict_batch)
+    future = batcher.submit(np.zeros(3))
+    with pytest.raises(RuntimeError, match='model failed'):
+        future.result(timeout=5)
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.submit(np.zeros(3))
+
+
+def test_predictor_gives_the_same_answer_batched_or_alone(model_root):
+    predictor = CareerPredictor(load_model(model_root), max_batch=4, max_wait=0.005)
+    results = {}
+
+    def predict(index):
+        results[index] = predictor.predict(**PROFILES[index % len(PROFILES)])
+
+    threads = [threading.Thread(target=predict, args=(index,)) for index in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    many = predictor.predict_many(PROFILES)
+    for index, careers in results.items():
+        assert careers == many[index % len(PROFILES)]
+    assert predictor.stats()['rows'] == 12
+    predictor.close()
+
+
+def test_career_model_api(model_root, monkeypatch):
+    predictor = CareerPredictor(load_model(model_root))
+    monkeypatch.setattr(app_module, 'career_predictor', predictor)
+    client = app_module.app.test_client()
+
+    response = client.post('/api/career-model/predict', json={'profiles': PROFILES + [{'id': 'empty'}], 'k': 2})
+    results = response.get_json()['results']
+    assert response.status_code == 200
+    assert [result['id'] for result in results] == [0, 1, 2, 'empty']
+    assert all(len(result['careers']) == 2 for result in results)
+    assert results[0]['careers'] == predictor.predict_many(PROFILES[:1], k=2)[0]
+
+    assert client.post('/api/career-model/predict', json={'profiles': [['python']]}).status_code == 400
+    assert client.get('/api/career-model/stats').get_json()['version'] == predictor.model.version
+    predictor.close()
+
+
+def test_career_model_api_without_a_model(monkeypatch):
+    monkeypatch.setattr(app_module, 'career_predictor', None)
+    client = app_module.app.test_client()
+
+    assert client.post('/api/career-model/predict', json={'profiles': []}).status_code == 404
+    assert client.get('/api/career-model/stats').get_json() == {'loaded': False}
+
+
+def test_career_analysis_page_shows_model_predictions(model_root, monkeypatch):
+    predictor = CareerPredictor(load_model(model_root))
+    monkeypatch.setattr(app_module, 'career_predictor', predictor)
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_email'] = 'user@example.com'
+        sess.update(PROFILES[0])
+
+    page = client.get('/career-analysis').get_data(as_text=True)
+
+    assert 'Predicted Career Paths' in page
+    assert predictor.predict(**PROFILES[0])[0]['career'] in page
+    predictor.close()
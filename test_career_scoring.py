@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for matrix-based job eligibility and skill gap scoring
+"""
+
+import numpy as np
+
+import career_scoring
+from career_scoring import (JOB_SKILLS_MAPPING, SkillMatrix, calculate_job_eligibility,
+                            analyze_skill_gaps, get_skill_matrix, _top_k_indexes)
+from benchmarks.bench_career_scoring import (legacy_calculate_job_eligibility, legacy_analyze_skill_gaps,
+                                             synthetic_catalogue, synthetic_users)
+
+SAMPLE_USERS = [
+    [],
+    ['Python', 'SQL', 'Machine Learning'],
+    ['python', 'py', 'Django', 'flask'],  # Aliases of one skill count once per entry
+    ['JS', 'HTML5', 'CSS3', 'React.js', 'MongoDB', 'api', 'database', 'web development'] * 6,
+    ['', 'Communication Skills', 'Leadership', 'project planning', 'Risk Management'],
+]
+
+
+def test_matches_original_scoring_on_builtin_catalogue():
+    for skills in SAMPLE_USERS:
+        assert calculate_job_eligibility(skills, JOB_SKILLS_MAPPING) == \
+            legacy_calculate_job_eligibility(skills, JOB_SKILLS_MAPPING)
+        assert analyze_skill_gaps(skills, JOB_SKILLS_MAPPING) == \
+            legacy_analyze_skill_gaps(skills, JOB_SKILLS_MAPPING)
+
+
+def test_matches_original_scoring_on_large_catalogue():
+    catalogue, vocabulary = synthetic_catalogue(500, 3000)
+    catalogue['Empty Role'] = []
+    matrix = SkillMatrix(catalogue)
+
+    for skills in synthetic_users(vocabulary, 10):
+        scores = matrix.score(skills)
+        assert scores.eligibility_dict() == legacy_calculate_job_eligibility(skills, catalogue)
+        assert scores.gaps_dict() == legacy_analyze_skill_gaps(skills, catalogue)
+
+
+def test_missing_skills_keep_catalogue_order():
+    scores = SkillMatrix(JOB_SKILLS_MAPPING).score(['python'])
+
+    assert scores.missing_skills('Data Scientist') == ['data analysis', 'machine learning', 'statistics']
+
+
+def test_batch_scores_match_single_user_ranking():
+    catalogue, vocabulary = synthetic_catalogue(300, 2000)
+    matrix = SkillMatrix(catalogue)
+    users = synthetic_users(vocabulary, 25)
+
+    # A tiny cell budget forces many chunks
+    batch = list(matrix.score_batch(users, k=5, max_cells=5000))
+
+    assert len(batch) == len(users)
+    for skills, careers in zip(users, batch):
+        scores = matrix.score(skills)
+        expected = scores.ranked()[:5]
+        assert [career['title'] for career in careers] == [job for job, score in expected]
+        assert [career['match'] for career in careers] == [round(score, 1) for job, score in expected]
+        assert careers[0]['missing_skills'] == scores.missing_skills(careers[0]['title'])
+
+
+def test_top_jobs_match_full_ranking():
+    catalogue, vocabulary = synthetic_catalogue(400, 2500)
+    catalogue['Empty Role'] = []
+    matrix = SkillMatrix(catalogue)
+    users = synthetic_users(vocabulary, 20) + [[], ['unknown skill'], ['python']]
+
+    for skills in users:
+        full = matrix.score(skills)
+        top = matrix.top_jobs(skills)
+        for k in (1, 5, 50):
+            assert top.top(k) == full.ranked()[:k]
+        job = full.ranked()[0][0]
+        assert top.missing_skills(job) == full.missing_skills(job)
+
+
+def test_top_jobs_fill_with_unmatched_jobs_in_catalogue_order():
+    matrix = SkillMatrix({'A': ['x'], 'Empty': [], 'B': ['y'], 'C': ['z', 'x']})
+
+    assert matrix.top_jobs(['z']).top(4) == [('C', 50.5), ('A', 0.5), ('B', 0.5), ('Empty', 0.0)]
+    assert matrix.top_jobs([]).top(3) == [('A', 0.0), ('Empty', 0.0), ('B', 0.0)]
+
+
+def test_top_k_selection_matches_a_stable_sort():
+    rng = np.random.default_rng(3)
+    for columns in (15, 200):
+        values = rng.integers(0, 5, (40, columns)).astype(np.float64)  # Many ties
+        for k in (1, 5, columns):
+            assert (_top_k_indexes(values, k) == np.argsort(-values, axis=1, kind='stable')[:, :k]).all()
+
+
+def test_only_the_last_custom_catalogue_stays_compiled():
+    first, _ = synthetic_catalogue(20, 100)
+    second, _ = synthetic_catalogue(20, 100, seed=8)
+
+    matrix = get_skill_matrix(first)
+    assert get_skill_matrix(first) is matrix
+    get_skill_matrix(second)
+    assert career_scoring._last_matrix[0] is second
+    assert get_skill_matrix(JOB_SKILLS_MAPPING) is career_scoring.current_skill_matrix()
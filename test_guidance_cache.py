@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the two-tier AI guidance cache
+"""
+
+import time
+
+import openapi
+from benchmarks.stub_inference_server import StubInferenceServer
+from guidance_cache import GuidanceCache, cosine_similarity
+from llm_client import AsyncLLMClient, LLMRunner
+
+SECTIONS = {
+    'overview': 'Cached overview.',
+    'skills': ['Statistics'],
+    'learning_path': ['Study statistics'],
+    'resources': ['Kaggle'],
+}
+
+SKILLS = ['python', 'sql', 'machine learning', 'statistics', 'data analysis']
+
+
+def test_exact_tier_ignores_order_duplicates_and_band_position(tmp_path):
+    cache = GuidanceCache(str(tmp_path / 'guidance.db'))
+    cache.put('Data Scientist', SKILLS, 72, SECTIONS)
+
+    sections, tier = cache.get('Data Scientist', list(reversed(SKILLS)) + ['python'], 78)
+
+    assert sections == SECTIONS
+    assert tier == 'exact'
+
+
+def test_similarity_tier_reuses_close_profiles_only(tmp_path):
+    cache = GuidanceCache(str(tmp_path / 'guidance.db'), threshold=0.8)
+    cache.put('Data Scientist', SKILLS, 72, SECTIONS)
+
+    close, close_tier = cache.get('Data Scientist', SKILLS + ['communication'], 75)
+    far, far_tier = cache.get('Data Scientist', ['python', 'html'], 75)
+    other_band, _ = cache.get('Data Scientist', SKILLS + ['communication'], 95)
+    other_career, _ = cache.get('AI Engineer', SKILLS, 72)
+
+    assert cosine_similarity(set(SKILLS), set(SKILLS + ['communication'])) >= 0.8
+    assert (close, close_tier) == (SECTIONS, 'similar')
+    assert (far, far_tier) == (None, None)
+    assert other_band is None
+    assert other_career is None
+
+    stats = cache.stats()
+    assert stats['similar_hits'] == 1
+    assert stats['misses'] == 3
+    assert sum(stats['best_similarity_histogram'].values()) == 2
+
+
+def test_entries_expire(tmp_path):
+    cache = GuidanceCache(str(tmp_path / 'guidance.db'), ttl=0.05)
+    cache.put('Data Scientist', SKILLS, 72, SECTIONS)
+    time.sleep(0.1)
+
+    assert cache.get('Data Scientist', SKILLS, 72) == (None, None)
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path):
+    cache = GuidanceCache(str(tmp_path / 'guidance.db'), max_entries=2)
+    cache.put('A', SKILLS, 50, SECTIONS)
+    cache.put('B', SKILLS, 50, SECTIONS)
+    cache.get('A', SKILLS, 50)
+    cache.put('C', SKILLS, 50, SECTIONS)
+
+    assert cache.get('B', SKILLS, 50) == (None, None)
+    assert cache.get('A', SKILLS, 50)[1] == 'exact'
+    assert cache.stats()['evictions'] == 1
+
+
+def test_similar_users_share_one_model_call(tmp_path, monkeypatch):
+    monkeypatch.setattr(openapi, '_guidance_cache', GuidanceCache(str(tmp_path / 'guidance.db')))
+    with StubInferenceServer() as server:
+        runner = LLMRunner(AsyncLLMClient(server.url, 'stub-model', 'token'))
+        monkeypatch.setattr(openapi, '_guidance_llm', runner)
+        try:
+            first = openapi.generate_ai_career_guidance(
+                'Data Scientist', 72, 'High', {'technical_skills': ['Python', 'SQL', 'ML', 'Statistics']})
+            second = openapi.generate_ai_career_guidance(
+                'Data Scientist', 76, 'High',
+                {'technical_skills': ['python', 'Machine Learning', 'sql', 'statistics', 'Excel']})
+        finally:
+            runner.close()
+
+    assert server.calls == 1
+    assert first['overview'] == second['overview'] == 'Stub overview.'
+    assert second['match'] == 76
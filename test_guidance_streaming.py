@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming career guidance over Server-Sent Events
+"""
+
+import json
+import threading
+import time
+
+import app as app_module
+import openapi
+from app import app
+from benchmarks.stub_inference_server import StubInferenceServer, DEFAULT_REPLY
+from guidance_cache import GuidanceCache
+from llm_client import AsyncLLMClient, LLMRunner
+from openapi import SectionStreamParser, iter_career_guidance_sections, GUIDANCE_SECTION_NAMES
+
+
+def parse_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        lines = dict(line.split(': ', 1) for line in block.splitlines())
+        events.append((lines['event'], json.loads(lines['data'])))
+    return events
+
+
+def test_parser_emits_each_section_once_it_is_complete():
+    parser = SectionStreamParser(GUIDANCE_SECTION_NAMES)
+    found = []
+    for char in DEFAULT_REPLY:
+        found.extend(parser.feed(char))
+
+    assert [name for name, value in found] == ['overview', 'skills', 'learning_path', 'resources']
+    assert found == list(json.loads(DEFAULT_REPLY).items())
+
+
+def test_first_byte_arrives_before_slow_sections(monkeypatch):
+    def slow_sections(career_title, match_percentage, user_skills, use_ai=True):
+        for name in GUIDANCE_SECTION_NAMES:
+            time.sleep(0.25)
+            yield name, f'{name} text'
+
+    monkeypatch.setattr(app_module, 'iter_career_guidance_sections', slow_sections)
+    client = app.test_client()
+
+    started = time.perf_counter()
+    response = client.get('/career-guidance/Data%20Scientist/stream?match=88&growth=High', buffered=False)
+    chunks = iter(response.response)
+    first = next(chunks)
+    time_to_first_byte = time.perf_counter() - started
+    body = first.decode() + b''.join(chunks).decode()
+    total = time.perf_counter() - started
+    response.close()
+
+    assert response.mimetype == 'text/event-stream'
+    assert time_to_first_byte < 0.2
+    assert total >= 1.0
+    assert b'event: meta' in first
+    events = parse_events(body)
+    assert [event for event, data in events] == ['meta'] + ['section'] * 4 + ['done']
+    assert events[1][1] == {'name': 'overview', 'value': 'overview text'}
+
+
+def test_static_guidance_streams_without_ai():
+    client = app.test_client()
+    response = client.get('/career-guidance/Data%20Scientist/stream?match=88&growth=High')
+
+    events = parse_events(response.get_data(as_text=True))
+    sections = {data['name']: data['value'] for event, data in events if event == 'section'}
+    assert events[0] == ('meta', {'title': 'Data Scientist', 'match': 88, 'growth': 'High'})
+    assert sections['skills'] == openapi.CAREER_GUIDANCE['Data Scientist']['skills_needed']
+
+
+def test_model_sections_arrive_while_the_reply_streams(tmp_path, monkeypatch):
+    monkeypatch.setattr(openapi, '_guidance_cache', GuidanceCache(str(tmp_path / 'guidance.db')))
+    with StubInferenceServer(chunk_size=8, chunk_delay=0.03) as server:
+        runner = LLMRunner(AsyncLLMClient(server.url, 'stub-model', 'token'))
+        monkeypatch.setattr(openapi, '_guidance_llm', runner)
+        try:
+            started = time.perf_counter()
+            arrivals = []
+            for name, value in iter_career_guidance_sections('Data Scientist', 88, {'technical_skills': ['Python']}):
+                arrivals.append((name, time.perf_counter() - started))
+            cached = list(iter_career_guidance_sections('Data Scientist', 88, {'technical_skills': ['Python']}))
+        finally:
+            runner.close()
+
+    assert [name for name, at in arrivals] == list(GUIDANCE_SECTION_NAMES)
+    assert arrivals[0][1] < arrivals[-1][1] - 0.2
+    assert cached == list(json.loads(DEFAULT_REPLY).items())
+    assert server.calls == 1
+
+
+def test_ai_page_renders_a_shell_that_streams(monkeypatch):
+    monkeypatch.setitem(app.config, 'AI_GUIDANCE', True)
+    client = app.test_client()
+    response = client.get('/career-guidance/Data%20Scientist?match=88&growth=High')
+
+    html = response.get_data(as_text=True)
+    assert 'data-stream-url="/career-guidance/Data%20Scientist/stream?match=88&amp;growth=High"' in html
+    assert 'js/career-guidance.js' in html
+    assert openapi.CAREER_GUIDANCE['Data Scientist']['overview'] not in html
+
+
+def concurrent_guidance(calls):
+    """Start each call on its own thread at once; return their results."""
+    results = [None] * len(calls)
+    start = threading.Barrier(len(calls))
+
+    def run(index, call):
+        start.wait()
+        results[index] = call()
+
+    threads = [threading.Thread(target=run, args=item) for item in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_streams_for_one_profile_share_one_call(tmp_path, monkeypatch):
+    monkeypatch.setattr(openapi, '_guidance_cache', GuidanceCache(str(tmp_path / 'guidance.db')))
+    with StubInferenceServer(chunk_size=8, chunk_delay=0.01) as server:
+        runner = LLMRunner(AsyncLLMClient(server.url, 'stub-model', 'token'))
+        monkeypatch.setattr(openapi, '_guidance_llm', runner)
+        try:
+            results = concurrent_guidance([
+                lambda: list(iter_career_guidance_sections('Data Scientist', 88, {'technical_skills': ['Python']}))
+            ] * 8)
+            stats = runner.client.stats()
+        finally:
+            runner.close()
+
+    assert server.calls == 1
+    assert stats['coalesced'] == 7 and stats['in_flight'] == 0
+    assert all(result == list(json.loads(DEFAULT_REPLY).items()) for result in results)
+
+
+def test_streamed_and_json_guidance_share_one_call(tmp_path, monkeypatch):
+    monkeypatch.setattr(openapi, '_guidance_cache', GuidanceCache(str(tmp_path / 'guidance.db')))
+    skills = {'technical_skills': ['Python']}
+    with StubInferenceServer(delay=0.1, chunk_size=8, chunk_delay=0.01) as server:
+        runner = LLMRunner(AsyncLLMClient(server.url, 'stub-model', 'token'))
+        monkeypatch.setattr(openapi, '_guidance_llm', runner)
+        try:
+            results = concurrent_guidance([
+                lambda: dict(iter_career_guidance_sections('Data Scientist', 88, skills)),
+                lambda: openapi.generate_ai_career_guidance('Data Scientist', 88, 'High', skills),
+            ] * 3)
+        finally:
+            runner.close()
+
+    assert server.calls == 1
+    assert all(result['overview'] == 'Stub overview.' for result in results)
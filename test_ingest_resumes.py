@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for the bulk resume ingestion CLI
+"""
+
+import json
+import zipfile
+
+from ingest_resumes import ingest, iter_sources
+from resume_upload import FORMAT_SIZE_CAPS
+from sample_resumes import make_pdf, resume_pages, resume_text
+
+
+def read_records(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+def make_cohort(directory):
+    directory.mkdir()
+    (directory / "alice.txt").write_text(resume_text())
+    (directory / "bob.pdf").write_bytes(make_pdf(resume_pages(2)))
+    (directory / "broken.pdf").write_bytes(b"not really a pdf")
+    (directory / "notes.md").write_text("ignored")
+    return directory
+
+
+def test_directory_ingest_writes_one_record_per_resume(tmp_path):
+    cohort = make_cohort(tmp_path / "cohort")
+    output = tmp_path / "out.jsonl"
+
+    summary = ingest(str(cohort), str(output), workers=2)
+    records = {record['file']: record for record in read_records(output)}
+
+    assert set(records) == {'alice.txt', 'bob.pdf', 'broken.pdf'}
+    assert records['alice.txt']['info']['name'] == 'Jane Doe'
+    assert records['bob.pdf']['status'] == 'ok'
+    assert records['broken.pdf']['status'] in ('empty', 'error')
+    assert summary['per_format']['pdf']['count'] == 2
+    assert summary['docs_per_second'] > 0
+
+
+def test_rerun_skips_processed_hashes(tmp_path):
+    cohort = make_cohort(tmp_path / "cohort")
+    output = tmp_path / "out.jsonl"
+    ingest(str(cohort), str(output), workers=2)
+
+    (cohort / "carol.txt").write_text("Carol King\ncarol@example.com\n")
+    summary = ingest(str(cohort), str(output), workers=2)
+
+    assert summary['statuses']['skipped'] == 3
+    assert [record['file'] for record in read_records(output)].count('carol.txt') == 1
+
+
+def test_zip_archive_ingest(tmp_path):
+    archive_path = tmp_path / "cohort.zip"
+    with zipfile.ZipFile(archive_path, 'w') as archive:
+        archive.writestr("2025/alice.txt", resume_text())
+        archive.writestr("2025/bob.pdf", make_pdf(resume_pages(1)))
+    output = tmp_path / "out.jsonl"
+
+    ingest(str(archive_path), str(output), workers=2)
+    records = {record['file']: record for record in read_records(output)}
+
+    assert records['2025/bob.pdf']['info']['email'] == 'jane.doe@example.com'
+    assert records['2025/alice.txt']['status'] == 'ok'
+
+
+def test_oversized_archive_members_are_recorded_without_being_read(tmp_path, monkeypatch):
+    archive_path = tmp_path / "cohort.zip"
+    with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("alice.txt", resume_text())
+        archive.writestr("bomb.txt", b'A' * (FORMAT_SIZE_CAPS['txt'] + 1))
+    read = []
+    real_read = zipfile.ZipFile.read
+    monkeypatch.setattr(zipfile.ZipFile, 'read', lambda self, member, *args: read.append(member.filename) or
+                        real_read(self, member, *args))
+
+    sources = list(iter_sources(str(archive_path)))
+    output = tmp_path / "out.jsonl"
+    summary = ingest(str(archive_path), str(output), workers=1)
+    records = {record['file']: record for record in read_records(output)}
+
+    assert [(name, data is None, error is None) for name, path, data, error in sources] == [
+        ('alice.txt', False, True), ('bomb.txt', True, False)]
+    assert 'bomb.txt' not in read
+    assert records['bomb.txt']['status'] == 'error' and '512 KB' in records['bomb.txt']['error']
+    assert records['alice.txt']['status'] == 'ok'
+    assert summary['statuses'] == {'ok': 1, 'error': 1}
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for the async LLM client, run against a local stub inference server
+"""
+
+import asyncio
+
+import pytest
+from azure.ai.inference.models import UserMessage
+
+import openapi
+from benchmarks.stub_inference_server import StubInferenceServer
+from guidance_cache import GuidanceCache
+from llm_client import AsyncLLMClient, LLMRunner, LLMError
+
+MESSAGES = [UserMessage(content='Guidance for Data Scientist')]
+
+
+def make_client(server, **kwargs):
+    kwargs.setdefault('backoff', 0.01)
+    return AsyncLLMClient(server.url, 'stub-model', 'token', **kwargs)
+
+
+def run(client, *coros):
+    """Run the coroutines concurrently, close the client and return their results."""
+    async def main():
+        try:
+            return await asyncio.gather(*coros)
+        finally:
+            await client.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_for_one_key_share_one_call():
+    with StubInferenceServer(delay=0.2) as server:
+        client = make_client(server)
+        replies = run(client, *[client.complete(MESSAGES, key='Data Scientist') for _ in range(200)])
+
+    assert server.calls == 1
+    assert len(set(replies)) == 1
+    assert client.stats()['coalesced'] == 199
+
+
+def test_server_errors_are_retried():
+    with StubInferenceServer(fail_first=2) as server:
+        client = make_client(server)
+        reply, = run(client, client.complete(MESSAGES))
+
+    assert 'Stub overview' in reply
+    assert server.calls == 3
+    assert client.retries == 2
+
+
+def test_client_errors_are_not_retried():
+    with StubInferenceServer(fail_first=5, fail_status=400) as server:
+        client = make_client(server)
+        with pytest.raises(LLMError):
+            run(client, client.complete(MESSAGES))
+
+    assert server.calls == 1
+
+
+def test_slow_calls_time_out():
+    with StubInferenceServer(delay=0.5) as server:
+        client = make_client(server, timeout=0.1, max_retries=1)
+        with pytest.raises(LLMError):
+            run(client, client.complete(MESSAGES))
+
+    assert client.upstream_calls == 2
+
+
+def test_concurrency_limit_caps_calls_in_flight():
+    with StubInferenceServer(delay=0.05) as server:
+        client = make_client(server, max_concurrency=2)
+        peak = 0
+
+        async def watch():
+            nonlocal peak
+            for _ in range(40):
+                peak = max(peak, 2 - client._semaphore._value)
+                await asyncio.sleep(0.005)
+
+        run(client, watch(), *[client.complete(MESSAGES) for _ in range(6)])
+
+    assert server.calls == 6
+    assert peak == 2
+
+
+def test_ai_guidance_uses_model_reply(tmp_path, monkeypatch):
+    monkeypatch.setattr(openapi, '_guidance_cache', GuidanceCache(str(tmp_path / 'guidance.db')))
+    with StubInferenceServer() as server:
+        runner = LLMRunner(make_client(server))
+        monkeypatch.setattr(openapi, '_guidance_llm', runner)
+        try:
+            guidance = openapi.generate_ai_career_guidance('Data Scientist', 88, 'High', {})
+        finally:
+            runner.close()
+
+    assert guidance['overview'] == 'Stub overview.'
+    assert guidance['match'] == 88
+    assert server.requests[0]['model'] == 'stub-model'
+
+
+def test_ai_guidance_falls_back_to_static_guidance(tmp_path, monkeypatch):
+    monkeypatch.setattr(openapi, '_guidance_cache', GuidanceCache(str(tmp_path / 'guidance.db')))
+    with StubInferenceServer(fail_first=10, fail_status=400) as server:
+        runner = LLMRunner(make_client(server))
+        monkeypatch.setattr(openapi, '_guidance_llm', runner)
+        try:
+            guidance = openapi.generate_ai_career_guidance('Data Scientist', 88, 'High', {})
+        finally:
+            runner.close()
+
+    assert guidance['overview'] == openapi.CAREER_GUIDANCE['Data Scientist']['overview']
+
+
+def test_streams_for_one_key_share_one_call_and_replay_to_late_callers():
+    async def collect(client, delay=0.0):
+        await asyncio.sleep(delay)
+        return ''.join([piece async for piece in client.stream(MESSAGES, key='Data Scientist')])
+
+    with StubInferenceServer(chunk_size=4, chunk_delay=0.01) as server:
+        client = make_client(server)
+        early, late = run(client, collect(client), collect(client, delay=0.1))
+
+    assert server.calls == 1
+    assert early == late == server.reply
+    assert client.stats()['in_flight'] == 0
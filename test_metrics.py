@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the metrics registry and the /metrics endpoint
+"""
+
+import time
+
+from app import app
+from metrics import REGISTRY, Registry, STAGE_SECONDS, EXTRACTION_JOBS, stage
+from resume_jobs import ResumeJobQueue
+
+
+def test_render_uses_the_prometheus_text_format():
+    registry = Registry()
+    uploads = registry.counter('uploads_total', 'Uploads.', ['format'])
+    latency = registry.histogram('latency_seconds', 'Latency.', ['route'], buckets=(0.1, 1))
+    uploads.inc('pdf')
+    uploads.inc('pdf', amount=2)
+    uploads.inc('say "hi"\n')
+    latency.observe(0.05, '/a')
+    latency.observe(0.5, '/a')
+    latency.observe(3, '/a')
+
+    lines = registry.render().splitlines()
+
+    assert '# TYPE uploads_total counter' in lines
+    assert 'uploads_total{format="pdf"} 3' in lines
+    assert 'uploads_total{format="say \\"hi\\"\\n"} 1' in lines
+    assert '# TYPE latency_seconds histogram' in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.55' in lines
+    assert 'latency_seconds_count{route="/a"} 3' in lines
+
+
+def test_disabled_registry_records_nothing():
+    registry = Registry(enabled=False)
+    counter = registry.counter('events_total', 'Events.')
+    histogram = registry.histogram('work_seconds', 'Work.')
+    counter.inc()
+    histogram.observe(1.0)
+    with histogram.time():
+        pass
+
+    assert counter.value() == 0
+    assert histogram.count() == 0
+
+
+def test_changes_from_another_process_can_be_merged():
+    worker = Registry()
+    worker.counter('jobs_total', 'Jobs.', ['status']).inc('done')
+    worker.histogram('stage_seconds', 'Stages.', ['stage']).observe(0.2, 'parse')
+    before = worker.snapshot()
+    worker.counter('jobs_total', 'Jobs.', ['status']).inc('done')
+    worker.histogram('stage_seconds', 'Stages.', ['stage']).observe(0.3, 'parse')
+
+    web = Registry()
+    jobs = web.counter('jobs_total', 'Jobs.', ['status'])
+    stages = web.histogram('stage_seconds', 'Stages.', ['stage'])
+    web.merge(worker.changes_since(before))
+
+    assert jobs.value('done') == 1
+    assert stages.count('parse') == 1
+    assert stages.snapshot()[('parse',)][-1] == 0.3
+
+
+def test_metrics_endpoint_reports_requests_stages_and_templates():
+    client = app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_email'] = 'user@example.com'
+        sess['skills'] = {'technical_skills': ['Python', 'Rust', 'Terraform', 'Kotlin'], 'soft_skills': []}
+    client.get('/career-analysis')
+    client.get('/career-guidance/Data%20Scientist?match=88&growth=High')
+
+    response = client.get('/metrics')
+
+    body = response.get_data(as_text=True)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert ('http_request_duration_seconds_count'
+            '{method="GET",route="/career-guidance/<career_title>",status="200"}') in body
+    assert 'pipeline_stage_seconds_count{stage="score"}' in body
+    assert 'template_render_seconds_count{template="career_analysis.html"}' in body
+    assert 'cache_lookups_total{cache="analysis_memo",result="miss"}' in body
+
+
+def test_worker_stage_timings_reach_the_web_process(tmp_path):
+    resume = tmp_path / 'resume.txt'
+    resume.write_text('Jane Doe\njane@example.com\n9876543210\nABC Institute of Technology\n')
+    reads = STAGE_SECONDS.count('read_txt')
+    done = EXTRACTION_JOBS.value('done')
+
+    queue = ResumeJobQueue(max_workers=1)
+    try:
+        job_id = queue.submit(str(resume))
+        deadline = time.time() + 10
+        while queue.status(job_id)['status'] == 'pending' and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        queue.shutdown()
+
+    assert STAGE_SECONDS.count('read_txt') == reads + 1
+    assert STAGE_SECONDS.count('parse') >= 1
+    assert EXTRACTION_JOBS.value('done') == done + 1
+
+
+def test_stage_is_a_no_op_when_disabled(monkeypatch):
+    monkeypatch.setattr(REGISTRY, 'enabled', False)
+    before = STAGE_SECONDS.count('noop')
+    with stage('noop'):
+        pass
+
+    assert STAGE_SECONDS.count('noop') == before
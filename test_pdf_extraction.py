@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests for streaming PDF text extraction
+"""
+
+import resume_parser
+from resume_parser import iter_pdf_pages, extract_text_from_file, extract_resume
+from sample_resumes import make_pdf, resume_pages, write_pdf
+
+
+def test_pages_are_yielded_in_order(tmp_path):
+    pdf_path = tmp_path / "resume.pdf"
+    pdf_path.write_bytes(make_pdf([['first page'], ['second page'], ['third page']]))
+
+    pages = list(iter_pdf_pages(str(pdf_path)))
+
+    assert [page.strip() for page in pages] == ['first page', 'second page', 'third page']
+
+
+def test_fast_and_layout_paths_agree(tmp_path):
+    pdf_path = write_pdf(str(tmp_path / "resume.pdf"), page_count=2)
+
+    fast = [page.split() for page in iter_pdf_pages(pdf_path, fast=True)]
+    layout = [page.split() for page in iter_pdf_pages(pdf_path, fast=False)]
+
+    assert fast == layout
+
+
+def test_page_cap_limits_pages_read(tmp_path):
+    pdf_path = write_pdf(str(tmp_path / "resume.pdf"), page_count=5)
+
+    assert len(list(iter_pdf_pages(pdf_path, max_pages=2))) == 2
+
+
+def test_long_documents_are_split_across_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_parser, 'PDF_PARALLEL_THRESHOLD', 3)
+    monkeypatch.setattr(resume_parser, 'PDF_PARALLEL_WORKERS', 2)
+    monkeypatch.setattr(resume_parser, 'PDF_PAGES_PER_TASK', 2)
+    pdf_path = tmp_path / "resume.pdf"
+    pdf_path.write_bytes(make_pdf([[f'page {n}'] for n in range(7)]))
+
+    pages = list(iter_pdf_pages(str(pdf_path)))
+    pool = resume_parser._page_pool
+    in_memory = list(iter_pdf_pages(pdf_path.read_bytes()))
+
+    assert [page.strip() for page in pages] == [f'page {n}' for n in range(7)]
+    assert in_memory == pages
+    assert resume_parser._page_pool is pool  # One pool for every document
+
+
+def test_extraction_workers_read_pdfs_without_a_nested_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_parser, 'PDF_PARALLEL_THRESHOLD', 3)
+    monkeypatch.setattr(resume_parser, 'PDF_PARALLEL_WORKERS', 2)
+    monkeypatch.setattr(resume_parser, '_page_pool_allowed', True)
+    monkeypatch.setattr(resume_parser, '_get_page_pool', None)
+    pdf_path = tmp_path / "resume.pdf"
+    pdf_path.write_bytes(make_pdf([[f'page {n}'] for n in range(7)]))
+
+    resume_parser.init_extraction_worker()
+    pages = list(iter_pdf_pages(str(pdf_path)))
+
+    assert [page.strip() for page in pages] == [f'page {n}' for n in range(7)]
+
+
+def test_sequential_reads_open_the_document_once(tmp_path, monkeypatch):
+    import pdfplumber
+
+    opened = []
+    real_open = pdfplumber.open
+    monkeypatch.setattr(pdfplumber, 'open', lambda *args, **kwargs: opened.append(args) or real_open(*args, **kwargs))
+    pdf_path = write_pdf(str(tmp_path / "resume.pdf"), page_count=5)
+
+    assert len(list(iter_pdf_pages(pdf_path, fast=False))) == 5
+    assert len(opened) == 1
+
+
+def test_extract_resume_stops_once_fields_are_filled(tmp_path):
+    pdf_path = write_pdf(str(tmp_path / "resume.pdf"), page_count=6)
+
+    text, info = extract_resume(pdf_path)
+
+    assert info['name'] == 'Jane Doe'
+    assert info['email'] == 'jane.doe@example.com'
+    assert info['degree'] == 'Computer Science'
+    assert len(text) < len(extract_text_from_file(pdf_path))
+
+
+def test_extract_resume_stops_early_without_a_linkedin_url(tmp_path):
+    pages = [[line for line in page if 'linkedin' not in line] for page in resume_pages(page_count=6)]
+    pdf_path = tmp_path / "resume.pdf"
+    pdf_path.write_bytes(make_pdf(pages))
+
+    text, info = extract_resume(str(pdf_path))
+
+    assert info['email'] == 'jane.doe@example.com' and not info['linkedin']
+    assert len(text) < len(extract_text_from_file(str(pdf_path)))
+
+
+def test_extract_resume_parses_each_page_once(tmp_path, monkeypatch):
+    pages = [['Jane Doe', 'Data engineer'], ['jane.doe@example.com'], ['Phone: 555-123-4567'],
+             ['State University', 'Bachelor of Science in Computer Science'], ['Hobbies: chess']]
+    pdf_path = tmp_path / "resume.pdf"
+    pdf_path.write_bytes(make_pdf(pages))
+    parsed = []
+    real_parse = resume_parser.parse_resume_info
+    monkeypatch.setattr(resume_parser, 'parse_resume_info',
+                        lambda text, *args: parsed.append(text) or real_parse(text, *args))
+
+    text, info = extract_resume(str(pdf_path))
+
+    assert ''.join(parsed) == text and len(parsed) == 5  # The empty start, then one call per page
+    expected = real_parse(text)
+    assert {field: info[field] for field in resume_parser.REQUIRED_FIELDS} == \
+        {field: expected[field] for field in resume_parser.REQUIRED_FIELDS}
+    assert 'Hobbies' not in text
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-hash resume cache
+"""
+
+import os
+import time
+
+from resume_cache import ResumeCache
+
+
+def test_hit_and_miss_counters(tmp_path):
+    resume = tmp_path / "resume.txt"
+    resume.write_text("Jane Doe\n")
+    cache = ResumeCache(str(tmp_path / "cache"))
+    key = cache.key_for_file(str(resume))
+
+    assert cache.get(key) is None
+    cache.put(key, "Jane Doe\n", {'name': 'Jane Doe'}, extract_seconds=1.5)
+    record = cache.get(key)
+
+    assert record['info'] == {'name': 'Jane Doe'}
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5, 'saved_seconds': 1.5}
+
+
+def test_same_bytes_share_a_key(tmp_path):
+    first = tmp_path / "a.txt"
+    second = tmp_path / "b.txt"
+    first.write_bytes(b"same resume")
+    second.write_bytes(b"same resume")
+    cache = ResumeCache(str(tmp_path / "cache"))
+
+    assert cache.key_for_file(str(first)) == cache.key_for_file(str(second))
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResumeCache(str(tmp_path / "cache"), max_entries=2)
+    cache.put("old", "", {})
+    cache.put("newer", "", {})
+    # Make "old" the most recently used before adding a third entry
+    past = time.time() - 60
+    os.utime(os.path.join(cache.cache_dir, "newer.json"), (past, past))
+    cache.get("old")
+    cache.put("newest", "", {})
+
+    assert cache.get("old") is not None
+    assert cache.get("newer") is None
+    assert cache.get("newest") is not None
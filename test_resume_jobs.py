@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the background resume extraction queue
+"""
+
+import os
+import signal
+import time
+
+import pytest
+
+from resume_jobs import ResumeJobQueue, QueueFullError, run_extraction_job
+
+
+def slow_job(seconds, timeout):
+    time.sleep(seconds)
+    return {'slept': seconds}
+
+
+def wait_for(queue, job_id, limit=10):
+    deadline = time.time() + limit
+    while time.time() < deadline:
+        job = queue.status(job_id)
+        if job['status'] != 'pending':
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def test_job_result_is_stored(tmp_path):
+    resume = tmp_path / "resume.txt"
+    resume.write_text("Jane Doe\njane@example.com\n9876543210\nABC Institute of Technology\n")
+
+    queue = ResumeJobQueue(max_workers=1)
+    try:
+        job_id = queue.submit(str(resume))
+        job = wait_for(queue, job_id)
+    finally:
+        queue.shutdown()
+
+    assert job['status'] == 'done'
+    assert job['result']['name'] == 'Jane Doe'
+    assert job['result']['email'] == 'jane@example.com'
+
+
+def test_full_queue_rejects_new_jobs():
+    queue = ResumeJobQueue(max_workers=1, max_pending=1, job_func=slow_job)
+    try:
+        queue.submit(0.5)
+        with pytest.raises(QueueFullError):
+            queue.submit(0.5)
+    finally:
+        queue.shutdown()
+
+
+def test_job_timeout_frees_worker():
+    queue = ResumeJobQueue(max_workers=1, job_timeout=1, job_func=run_slow_extraction)
+    try:
+        stuck = queue.submit(5)
+        assert wait_for(queue, stuck)['status'] == 'timeout'
+        assert queue.pending_count() == 0
+    finally:
+        queue.shutdown()
+
+
+def run_slow_extraction(seconds, timeout):
+    # Reuse the real worker wrapper so its alarm handling is exercised
+    import resume_jobs
+    original = resume_jobs.extract_resume
+    resume_jobs.extract_resume = lambda path, file_format=None: time.sleep(seconds) or ('', {})
+    try:
+        return run_extraction_job('unused.txt', timeout=timeout)
+    finally:
+        resume_jobs.extract_resume = original
+
+
+def kill_worker(timeout):
+    os.kill(os.getpid(), signal.SIGKILL)
+
+
+def test_submit_replaces_a_pool_whose_worker_was_killed():
+    queue = ResumeJobQueue(max_workers=1, job_func=kill_worker)
+    try:
+        assert wait_for(queue, queue.submit())['status'] == 'failed'
+        broken = queue._executor
+
+        queue.job_func = slow_job
+        job = wait_for(queue, queue.submit(0))
+
+        assert job['status'] == 'done' and job['result'] == {'slept': 0}
+        assert queue._executor is not broken
+    finally:
+        queue.shutdown()
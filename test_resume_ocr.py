@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Tests for the OCR preprocessing and scanned-PDF fallback
+"""
+
+import os
+from concurrent.futures import Future
+
+from PIL import Image
+
+import resume_ocr
+import resume_parser
+from resume_ocr import otsu_threshold, preprocess_image, fill_blank_pages
+from resume_parser import extract_text_from_file
+from sample_resumes import make_pdf
+
+
+def test_otsu_threshold_splits_bimodal_histogram():
+    histogram = [0] * 256
+    histogram[40] = 500
+    histogram[210] = 1500
+
+    assert 40 <= otsu_threshold(histogram) < 210
+
+
+def test_large_photo_is_downsampled_and_binarized():
+    photo = Image.new('RGB', (6000, 4000), 'white')
+
+    processed = preprocess_image(photo)
+
+    assert max(processed.size) == resume_ocr.OCR_MAX_SIDE
+    assert processed.mode == '1'
+
+
+def test_small_image_is_upscaled():
+    processed = preprocess_image(Image.new('L', (400, 200), 255))
+
+    assert max(processed.size) == resume_ocr.OCR_MIN_SIDE
+
+
+def test_only_blank_pages_are_ocred(monkeypatch):
+    requested = []
+
+    def fake_ocr(file_path, indexes, timeout=None):
+        requested.extend(indexes)
+        return {index: f'ocr {index}' for index in indexes}
+
+    monkeypatch.setattr(resume_ocr, 'ocr_pdf_pages', fake_ocr)
+
+    pages = list(fill_blank_pages('scan.pdf', ['text', '', 'more text', '  '], window=2))
+
+    assert pages == ['text', 'ocr 1', 'more text', 'ocr 3']
+    assert requested == [1, 3]
+
+
+def test_scanned_pdf_page_goes_through_ocr(tmp_path, monkeypatch):
+    monkeypatch.setattr(resume_ocr, 'OCR_WORKERS', 1)
+    monkeypatch.setattr(resume_ocr.pytesseract, 'image_to_string',
+                        lambda image, timeout=0: 'Scanned Page Text')
+    pdf_path = tmp_path / "scan.pdf"
+    pdf_path.write_bytes(make_pdf([['Jane Doe'], []]))
+
+    text = extract_text_from_file(str(pdf_path))
+
+    assert 'Jane Doe' in text
+    assert 'Scanned Page Text' in text
+
+
+def test_pool_tasks_get_a_path_not_the_pdf_bytes(monkeypatch):
+    submitted = []
+
+    class FakePool:
+        def submit(self, func, source, index, timeout):
+            submitted.append(source)
+            future = Future()
+            future.set_result(f'ocr {index}' if os.path.exists(source) else '')
+            return future
+
+    monkeypatch.setattr(resume_ocr, 'OCR_WORKERS', 2)
+    monkeypatch.setattr(resume_ocr, '_get_pool', FakePool)
+
+    assert resume_ocr.ocr_pdf_pages(make_pdf([[], []]), [0, 1]) == {0: 'ocr 0', 1: 'ocr 1'}
+    assert len(set(submitted)) == 1 and isinstance(submitted[0], str)
+    assert not os.path.exists(submitted[0])
+
+
+def test_extraction_workers_ocr_pages_inline(monkeypatch):
+    monkeypatch.setattr(resume_ocr, 'OCR_WORKERS', 2)
+    monkeypatch.setattr(resume_ocr, '_get_pool', None)
+    monkeypatch.setattr(resume_parser, '_page_pool_allowed', False)
+    monkeypatch.setattr(resume_ocr, 'ocr_pdf_page', lambda source, index, timeout: f'ocr {index}')
+
+    assert resume_ocr.ocr_pdf_pages(b'%PDF', [0, 1]) == {0: 'ocr 0', 1: 'ocr 1'}
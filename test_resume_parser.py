@@ -5,6 +5,9 @@ Test script for resume parsing functionality
 
 import os
 from app import extract_text_from_file, parse_resume_info
+from resume_parser import KeywordMatcher
+from resume_parser_reference import legacy_parse_resume_info
+from sample_resumes import no_education_text, resume_text
 
 def test_resume_parsing():
     """Test resume parsing with sample files in uploads directory"""
@@ -50,5 +53,29 @@ def test_resume_parsing():
             print(f"Error processing {filename}: {str(e)}")
             print("\n" + "="*60 + "\n")
 
+def test_parser_matches_original_implementation():
+    """The compiled parser must give the same fields as the original"""
+    samples = [
+        resume_text(1),
+        resume_text(30),
+        no_education_text(5),
+        "",
+        "John Smith\nPhone: (555) 123-4567\nMBA, Harvard Business School\n",
+        "Resume\nAyşe İnce Kaya\nİSTANBUL TECHNICAL UNIVERSITY\nBachelor of Data Engineering\n",
+        "Priya Sharma\r\n9876543210\r\nMaster of Information Technology\r\n",
+    ]
+    for filename in os.listdir("uploads"):
+        if filename.lower().endswith('.pdf'):
+            samples.append(extract_text_from_file(os.path.join("uploads", filename)))
+
+    for text in samples:
+        assert parse_resume_info(text) == legacy_parse_resume_info(text)
+
+def test_keyword_matcher_finds_earliest_keyword():
+    matcher = KeywordMatcher(['bachelor', 'be', 'mca'], head=16)
+    assert matcher.find("x" * 30 + "mca then bachelor") == 30
+    assert matcher.find("about being a bachelor") == 6
+    assert matcher.find("nothing here") == -1
+
 if __name__ == "__main__":
     test_resume_parsing()
\ No newline at end of file
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for the deduplicated resume store and its retention sweeper
+"""
+
+import io
+import os
+import sqlite3
+import subprocess
+import sys
+import time
+
+import pytest
+
+import app as app_module
+from benchmarks.bench_wizard_flow import resume_file
+from resume_store import ResumeStore
+
+
+def blob_files(store):
+    return sorted(name for root, dirs, names in os.walk(store.blob_dir) for name in names)
+
+
+def test_identical_files_are_stored_once(tmp_path):
+    store = ResumeStore(str(tmp_path))
+    content = resume_file('pdf', 'dedup')[1]
+
+    first = store.put('a@example.com', content, filename='a.pdf', file_format='pdf')
+    second = store.put('b@example.com', content, filename='b.pdf', file_format='pdf')
+    store.put('a@example.com', content, filename='again.pdf', file_format='pdf')
+
+    assert first['stored'] and not second['stored']
+    assert blob_files(store) == [first['sha256']]
+    assert store.read(first['sha256']) == content
+    assert [upload['filename'] for upload in store.uploads('a@example.com')] == ['again.pdf']
+
+    stats = store.stats()
+    assert stats['uploads'] == 2 and stats['users'] == 2 and stats['blobs'] == 1
+    assert stats['dedup_saved_bytes'] == len(content)
+
+
+def test_compression_is_kept_only_when_it_pays(tmp_path):
+    store = ResumeStore(str(tmp_path))
+    text = b'Jane Doe\nPython, SQL, Machine Learning\n' * 200
+    noise = os.urandom(20000)
+
+    store.put('user', text, file_format='txt')
+    store.put('user', noise, file_format='txt')
+    image = store.put('user', resume_file('png', 'compress')[1], file_format='png')
+
+    sizes = {upload['sha256']: os.path.getsize(store.blob_path(upload['sha256']))
+             for upload in store.uploads('user')}
+    assert sum(sizes.values()) < len(text) + len(noise) + image['size']
+    assert sizes[image['sha256']] == image['size']
+    assert [store.read(upload['sha256']) for upload in store.uploads('user')][1:] == [noise, text]
+
+
+def test_spilled_upload_is_stored_from_its_path(tmp_path):
+    store = ResumeStore(str(tmp_path / 'store'))
+    content = resume_file('docx', 'path')[1]
+    source = tmp_path / 'upload-1'
+    source.write_bytes(content)
+
+    result = store.put('user', str(source), filename='cv.docx', file_format='docx')
+    source.unlink()  # The extraction job removes the spilled file afterwards
+
+    assert store.read(result['sha256']) == content
+
+
+def test_sweep_expires_old_uploads_and_unreferenced_blobs(tmp_path):
+    store = ResumeStore(str(tmp_path), max_age=3600, sweep_batch=2)
+    shared = store.put('old', b'shared resume', file_format='txt')['sha256']
+    store.put('new', b'shared resume', file_format='txt')
+    for index in range(5):
+        store.put('old', f'old resume {index}'.encode(), file_format='txt')
+
+    conn = store._connection()
+    conn.execute("UPDATE uploads SET uploaded_at = uploaded_at - 7200 WHERE user = 'old'")
+
+    result = store.sweep()
+    assert result['expired'] == 6 and result['blobs_removed'] == 5
+    assert store.uploads('old') == []
+    assert blob_files(store) == [shared] and store.read(shared) == b'shared resume'
+
+
+def test_sweep_evicts_oldest_uploads_past_the_size_limit(tmp_path):
+    store = ResumeStore(str(tmp_path), max_age=0, max_bytes=3000, compress=False)
+    for index in range(5):
+        store.put(f'user{index}', os.urandom(1000), file_format='pdf')
+        time.sleep(0.01)
+
+    result = store.sweep()
+    assert result['evicted'] == 2 and result['expired'] == 0
+    assert store.stored_bytes() <= 3000
+    assert [store.uploads(f'user{index}') == [] for index in range(5)] == [True, True, False, False, False]
+
+
+def test_background_sweeper(tmp_path):
+    store = ResumeStore(str(tmp_path), max_age=0.1)
+    store.put('user', b'resume', file_format='txt')
+    store.start_sweeper(interval=0.05)
+    try:
+        deadline = time.time() + 5
+        while store.stats()['uploads'] and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        store.stop_sweeper()
+    assert store.stats()['uploads'] == 0 and store.last_sweep is not None
+
+
+class RecordingJobs:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, *args, **kwargs):
+        self.calls.append(args)
+        return 'job-1'
+
+
+@pytest.mark.parametrize('max_memory', [1024 * 1024, 1024])
+def test_upload_route_stores_each_resume_once(tmp_path, monkeypatch, max_memory):
+    store = ResumeStore(str(tmp_path / 'store'))
+    monkeypatch.setattr(app_module, '_resume_store', store)
+    monkeypatch.setattr(app_module, 'resume_jobs', RecordingJobs())
+    monkeypatch.setitem(app_module.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    monkeypatch.setitem(app_module.app.config, 'UPLOAD_SPOOL_MAX_MEMORY', max_memory)
+    filename, content = resume_file('pdf', f'store-{time.time_ns()}')
+
+    for user in ('a@example.com', 'b@example.com'):
+        client = app_module.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user_email'] = user
+        client.post('/upload-resume', data={'resume': (io.BytesIO(content), filename)},
+                    content_type='multipart/form-data')
+
+    stats = app_module.app.test_client().get('/api/resume-store/stats').get_json()
+    assert stats['uploads'] == 2 and stats['blobs'] == 1
+    assert store.read(store.uploads('b@example.com')[0]['sha256']) == content
+
+
+def test_importing_the_app_does_not_open_the_store(tmp_path):
+    folder = tmp_path / 'store'
+    code = ("import threading, app; "
+            "assert app._resume_store is None; "
+            "assert 'resume-store-sweeper' not in [t.name for t in threading.enumerate()]")
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=os.path.dirname(os.path.abspath(app_module.__file__)),
+                   env=dict(os.environ, RESUME_STORE_FOLDER=str(folder)))
+    assert not folder.exists()
+
+
+class BrokenStore:
+    def put(self, *args, **kwargs):
+        raise sqlite3.OperationalError('disk I/O error')
+
+
+def test_upload_survives_a_store_failure(tmp_path, monkeypatch):
+    jobs = RecordingJobs()
+    monkeypatch.setattr(app_module, '_resume_store', BrokenStore())
+    monkeypatch.setattr(app_module, 'resume_jobs', jobs)
+    monkeypatch.setitem(app_module.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    filename, content = resume_file('pdf', f'broken-{time.time_ns()}')
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_email'] = 'user@example.com'
+
+    response = client.post('/upload-resume', data={'resume': (io.BytesIO(content), filename)},
+                           content_type='multipart/form-data')
+
+    assert response.status_code == 302 and response.location.endswith('/personal-info')
+    assert jobs.calls[0][0] == content
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Tests for upload buffering, magic-byte sniffing and per-format size caps
+"""
+
+import io
+import os
+import time
+import zipfile
+
+import pytest
+
+import app as app_module
+from benchmarks.bench_wizard_flow import resume_file
+from resume_upload import OLE_SIGNATURE, InvalidUpload, UploadSpool, check_upload, sniff_format
+
+
+def spool_of(content, max_memory=1024 * 1024, spill_dir=None):
+    spool = UploadSpool(max_memory, spill_dir)
+    for start in range(0, len(content), 4096):
+        spool.write(content[start:start + 4096])
+    spool.seek(0)
+    return spool
+
+
+@pytest.mark.parametrize('resume_format, expected', [('pdf', 'pdf'), ('docx', 'docx'), ('txt', 'txt'),
+                                                     ('png', 'image'), ('jpg', 'image')])
+def test_sample_resumes_are_sniffed(resume_format, expected):
+    filename, content = resume_file(resume_format, 'sniff')
+    spool = spool_of(content)
+    assert sniff_format(spool.header) == expected
+    assert check_upload(spool, resume_format) == expected
+
+
+def test_content_that_does_not_match_the_extension_is_rejected():
+    with pytest.raises(InvalidUpload, match='PDF'):
+        check_upload(spool_of(b'not a pdf\n' * 100), 'pdf')
+    with pytest.raises(InvalidUpload, match='image'):
+        check_upload(spool_of(resume_file('pdf', 'mismatch')[1]), 'png')
+    with pytest.raises(InvalidUpload, match='empty'):
+        check_upload(spool_of(b''), 'txt')
+    with pytest.raises(InvalidUpload, match='text'):
+        check_upload(spool_of(b'\x00\x01binary' * 10), 'txt')
+
+
+def test_legacy_doc_and_plain_zip_are_rejected():
+    with pytest.raises(InvalidUpload, match='Older .doc'):
+        check_upload(spool_of(OLE_SIGNATURE + b'\x00' * 600), 'doc')
+
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as f:
+        f.writestr('notes.txt', 'hello')
+    with pytest.raises(InvalidUpload, match='not a Word document'):
+        check_upload(spool_of(archive.getvalue()), 'docx')
+
+
+def test_oversized_upload_is_rejected():
+    with pytest.raises(InvalidUpload, match='at most 512 KB'):
+        check_upload(spool_of(b'Jane Doe\n' * 70000), 'txt')
+
+
+def test_spool_spills_past_its_memory_limit(tmp_path):
+    content = os.urandom(10000)
+    small = spool_of(content, max_memory=20000, spill_dir=str(tmp_path))
+    assert small.in_memory and small.detach() == content and not os.listdir(tmp_path)
+
+    large = spool_of(content, max_memory=4000, spill_dir=str(tmp_path))
+    assert not large.in_memory and large.read() == content
+    assert large.header == content[:1024] and large.size == len(content)
+    assert os.listdir(tmp_path) == [os.path.basename(large.path)]
+    large.close()
+    assert not os.listdir(tmp_path)
+
+    detached = spool_of(content, max_memory=4000, spill_dir=str(tmp_path))
+    path = detached.detach()
+    detached.close()
+    with open(path, 'rb') as f:
+        assert f.read() == content
+
+
+class RecordingJobs:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        return 'job-1'
+
+
+@pytest.fixture
+def upload_client(tmp_path, monkeypatch):
+    jobs = RecordingJobs()
+    monkeypatch.setattr(app_module, 'resume_jobs', jobs)
+    monkeypatch.setitem(app_module.app.config, 'RESUME_STORE_FOLDER', '')
+    monkeypatch.setattr(app_module, '_resume_store', None)
+    monkeypatch.setitem(app_module.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_email'] = 'user@example.com'
+    return client, jobs
+
+
+def post_resume(client, filename, content):
+    return client.post('/upload-resume', data={'resume': (io.BytesIO(content), filename)},
+                       content_type='multipart/form-data')
+
+
+def test_small_upload_reaches_the_job_without_touching_disk(upload_client, tmp_path):
+    client, jobs = upload_client
+    filename, content = resume_file('pdf', f'memory-{time.time_ns()}')
+
+    assert post_resume(client, filename, content).status_code == 302
+    (source, cache, cache_key), options = jobs.calls[0]
+    assert source == content
+    assert options == {'file_format': 'pdf', 'remove_source': False}
+    assert not os.listdir(tmp_path)
+
+
+def test_large_upload_is_spilled_once_and_handed_over_by_path(upload_client, tmp_path, monkeypatch):
+    client, jobs = upload_client
+    monkeypatch.setitem(app_module.app.config, 'UPLOAD_SPOOL_MAX_MEMORY', 1024)
+    filename, content = resume_file('pdf', f'spill-{time.time_ns()}')
+
+    post_resume(client, filename, content)
+    (source, cache, cache_key), options = jobs.calls[0]
+    assert options['remove_source'] is True
+    assert os.path.dirname(source) == str(tmp_path)
+    with open(source, 'rb') as f:
+        assert f.read() == content
+
+
+def test_bad_upload_is_rejected_before_extraction(upload_client, tmp_path):
+    client, jobs = upload_client
+
+    page = post_resume(client, 'resume.pdf', b'not a pdf\n' * 100).get_data(as_text=True)
+    assert 'does not look like a PDF file' in page
+    assert not jobs.calls and not os.listdir(tmp_path)
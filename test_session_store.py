@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Tests for the server-side session store
+"""
+
+import time
+
+import pytest
+from flask import Flask, session
+
+from session_store import (MemorySessionBackend, SQLiteSessionBackend, ServerSideSessionInterface,
+                           create_session_backend, regenerate_session)
+
+SKILLS = {'technical_skills': [f'skill {index}' for index in range(300)], 'soft_skills': ['Communication']}
+
+
+class CountingBackend:
+    """Wraps a backend and records the sections loaded and written."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.ttl = backend.ttl
+        self.loaded = []
+        self.saved = []
+
+    def load(self, sid, key):
+        self.loaded.append(key)
+        return self.backend.load(sid, key)
+
+    def save(self, sid, changed, deleted):
+        self.saved.append((set(changed), set(deleted)))
+        self.backend.save(sid, changed, deleted)
+
+    def __getattr__(self, name):
+        return getattr(self.backend, name)
+
+
+def make_app(backend):
+    app = Flask(__name__)
+    app.secret_key = 'test'
+    app.session_interface = ServerSideSessionInterface(backend)
+
+    @app.route('/fill')
+    def fill():
+        session['user_email'] = 'user@example.com'
+        session['skills'] = SKILLS
+        session['personal_info'] = {'full_name': 'Jane Doe'}
+        return 'ok'
+
+    @app.route('/email')
+    def email():
+        return session.get('user_email', '')
+
+    @app.route('/add-skill')
+    def add_skill():
+        session['skills']['soft_skills'].append('Leadership')  # Mutated in place
+        return 'ok'
+
+    @app.route('/login')
+    def login():
+        regenerate_session(session)
+        session['user_email'] = 'admin@example.com'
+        return 'ok'
+
+    @app.route('/logout')
+    def logout():
+        session.clear()
+        return 'ok'
+
+    return app
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        return CountingBackend(MemorySessionBackend())
+    return CountingBackend(SQLiteSessionBackend(str(tmp_path / 'sessions.db')))
+
+
+def test_cookie_holds_only_the_session_id(backend):
+    client = make_app(backend).test_client()
+    response = client.get('/fill')
+
+    cookie = response.headers['Set-Cookie']
+    assert len(cookie.split(';')[0]) < 60
+    assert client.get('/email').get_data(as_text=True) == 'user@example.com'
+
+
+def test_sections_load_lazily_and_unchanged_sections_are_not_written(backend):
+    client = make_app(backend).test_client()
+    client.get('/fill')
+    backend.loaded.clear()
+    backend.saved.clear()
+
+    response = client.get('/email')
+
+    assert backend.loaded == ['user_email']
+    assert backend.saved == []
+    assert 'Set-Cookie' not in response.headers
+
+
+def test_in_place_changes_are_written_back(backend):
+    app = make_app(backend)
+    client = app.test_client()
+    client.get('/fill')
+    backend.saved.clear()
+
+    client.get('/add-skill')
+
+    assert backend.saved == [({'skills'}, set())]
+    with client.session_transaction() as sess:
+        assert sess['skills']['soft_skills'] == ['Communication', 'Leadership']
+
+
+def test_logout_deletes_the_session(backend):
+    client = make_app(backend).test_client()
+    client.get('/fill')
+    with client.session_transaction() as sess:
+        sid = sess.sid
+
+    response = client.get('/logout')
+
+    assert backend.keys(sid) is None
+    assert 'Expires=Thu, 01 Jan 1970' in response.headers['Set-Cookie']
+
+
+def test_login_moves_the_session_to_a_new_id(backend):
+    client = make_app(backend).test_client()
+    client.get('/fill')
+    planted = client.get_cookie('session').value
+
+    client.get('/login')
+
+    sid = client.get_cookie('session').value
+    assert sid != planted and backend.keys(planted) is None
+    assert client.get('/email').get_data(as_text=True) == 'admin@example.com'
+    with client.session_transaction() as sess:
+        assert sess['skills'] == SKILLS and sess['personal_info'] == {'full_name': 'Jane Doe'}
+
+
+def test_anonymous_requests_create_no_session(backend):
+    response = make_app(backend).test_client().get('/email')
+
+    assert 'Set-Cookie' not in response.headers
+    assert backend.saved == []
+
+
+def test_sqlite_sessions_are_shared_between_workers(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    first = make_app(SQLiteSessionBackend(path)).test_client()
+    first.get('/fill')
+    second = make_app(SQLiteSessionBackend(path)).test_client()
+    second.set_cookie('session', first.get_cookie('session').value)
+
+    assert second.get('/email').get_data(as_text=True) == 'user@example.com'
+
+
+def test_idle_sessions_expire():
+    backend = create_session_backend('memory', ttl=0.05)
+    client = make_app(backend).test_client()
+    client.get('/fill')
+    time.sleep(0.1)
+
+    assert client.get('/email').get_data(as_text=True) == ''
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for skill normalization and skill extraction
+"""
+
+from career_scoring import JOB_SKILLS_MAPPING, normalize_skill, extract_skills
+from skill_normalizer import SKILL_ALIASES, SkillNormalizer
+
+
+def test_aliases_and_catalogue_skills_keep_their_mapping():
+    for alias, canonical in SKILL_ALIASES.items():
+        assert normalize_skill(alias) == canonical
+        assert normalize_skill(f'  {alias.upper()} ') == canonical
+    for skills in JOB_SKILLS_MAPPING.values():
+        for skill in skills:
+            assert normalize_skill(skill) == skill
+
+
+def test_spacing_and_punctuation_variants():
+    assert normalize_skill('Node JS') == 'javascript'
+    assert normalize_skill('React.js ') == 'javascript'
+    assert normalize_skill('C Plus Plus') == 'c++'
+    assert normalize_skill('Machine-Learning') == 'machine learning'
+    assert normalize_skill('C#') == 'c#'
+
+
+def test_fuzzy_matching_is_conservative():
+    assert normalize_skill('pyhton') == 'python'
+    assert normalize_skill('cloud computng') == 'cloud computing'
+    # Short names and unknown skills pass through lowercased
+    assert normalize_skill('Rust') == 'rust'
+    assert normalize_skill('Underwater Basket Weaving') == 'underwater basket weaving'
+    # A typo one edit from two different skills is not guessed
+    normalizer = SkillNormalizer({}, ['abcdef', 'abcdeg'])
+    assert normalizer.normalize('abcdex') == 'abcdex'
+
+
+def test_results_are_memoized():
+    normalizer = SkillNormalizer(SKILL_ALIASES)
+    normalizer.normalize('React.js')
+    normalizer.normalize('React.js')
+
+    assert normalizer.normalize.cache_info().hits == 1
+
+
+def test_extract_skills_from_resume_text():
+    text = ("SKILLS\nPython, Node.js, PostgreSQL, C++ and Machine Learning.\n"
+            "Grade C in chemistry. Built AI tools for data analysis.")
+
+    assert extract_skills(text) == ['python', 'javascript', 'sql', 'c++', 'machine learning', 'data analysis']
+
+
+def test_punctuation_and_short_aliases_do_not_match_prose():
+    assert normalize_skill('.NET') == 'c#'
+    assert normalize_skill('net') == 'net'
+    assert extract_skills('Grew net revenue by 20% across the network.') == []
+    assert extract_skills('Shipped services in .NET and C#.') == ['c#']
+    assert extract_skills('Ai Lin measured 5 ml of the py sample and jotted js notes.') == []
+    assert extract_skills('Led AI and ML work, front ends in JS.') == ['machine learning', 'javascript']
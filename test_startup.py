@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Tests for the startup-time budget and the lazily imported extractor backends
+"""
+
+import pytest
+
+from benchmarks.bench_startup import STARTUP_BUDGET_MS, measure, check, parse_importtime
+from resume_parser import EXTRACTORS, SUPPORTED_EXTENSIONS, extract_text_from_file
+from sample_resumes import make_docx
+
+
+@pytest.mark.parametrize('module', sorted(STARTUP_BUDGET_MS))
+def test_import_stays_within_budget_and_loads_backends_lazily(module):
+    result = measure(module, runs=3)
+
+    assert check(result) == []
+
+
+def test_importtime_subtree_excludes_earlier_imports():
+    stderr = '\n'.join([
+        'import time: self [us] | cumulative | imported package',
+        'import time:       100 |        100 | site',
+        'import time:        10 |         10 |     numpy',
+        'import time:        20 |         30 |   career_scoring',
+        'import time:         5 |         35 | openapi',
+    ])
+
+    assert parse_importtime(stderr, 'openapi') == {'openapi': 35, 'career_scoring': 30, 'numpy': 10}
+
+
+def test_every_supported_format_has_an_extractor(tmp_path):
+    assert SUPPORTED_EXTENSIONS == set(EXTRACTORS)
+
+    path = tmp_path / 'resume.docx'
+    path.write_bytes(make_docx([['Jane Doe', 'jane.doe@example.com']]))
+    assert extract_text_from_file(str(path)) == 'Jane Doe\njane.doe@example.com\n'
+    assert extract_text_from_file(str(tmp_path / 'resume.xyz')) == ''
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for template fragment caching, template precompilation and the escapejs filter
+"""
+
+import os
+import re
+
+import pytest
+from jinja2 import DictLoader, Environment, FileSystemBytecodeCache
+
+import app as app_module
+from template_cache import FragmentCacheExtension, precompile_templates
+
+TEMPLATES = {
+    'page.html': '{% for item in items %}{% cache item, version %}<li>{{ render(item) }}</li>{% endcache %}{% endfor %}',
+    'other.html': '{% cache items[0], version %}<b>{{ render(items[0]) }}</b>{% endcache %}',
+}
+
+
+@pytest.fixture
+def env():
+    return Environment(loader=DictLoader(TEMPLATES), extensions=[FragmentCacheExtension], autoescape=True)
+
+
+def counting_render():
+    calls = []
+
+    def render(item):
+        calls.append(item)
+        return f'<{item}>'
+    return render, calls
+
+
+def test_fragments_render_once_per_key(env):
+    render, calls = counting_render()
+    page = env.get_template('page.html')
+
+    first = page.render(items=['a', 'b', 'a'], version=1, render=render)
+    second = page.render(items=['b', 'a'], version=1, render=render)
+
+    assert first == '<li>&lt;a&gt;</li><li>&lt;b&gt;</li><li>&lt;a&gt;</li>'
+    assert second == '<li>&lt;b&gt;</li><li>&lt;a&gt;</li>'
+    assert calls == ['a', 'b']
+    assert env.fragment_cache.stats()['hits'] == 3
+
+    # A new catalogue version and a different block each get their own entries
+    page.render(items=['a'], version=2, render=render)
+    env.get_template('other.html').render(items=['a'], version=1, render=render)
+    assert calls == ['a', 'b', 'a', 'a']
+
+
+def test_fragments_without_a_version_are_not_cached(env):
+    render, calls = counting_render()
+    page = env.get_template('page.html')
+
+    page.render(items=['a', 'a'], render=render)
+    page.render(items=['a'], version=None, render=render)
+    assert calls == ['a', 'a', 'a']
+
+    env.fragment_cache.max_entries = 0
+    page.render(items=['a', 'a'], version=1, render=render)
+    assert len(calls) == 5 and env.fragment_cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_fragments_are_evicted(env):
+    render, calls = counting_render()
+    env.fragment_cache.max_entries = 2
+    page = env.get_template('page.html')
+
+    page.render(items=['a', 'b', 'a', 'c'], version=1, render=render)
+    page.render(items=['a', 'b'], version=1, render=render)
+    assert calls == ['a', 'b', 'c', 'b']
+
+
+def test_templates_are_precompiled_through_the_bytecode_cache(env, tmp_path):
+    env.bytecode_cache = FileSystemBytecodeCache(str(tmp_path))
+    assert precompile_templates(env) == 2
+    assert len(os.listdir(tmp_path)) == 2
+
+
+
+def test_app_bytecode_cache_lives_with_the_app_and_import_does_not_precompile():
+    assert app_module.app.jinja_env.bytecode_cache.directory == os.path.join(app_module.app.root_path, 'jinja_cache')
+    assert not app_module.app.config['TEMPLATE_PRECOMPILE']
+
+
+def render_pages(client):
+    pages = [client.get('/career-analysis'), client.get('/career-guidance/data-scientist?match=72&growth=Medium'),
+             client.get('/career-guidance/unknown-career'), client.get('/')]
+    assert all(page.status_code == 200 for page in pages)
+    return [page.get_data(as_text=True) for page in pages]
+
+
+def test_cached_pages_match_uncached_pages(monkeypatch):
+    client = app_module.app.test_client()
+    with client.session_transaction() as sess:
+        sess['user_email'] = 'user@example.com'
+        sess['skills'] = {'technical_skills': ['Python', 'SQL', 'Machine Learning'], 'soft_skills': ['Teamwork']}
+
+    fragment_cache = app_module.app.jinja_env.fragment_cache
+    monkeypatch.setattr(fragment_cache, 'max_entries', 0)
+    uncached = render_pages(client)
+    monkeypatch.setattr(fragment_cache, 'max_entries', 2048)
+    fragment_cache.clear()
+
+    assert render_pages(client) == uncached
+    assert render_pages(client) == uncached
+    assert fragment_cache.stats()['entries'] > 0
+    assert 'Data Scientist' in uncached[1] and '72% Match' in uncached[1]
+
+
+def test_nav_fragment_follows_login_state():
+    client = app_module.app.test_client()
+    assert 'Register' in client.get('/').get_data(as_text=True)
+    with client.session_transaction() as sess:
+        sess['user_email'] = 'user@example.com'
+    page = client.get('/').get_data(as_text=True)
+    assert 'Logout' in page and 'Register' not in page
+
+
+JS_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def js_string_value(body):
+    """What a JavaScript string literal with this body evaluates to."""
+    return re.sub(r'\\(.)', lambda m: JS_ESCAPES.get(m.group(1), m.group(1)), body, flags=re.S)
+
+
+def test_escapejs_output_is_a_safe_js_string_of_the_value():
+    values = ['High', 'Say "hi"\n</script>', 'back\\slash', "it's", 'tab\there', 'cr\r\n', '</div></script>',
+              'a/b', 'end\\', 42, '']
+    for value in values:
+        escaped = app_module.escapejs_filter(value)
+        assert js_string_value(escaped) == str(value)
+        unescaped_chars = re.sub(r'\\.', '', escaped, flags=re.S)
+        assert not any(char in unescaped_chars for char in '\\"\'\n\r\t') and '</' not in escaped
+    assert app_module.escapejs_filter('a/b') == 'a/b'
+    assert app_module.escapejs_filter(None) == ''
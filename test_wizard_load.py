@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for the wizard flow load-testing harness
+"""
+
+import app as app_module
+from benchmarks.bench_wizard_flow import (FlaskClientTransport, run_load, compare, percentile,
+                                          wait_for_resume_jobs)
+from resume_cache import ResumeCache
+from resume_store import ResumeStore
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([7.0], 95) == 7.0
+
+
+def test_every_wizard_route_is_measured(tmp_path, monkeypatch):
+    monkeypatch.setitem(app_module.app.config, 'UPLOAD_FOLDER', str(tmp_path))
+    monkeypatch.setattr(app_module, 'resume_cache', ResumeCache(str(tmp_path / 'cache')))
+    monkeypatch.setattr(app_module, '_resume_store', ResumeStore(str(tmp_path / 'store')))
+
+    report = run_load(lambda: FlaskClientTransport(app_module.app), users=4, concurrency=2,
+                      formats=['txt', 'pdf'], warmup=0)
+    wait_for_resume_jobs()
+
+    routes = report['routes']
+    assert list(routes)[:4] == ['GET /login', 'POST /login', 'GET /upload-resume', 'POST /upload-resume (pdf)']
+    assert 'GET /career-analysis' in routes
+    assert routes['GET /career-guidance/<title>']['count'] == 4
+    assert routes['POST /upload-resume (txt)']['count'] == 2
+    assert all(row['errors'] == 0 for row in routes.values())
+    assert report['flows'] == dict(report['flows'], count=4, errors=0)
+    assert all(row['p50_ms'] <= row['p95_ms'] <= row['p99_ms'] for row in routes.values())
+
+
+def test_compare_flags_p95_regressions():
+    row = {'p50_ms': 1.0, 'p95_ms': 2.0, 'p99_ms': 3.0}
+    baseline = {'routes': {'GET /login': row, 'GET /career-analysis': row}}
+    report = {'routes': {'GET /login': dict(row, p95_ms=2.1), 'GET /career-analysis': dict(row, p95_ms=4.0)}}
+
+    assert compare(report, baseline, max_regression=20) == ['GET /career-analysis']
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Train the career path model from Guidlines_model2.ipynb and export it for serving.
+
+Reads the B.Tech students career dataset, prepares it the way the notebook
+does (numeric columns with median fill, label encoded Gender,
+Specialization and Role_Preference, multi-hot Key_Skills), fits a
+RandomForestClassifier with the notebook's grid search winner and writes a
+versioned artifact that ``career_model.load_model`` memory-maps.
+
+Needs scikit-learn, which is only required for training; serving uses numpy.
+
+Usage:
+    python train_career_model.py btech_students_career_dataset.csv -o models/career_model
+    python train_career_model.py data.csv --grid-search
+"""
+
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import GridSearchCV, train_test_split
+
+from career_model import CATEGORICAL_FEATURES, NUMERICAL_FEATURES, dataset_skill, load_model, save_model
+
+# The notebook's GridSearchCV grid; its best parameters are the defaults below
+PARAM_GRID = {'n_estimators': [150, 250], 'max_depth': [15, 25], 'min_samples_leaf': [5, 10]}
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def load_dataset(path):
+    """Return ``(X, y, feature names, encoders, defaults, career classes)`` for the dataset CSV."""
+    with open(path, newline='', encoding='utf-8') as f:
+        records = list(csv.DictReader(f))
+
+    columns = []
+    defaults = {}
+    for name in NUMERICAL_FEATURES:
+        column = np.array([_number(record.get(name)) for record in records])
+        median = float(np.nanmedian(column)) if not np.isnan(column).all() else 0.0
+        column[np.isnan(column)] = median
+        columns.append(column)
+        defaults[name] = median
+
+    encoders = {}
+    for name in CATEGORICAL_FEATURES:
+        labels = [record.get(name) or 'Unknown' for record in records]
+        classes, codes = np.unique(labels, return_inverse=True)
+        encoders[name] = classes.tolist()
+        columns.append(codes.astype(float))
+        # Profiles that don't say get 'Unknown' if the data has it, else the most common class
+        defaults[name] = (encoders[name].index('Unknown') if 'Unknown' in encoders[name]
+                          else int(np.bincount(codes).argmax()))
+
+    skill_lists = [[dataset_skill(skill) for skill in (record.get('Key_Skills') or 'Unknown').split(',')
+                    if skill.strip()] for record in records]
+    vocabulary = sorted({skill for skills in skill_lists for skill in skills})
+    skill_index = {skill: index for index, skill in enumerate(vocabulary)}
+    skills = np.zeros((len(records), len(vocabulary)))
+    for row, skill_list in enumerate(skill_lists):
+        skills[row, [skill_index[skill] for skill in skill_list]] = 1
+
+    X = np.column_stack(columns + [skills])
+    careers, y = np.unique([record.get('Recommended_Career_Path') or 'Unknown' for record in records],
+                           return_inverse=True)
+    features = NUMERICAL_FEATURES + CATEGORICAL_FEATURES + ['skill:' + skill for skill in vocabulary]
+    return X, y, features, encoders, defaults, careers.tolist()
+
+
+def forest_classes(forest, careers):
+    """Career names in the order of the forest's probability columns.
+
+    The columns follow ``forest.classes_``, the codes seen in the training
+    split, which can be fewer than the careers in the whole dataset.
+    """
+    return [careers[int(code)] for code in forest.classes_]
+
+
+def forest_arrays(forest):
+    """Flatten a fitted forest's trees into ``career_model`` node arrays; return them and the depth."""
+    trees = [estimator.tree_ for estimator in forest.estimators_]
+    sizes = [tree.node_count for tree in trees]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    feature, threshold, children, value = [], [], [], []
+    for tree, start in zip(trees, starts):
+        leaf = tree.children_left == -1
+        own = np.arange(start, start + tree.node_count)
+        feature.append(np.where(leaf, 0, tree.feature))
+        threshold.append(np.where(leaf, 0.0, tree.threshold))
+        children.append(np.column_stack([np.where(leaf, own, tree.children_left + start),
+                                         np.where(leaf, own, tree.children_right + start)]))
+        # Older scikit-learn stores class counts, newer fractions; predict_proba normalizes either way
+        counts = tree.value[:, 0, :]
+        value.append(counts / counts.sum(axis=1, keepdims=True))
+
+    arrays = {
+        'feature': np.concatenate(feature).astype(np.int64),
+        'threshold': np.concatenate(threshold).astype(np.float64),
+        'children': np.concatenate(children).astype(np.int64),
+        'value': np.concatenate(value).astype(np.float64),
+        'roots': starts.astype(np.int64),
+    }
+    return arrays, max(tree.max_depth for tree in trees)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('dataset', help='btech_students_career_dataset.csv')
+    parser.add_argument('-o', '--output', default='models/career_model', help='artifact root directory')
+    parser.add_argument('--n-estimators', type=int, default=250)
+    parser.add_argument('--max-depth', type=int, default=15)
+    parser.add_argument('--min-samples-leaf', type=int, default=10)
+    parser.add_argument('--grid-search', action='store_true', help="re-run the notebook's grid search")
+    parser.add_argument('--test-size', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    X, y, features, encoders, defaults, careers = load_dataset(args.dataset)
+    # Stratify so every career is trained on, unless one is too rare to split
+    stratify = y if np.bincount(y).min() >= 2 else None
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=args.test_size, random_state=args.seed,
+                                                        stratify=stratify)
+
+    if args.grid_search:
+        search = GridSearchCV(RandomForestClassifier(random_state=args.seed), PARAM_GRID, cv=3, n_jobs=-1)
+        search.fit(X_train, y_train)
+        forest, params = search.best_estimator_, search.best_params_
+    else:
+        params = {'n_estimators': args.n_estimators, 'max_depth': args.max_depth,
+                  'min_samples_leaf': args.min_samples_leaf}
+        forest = RandomForestClassifier(random_state=args.seed, n_jobs=-1, **params).fit(X_train, y_train)
+    accuracy = accuracy_score(y_test, forest.predict(X_test))
+
+    arrays, depth = forest_arrays(forest)
+    classes = forest_classes(forest, careers)
+    if arrays['value'].shape[1] != len(classes):
+        sys.exit('Forest leaf values do not line up with its classes')
+    manifest = {
+        'features': features,
+        'classes': classes,
+        'encoders': encoders,
+        'defaults': defaults,
+        'depth': int(depth),
+        'params': params,
+        'test_accuracy': round(float(accuracy), 4),
+        'trained_rows': int(len(X_train)),
+    }
+    version = save_model(args.output, arrays, manifest)
+
+    # The exported forest must reproduce scikit-learn's probabilities
+    model = load_model(args.output)
+    sample = X_test[:1000]
+    if not np.allclose(model.predict_proba(sample), forest.predict_proba(sample), atol=1e-9):
+        sys.exit('Exported model does not match the fitted forest')
+    predicted = [model.classes[index] for index in forest.predict_proba(sample).argmax(axis=1)]
+    if predicted != [careers[code] for code in forest.predict(sample)]:
+        sys.exit('Exported career names do not match the fitted forest')
+
+    if len(classes) < len(careers):
+        print(f"warning: {len(careers) - len(classes)} careers have no training rows and are never predicted")
+    print(f"{len(X)} rows, {len(features)} features, {len(classes)} careers, params {params}")
+    print(f"test accuracy {accuracy:.3f}; {len(arrays['feature'])} nodes, depth {depth}")
+    print(f"exported version {version} to {args.output} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    main()